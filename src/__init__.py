@@ -1,3 +1,5 @@
 """
 Health Economic Impact Simulator package.
-""" 
\ No newline at end of file
+"""
+
+__version__ = "0.1.0"
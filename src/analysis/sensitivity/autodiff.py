@@ -0,0 +1,122 @@
+"""
+Forward-mode automatic differentiation with dual numbers.
+
+A Dual carries a value together with its partial derivatives with respect to
+every seeded input. Because the impact models and calculator formulas are
+plain arithmetic, evaluating them once on duals yields exact local
+derivatives for all parameters at the same time.
+"""
+
+import math
+from typing import Dict, Iterable, Mapping, Union
+
+import numpy as np
+
+Number = Union[int, float]
+
+class Dual:
+    """Scalar value with a gradient vector over the seeded inputs."""
+
+    __slots__ = ('value', 'grad')
+    # Make NumPy scalars defer to our reflected operators
+    __array_ufunc__ = None
+
+    def __init__(self, value: Number, grad: np.ndarray):
+        self.value = value
+        self.grad = grad
+
+    @classmethod
+    def variables(cls, values: Mapping[str, Number]) -> Dict[str, 'Dual']:
+        """Seed one independent variable per entry, in mapping order."""
+        eye = np.eye(len(values))
+        return {name: cls(value, eye[i]) for i, (name, value) in enumerate(values.items())}
+
+    def _lift(self, other: Union['Dual', Number]) -> 'Dual':
+        if isinstance(other, Dual):
+            return other
+        return Dual(other, np.zeros_like(self.grad))
+
+    def __add__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value + other.value, self.grad + other.grad)
+        return Dual(self.value + other, self.grad)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value - other.value, self.grad - other.grad)
+        return Dual(self.value - other, self.grad)
+
+    def __rsub__(self, other):
+        return Dual(other - self.value, -self.grad)
+
+    def __mul__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value * other.value, self.grad * other.value + other.grad * self.value)
+        return Dual(self.value * other, self.grad * other)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, Dual):
+            return Dual(
+                self.value / other.value,
+                (self.grad * other.value - other.grad * self.value) / other.value ** 2
+            )
+        return Dual(self.value / other, self.grad / other)
+
+    def __rtruediv__(self, other):
+        return self._lift(other) / self
+
+    def __pow__(self, exponent):
+        if isinstance(exponent, Dual):
+            value = self.value ** exponent.value
+            return Dual(
+                value,
+                value * (exponent.grad * math.log(self.value) + exponent.value * self.grad / self.value)
+            )
+        return Dual(self.value ** exponent, exponent * self.value ** (exponent - 1) * self.grad)
+
+    def __rpow__(self, base):
+        value = base ** self.value
+        return Dual(value, value * math.log(base) * self.grad)
+
+    def __neg__(self):
+        return Dual(-self.value, -self.grad)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return self if self.value >= 0 else -self
+
+    def __float__(self) -> float:
+        return float(self.value)
+
+    def __eq__(self, other): return self.value == float(other)
+    def __ne__(self, other): return self.value != float(other)
+    def __lt__(self, other): return self.value < float(other)
+    def __le__(self, other): return self.value <= float(other)
+    def __gt__(self, other): return self.value > float(other)
+    def __ge__(self, other): return self.value >= float(other)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Dual({self.value!r}, grad={self.grad!r})"
+
+def gradient(output: Union[Dual, Number], names: Iterable[str]) -> Dict[str, float]:
+    """Map an evaluated output's gradient back to the seeded parameter names."""
+    names = list(names)
+    if not isinstance(output, Dual):
+        return {name: 0.0 for name in names}
+    return {name: float(d) for name, d in zip(names, output.grad)}
+
+def elasticities(output: Union[Dual, Number], values: Mapping[str, Number]) -> Dict[str, float]:
+    """Local elasticities (dY/dp)·(p/Y) for each seeded parameter."""
+    grads = gradient(output, values)
+    base = float(output)
+    if base == 0:
+        return {name: 0.0 for name in values}
+    return {name: grads[name] * values[name] / base for name in values}
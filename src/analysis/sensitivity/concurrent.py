@@ -0,0 +1,51 @@
+"""
+Concurrent evaluation of one shared model on a thread pool.
+
+Impact models evaluate through pure entry points: parameter objects are
+frozen, and evaluate() / with_parameters() work on a shallow copy per call.
+One model instance can therefore serve many threads (or Streamlit sessions)
+at once, with no copies of the model and no locks. NumPy releases the GIL
+inside large array operations, so batched evaluations overlap.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+class ConcurrentEvaluator:
+    """Run evaluations and analyses of one shared model on a thread pool."""
+
+    def __init__(self, model: Any, max_workers: Optional[int] = None):
+        """Initialize the evaluator.
+
+        Args:
+            model: Impact model shared by every job; it is never modified
+            max_workers: Worker threads; defaults to ThreadPoolExecutor's choice
+        """
+        self.model = model
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="model-eval")
+
+    def evaluate(self, snapshots: Iterable[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        """Calculate impacts at every parameter snapshot, in order."""
+        return list(self._pool.map(self.model.evaluate, snapshots))
+
+    def submit(self, job: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Schedule job(model, *args, **kwargs)."""
+        return self._pool.submit(job, self.model, *args, **kwargs)
+
+    def run(self, jobs: Mapping[str, Callable[[Any], Any]]) -> Dict[str, Any]:
+        """Run named jobs concurrently, each called with the shared model.
+
+        For example {"tornado": analyzer.analyze_tornado, "sobol": analyzer.analyze_sobol}.
+        """
+        futures = {name: self.submit(job) for name, job in jobs.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+    def close(self) -> None:
+        """Wait for pending jobs and stop the worker threads."""
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self) -> 'ConcurrentEvaluator':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
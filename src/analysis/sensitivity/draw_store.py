@@ -0,0 +1,228 @@
+"""
+Memory-mapped columnar store for PSA draws and per-draw outputs.
+
+A store is a directory with one raw binary file per column, accessed through
+numpy.memmap, and a small JSON manifest holding the column names and shapes,
+row count, parameter distributions and correlations, seed and model version.
+Writers append chunks; readers slice columns without loading the rest, so
+post-processing works on datasets larger than RAM.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.models.distributions import CorrelationMatrix, Distribution
+
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+
+ColumnSpec = Union[Sequence[str], Mapping[str, Tuple[int, ...]]]
+
+def _as_rows(values: Any) -> np.ndarray:
+    """Float array of rows; sequences of per-row arrays (e.g. a DataFrame column of traces) are stacked."""
+    array = np.asarray(values)
+    if array.dtype == object:
+        array = np.stack(list(values))
+    return array.astype(np.float64, copy=False)
+
+class DrawStore:
+    """Columnar on-disk store of per-draw values."""
+
+    def __init__(self, path: Union[str, Path], mode: str = "r"):
+        """Open an existing store.
+
+        Args:
+            path: Store directory
+            mode: "r" to read, "r+" to append
+        """
+        if mode not in ("r", "r+"):
+            raise ValueError("mode must be 'r' or 'r+'")
+        self.path = Path(path)
+        self.mode = mode
+        with open(self.path / MANIFEST) as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported draw store format: {self.manifest.get('format')}")
+        self._maps: Dict[str, np.memmap] = {}
+
+    @classmethod
+    def create(
+        cls,
+        path: Union[str, Path],
+        columns: ColumnSpec,
+        capacity: int = 0,
+        distributions: Optional[Mapping[str, Distribution]] = None,
+        correlations: Optional[CorrelationMatrix] = None,
+        seed: Optional[int] = None,
+        model_version: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> 'DrawStore':
+        """Create an empty store opened for appending.
+
+        Args:
+            path: Store directory; created if missing, must not hold a store
+            columns: Column names, or names mapped to per-row shapes (e.g. a
+                Markov state trace of shape (5,))
+            capacity: Rows to preallocate; files grow on demand
+            distributions: Parameter distributions the draws came from
+            correlations: Gaussian copula correlations the draws came from
+            seed: Seed of the run
+            model_version: Identifier of the model that produced the outputs
+            metadata: Any further JSON-serializable details
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        if (path / MANIFEST).exists():
+            raise FileExistsError(f"A draw store already exists at {path}")
+        if not isinstance(columns, Mapping):
+            columns = {name: () for name in columns}
+        manifest = {
+            "format": FORMAT_VERSION,
+            "dtype": "float64",
+            "size": 0,
+            "capacity": 0,
+            "columns": [
+                {"name": name, "file": f"column_{i:04d}.f64", "shape": list(shape)}
+                for i, (name, shape) in enumerate(columns.items())
+            ],
+            "distributions": {name: d.to_dict() for name, d in (distributions or {}).items()},
+            "correlations": None if correlations is None else correlations.to_dict(),
+            "seed": seed,
+            "model_version": model_version,
+            "metadata": metadata or {},
+        }
+        for column in manifest["columns"]:
+            (path / column["file"]).touch()
+        with open(path / MANIFEST, "w") as f:
+            json.dump(manifest, f, indent=2)
+        store = cls(path, mode="r+")
+        if capacity:
+            store._grow(capacity)
+        return store
+
+    @property
+    def size(self) -> int:
+        """Number of rows written."""
+        return self.manifest["size"]
+
+    @property
+    def columns(self) -> Dict[str, Tuple[int, ...]]:
+        """Column name -> per-row shape."""
+        return {column["name"]: tuple(column["shape"]) for column in self.manifest["columns"]}
+
+    @property
+    def distributions(self) -> Dict[str, Distribution]:
+        """Distributions the draws were sampled from."""
+        return {name: Distribution.from_dict(d) for name, d in self.manifest["distributions"].items()}
+
+    @property
+    def correlations(self) -> Optional[CorrelationMatrix]:
+        """Correlations the draws were sampled with, if any."""
+        data = self.manifest.get("correlations")
+        return None if data is None else CorrelationMatrix.from_dict(data)
+
+    @property
+    def seed(self) -> Optional[int]:
+        """Seed of the run."""
+        return self.manifest["seed"]
+
+    @property
+    def model_version(self) -> Optional[str]:
+        """Identifier of the model that produced the outputs."""
+        return self.manifest["model_version"]
+
+    def _column(self, name: str) -> Dict[str, Any]:
+        for column in self.manifest["columns"]:
+            if column["name"] == name:
+                return column
+        raise KeyError(f"No column '{name}' in draw store")
+
+    def _map(self, name: str) -> np.memmap:
+        """Memory map of a column's full capacity."""
+        if name not in self._maps:
+            column = self._column(name)
+            rows = self.manifest["capacity"] if self.mode == "r+" else self.size
+            if rows == 0:
+                return np.empty((0,) + tuple(column["shape"]))
+            self._maps[name] = np.memmap(
+                self.path / column["file"], dtype=np.float64, mode=self.mode,
+                shape=(rows,) + tuple(column["shape"])
+            )
+        return self._maps[name]
+
+    def _grow(self, rows: int) -> None:
+        """Extend every column file to hold at least `rows` rows."""
+        capacity = max(rows, 2 * self.manifest["capacity"])
+        self.flush()
+        self._maps.clear()
+        for column in self.manifest["columns"]:
+            row_bytes = 8 * int(np.prod(column["shape"], dtype=np.int64))
+            with open(self.path / column["file"], "r+b") as f:
+                f.truncate(capacity * row_bytes)
+        self.manifest["capacity"] = capacity
+        self._write_manifest()
+
+    def _write_manifest(self) -> None:
+        """Atomically replace the manifest."""
+        temporary = self.path / f"{MANIFEST}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(temporary, self.path / MANIFEST)
+
+    def append(self, chunk: Mapping[str, Any]) -> None:
+        """Append a chunk of rows; every column must be given with equal row counts.
+
+        Accepts a mapping of arrays or a DataFrame, such as the yearly output
+        of MarkovModel.run_cohort_simulation().
+        """
+        if self.mode != "r+":
+            raise ValueError("Draw store is open read-only")
+        arrays = {name: _as_rows(chunk[name]) for name in self.columns}
+        rows = {len(values) for values in arrays.values()}
+        if len(rows) != 1:
+            raise ValueError("All columns of a chunk must have the same number of rows")
+        rows = rows.pop()
+        start, stop = self.size, self.size + rows
+        if stop > self.manifest["capacity"]:
+            self._grow(stop)
+        for name, values in arrays.items():
+            self._map(name)[start:stop] = values
+        self.manifest["size"] = stop
+        self._write_manifest()
+
+    def flush(self) -> None:
+        """Flush written rows to disk."""
+        for column in self._maps.values():
+            if isinstance(column, np.memmap) and self.mode == "r+":
+                column.flush()
+
+    def close(self) -> None:
+        """Flush and release the memory maps."""
+        self.flush()
+        self._maps.clear()
+
+    def __enter__(self) -> 'DrawStore':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """Read-only memory-mapped view of a column's written rows."""
+        view = self._map(name)[:self.size].view(np.ndarray)
+        view.flags.writeable = False
+        return view
+
+    def read(self, names: Optional[Sequence[str]] = None, start: int = 0, stop: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Load a row range of some columns into memory."""
+        names = list(self.columns) if names is None else names
+        return {name: np.array(self[name][start:stop]) for name in names}
+
+    def iter_chunks(self, chunk_size: int = 100_000, names: Optional[Sequence[str]] = None) -> Iterator[Dict[str, np.ndarray]]:
+        """Iterate over row chunks, loading one chunk at a time."""
+        for start in range(0, self.size, chunk_size):
+            yield self.read(names, start, start + chunk_size)
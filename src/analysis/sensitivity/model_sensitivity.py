@@ -7,10 +7,26 @@ This module provides tools for analyzing model sensitivity and complexity:
 3. Validation frameworks
 """
 
-from typing import Dict, Any, List, Callable
+from typing import Dict, Any, List, Callable, Iterable, Optional, Sequence, Union
 from inspect import signature
 from dataclasses import dataclass
 
+import numpy as np
+import pandas as pd
+
+from src.analysis.sensitivity.autodiff import Dual, elasticities
+
+def total_output(impacts: Dict[str, Any]) -> Any:
+    """Sum the numeric outputs of calculate_impacts(), skipping "parameters".
+    
+    Works for scalar, array and dual-number outputs alike.
+    """
+    total = 0
+    for key, value in impacts.items():
+        if key != "parameters" and isinstance(value, (int, float, np.ndarray, Dual)):
+            total = total + value
+    return total
+
 @dataclass
 class SensitivityResult:
     """Result of sensitivity analysis for a single parameter."""
@@ -21,6 +37,7 @@ class SensitivityResult:
     base_output: float
     low_output: float
     high_output: float
+    elasticity: Optional[float] = None
     
     @property
     def sensitivity_score(self) -> float:
@@ -31,11 +48,40 @@ class SensitivityResult:
             return 0
         return (output_range / self.base_output) / (param_range / self.base_value)
 
+@dataclass
+class GridResult:
+    """Model output over an n-way parameter grid.
+    
+    `values[i, j, ...]` is the output at `axes[parameters[0]][i]`,
+    `axes[parameters[1]][j]`, and so on.
+    """
+    parameters: List[str]
+    axes: Dict[str, np.ndarray]
+    values: np.ndarray
+    output: Optional[str] = None
+    
+    def to_frame(self) -> pd.DataFrame:
+        """Flatten to a long table with one row per grid point."""
+        mesh = np.meshgrid(*(self.axes[name] for name in self.parameters), indexing="ij")
+        frame = pd.DataFrame({name: grid.ravel() for name, grid in zip(self.parameters, mesh)})
+        frame[self.output or "total_output"] = self.values.ravel()
+        return frame
+
+# Rough peak memory per evaluated scenario: the inputs plus the float64
+# temporaries created while evaluating a model's formulas
+BYTES_PER_SCENARIO = 8 * 32
+
 class ModelSensitivityAnalyzer:
     """Analyzes model sensitivity to parameter variations."""
     
-    def __init__(self):
-        """Initialize analyzer with default parameter ranges."""
+    def __init__(self, memory_budget_bytes: int = 256 * 2**20):
+        """Initialize analyzer with default parameter ranges.
+        
+        Args:
+            memory_budget_bytes: Approximate memory allowed for one batched
+                evaluation; larger workloads are evaluated in chunks
+        """
+        self.memory_budget_bytes = memory_budget_bytes
         self.parameter_ranges = {
             # Economic parameters
             "discount_rate": (0.02, 0.07),
@@ -54,76 +100,497 @@ class ModelSensitivityAnalyzer:
             "health_quality_factor": (0.7, 0.9)
         }
         
-    def analyze_parameter_sensitivity(self, model: Any) -> List[SensitivityResult]:
-        """Analyze sensitivity to parameter variations."""
-        results = []
-        base_output = sum(v for k,v in model.calculate_impacts().items() if isinstance(v, (int, float)) and k != "parameters")
+    def calculate_elasticities(
+        self,
+        model: Any,
+        parameters: Optional[Iterable[str]] = None,
+        output: Optional[str] = None
+    ) -> Dict[str, float]:
+        """Calculate exact local elasticities for many parameters in one evaluation.
+        
+        Parameters are seeded as dual numbers and pushed through the model's
+        calculate_impacts() once; the model itself is not modified.
+        
+        Args:
+            model: Impact model to analyze
+            parameters: Parameter names; defaults to every parameter with a
+                configured range that the model has
+            output: Output to differentiate; defaults to the total of all
+                numeric outputs
+        """
+        values = model.parameter_values()
+        if parameters is None:
+            parameters = [name for name in self.parameter_ranges if name in values]
+        base_values = {name: values[name] for name in parameters}
+        
+        impacts = model.with_parameters(**Dual.variables(base_values)).calculate_impacts()
+        result = total_output(impacts) if output is None else impacts[output]
+        return elasticities(result, base_values)
+    
+    def calculate_calculator_elasticities(
+        self,
+        calculator: Any,
+        params: Dict[str, float],
+        output: str,
+        context_parameters: Iterable[str] = ()
+    ) -> Dict[str, float]:
+        """Calculate local elasticities of one calculator output in one evaluation.
+        
+        Args:
+            calculator: Impact calculator to analyze
+            params: Intervention parameters, all of which are differentiated
+            output: Name of the calculator output
+            context_parameters: Population/economic/healthcare/modifier
+                fields to differentiate as well (e.g. "health_quality")
+        """
+        env = calculator.environment(params)
+        base_values = dict(params)
+        base_values.update({name: env[name] for name in context_parameters})
+        results = calculator.calculate(Dual.variables(base_values))
+        return elasticities(results[output], base_values)
+    
+    def _model_parameters(self, model: Any, parameters: Optional[Iterable[str]] = None) -> List[str]:
+        """Names of parameters with a configured range that the model has."""
+        values = model.parameter_values()
+        names = self.parameter_ranges if parameters is None else parameters
+        return [name for name in names if name in values and name in self.parameter_ranges]
+    
+    def _evaluate_rows(self, model: Any, names: List[str], rows: np.ndarray, output: Optional[str] = None) -> np.ndarray:
+        """Evaluate the model once for every row of a (scenarios × parameters) array."""
+        columns = {name: rows[:, j] for j, name in enumerate(names)}
+        impacts = model.with_parameters(**columns).calculate_impacts()
+        result = total_output(impacts) if output is None else impacts[output]
+        return np.broadcast_to(np.asarray(result, dtype=float), rows.shape[:1])
+    
+    def analyze_tornado(
+        self,
+        model: Any,
+        parameters: Optional[Iterable[str]] = None,
+        output: Optional[str] = None
+    ) -> pd.DataFrame:
+        """One-way (tornado) sensitivity in a single batched evaluation.
+        
+        Builds the base vector plus one low and one high vector per parameter,
+        2N+1 rows in all, and evaluates them together without touching the
+        model instance.
+        
+        Args:
+            model: Impact model to analyze
+            parameters: Parameter names; defaults to every parameter with a
+                configured range that the model has
+            output: Output to analyze; defaults to the total of all numeric outputs
+        
+        Returns:
+            One row per parameter with low/high values and outputs, sorted by
+            descending swing (|high_output - low_output|).
+        """
+        names = self._model_parameters(model, parameters)
+        values = model.parameter_values()
+        k = len(names)
+        base = np.array([values[name] for name in names], dtype=float)
+        low = np.array([self.parameter_ranges[name][0] for name in names], dtype=float)
+        high = np.array([self.parameter_ranges[name][1] for name in names], dtype=float)
+        
+        # Row 0 is the base case, rows 1..k vary one parameter low, k+1..2k high
+        rows = np.tile(base, (2 * k + 1, 1))
+        rows[1 + np.arange(k), np.arange(k)] = low
+        rows[1 + k + np.arange(k), np.arange(k)] = high
+        outputs = self._evaluate_rows(model, names, rows, output)
+        
+        table = pd.DataFrame({
+            "parameter": names,
+            "base_value": base,
+            "low_value": low,
+            "high_value": high,
+            "base_output": np.full(k, outputs[0]),
+            "low_output": outputs[1:k + 1],
+            "high_output": outputs[k + 1:],
+        })
+        table["swing"] = (table["high_output"] - table["low_output"]).abs()
+        return table.sort_values("swing", ascending=False, kind="stable").reset_index(drop=True)
+    
+    def analyze_grid(
+        self,
+        model: Any,
+        axes: Dict[str, Union[int, Sequence[float]]],
+        output: Optional[str] = None
+    ) -> GridResult:
+        """Evaluate a two-way or multi-way sensitivity grid by broadcasting.
+        
+        Each axis is either explicit values or a number of points spread
+        evenly over the parameter's configured range. The full grid is
+        evaluated as one broadcast expression, or in flat chunks when it
+        would exceed the analyzer's memory budget.
+        
+        Args:
+            model: Impact model to analyze
+            axes: Parameter name -> values or number of points, in axis order
+            output: Output to analyze; defaults to the total of all numeric outputs
+        """
+        names = list(axes)
+        grid_axes = {}
+        for name, spec in axes.items():
+            if isinstance(spec, int):
+                low, high = self.parameter_ranges[name]
+                grid_axes[name] = np.linspace(low, high, spec)
+            else:
+                grid_axes[name] = np.asarray(spec, dtype=float)
+        shape = tuple(len(grid_axes[name]) for name in names)
+        size = int(np.prod(shape))
+        
+        if size * BYTES_PER_SCENARIO <= self.memory_budget_bytes:
+            columns = {}
+            for i, name in enumerate(names):
+                axis_shape = [1] * len(names)
+                axis_shape[i] = -1
+                columns[name] = grid_axes[name].reshape(axis_shape)
+            impacts = model.with_parameters(**columns).calculate_impacts()
+            result = total_output(impacts) if output is None else impacts[output]
+            values = np.array(np.broadcast_to(np.asarray(result, dtype=float), shape))
+        else:
+            values = np.empty(shape)
+            flat = values.reshape(-1)
+            chunk = max(1, self.memory_budget_bytes // BYTES_PER_SCENARIO)
+            for start in range(0, size, chunk):
+                index = np.unravel_index(np.arange(start, min(start + chunk, size)), shape)
+                rows = np.column_stack([grid_axes[name][idx] for name, idx in zip(names, index)])
+                flat[start:start + len(rows)] = self._evaluate_rows(model, names, rows, output)
+        
+        return GridResult(parameters=names, axes=grid_axes, values=values, output=output)
+    
+    def analyze_morris(
+        self,
+        model: Any,
+        parameters: Optional[Iterable[str]] = None,
+        output: Optional[str] = None,
+        trajectories: int = 20,
+        levels: int = 4,
+        seed: Optional[int] = None
+    ) -> Any:
+        """Morris elementary-effects screening over the configured parameter ranges.
+        
+        All r·(k+1) trajectory points are evaluated in one batched call
+        without touching the model instance.
+        
+        Args:
+            model: Impact model to analyze
+            parameters: Parameter names; defaults to every parameter with a
+                configured range that the model has
+            output: Output to analyze; defaults to the total of all numeric outputs
+            trajectories: Number of trajectories r
+            levels: Grid levels p (even)
+            seed: Seed for reproducible trajectories
+        
+        Returns:
+            MorrisResult with μ, μ* and σ per parameter
+        """
+        from src.analysis.sensitivity.morris import morris_screening
+        
+        names = self._model_parameters(model, parameters)
+        ranges = {name: self.parameter_ranges[name] for name in names}
+        return morris_screening(
+            lambda rows: self._evaluate_rows(model, names, rows, output),
+            ranges, trajectories=trajectories, levels=levels, seed=seed
+        )
+    
+    def analyze_sobol(
+        self,
+        model: Any,
+        parameters: Optional[Iterable[str]] = None,
+        output: Optional[str] = None,
+        n: int = 1024,
+        seed: Optional[int] = None,
+        n_bootstrap: int = 200
+    ) -> Any:
+        """Global (Sobol) sensitivity over the model's parameter distributions.
+        
+        Args:
+            model: Impact model to analyze
+            parameters: Parameter names; defaults to every parameter with a
+                distribution
+            output: Output to analyze; defaults to the total of all numeric outputs
+            n: Base sample size; the model is evaluated on n·(k+2) rows in one call
+            seed: Seed for reproducible samples
+            n_bootstrap: Bootstrap resamples for the confidence intervals
+        
+        Returns:
+            SobolResult with first-order and total-effect indices
+        """
+        from src.analysis.sensitivity.psa import model_distributions
+        from src.analysis.sensitivity.sobol import sobol_indices
+        
+        distributions = model_distributions(model)
+        if parameters is not None:
+            distributions = {name: distributions[name] for name in parameters}
         
-        # Get parameters from model's therapy_params
-        params = model.therapy_params.dict()
+        def evaluate(columns: Dict[str, np.ndarray]) -> np.ndarray:
+            impacts = model.with_parameters(**columns).calculate_impacts()
+            return total_output(impacts) if output is None else impacts[output]
         
-        for param, base_val in params.items():
+        return sobol_indices(evaluate, distributions, n=n, seed=seed, n_bootstrap=n_bootstrap)
+    
+    def analyze_calculator_sobol(
+        self,
+        calculator: Any,
+        params: Dict[str, float],
+        output: str,
+        n: int = 1024,
+        seed: Optional[int] = None,
+        n_bootstrap: int = 200
+    ) -> Any:
+        """Global (Sobol) sensitivity of one calculator output.
+        
+        Every formula input with a declared distribution, intervention and
+        context parameters alike, is varied; `params` supplies the rest.
+        """
+        from src.analysis.sensitivity.psa import calculator_distributions
+        from src.analysis.sensitivity.sobol import sobol_indices
+        
+        def evaluate(columns: Dict[str, np.ndarray]) -> np.ndarray:
+            return calculator.calculate_batch({**params, **columns})[output]
+        
+        return sobol_indices(evaluate, calculator_distributions(calculator), n=n, seed=seed,
+                             n_bootstrap=n_bootstrap)
+    
+    def compare_models(
+        self,
+        models: Dict[str, Any],
+        simulation_runs: int = 10_000,
+        seed: Optional[int] = None,
+        output: Optional[str] = None,
+        confidence_level: float = 0.95
+    ) -> Dict[str, Any]:
+        """Compare interventions on common random numbers with control variates.
+        
+        Returns:
+            Controlled mean differences against the first model, with
+            variance-reduction factors for each technique
+        """
+        from src.analysis.sensitivity.comparison import compare_interventions
+        
+        result = compare_interventions(
+            models, n_draws=simulation_runs, seed=seed, output=output, confidence_level=confidence_level
+        )
+        return {
+            "comparisons": result.summary(),
+            "common_parameters": result.common_parameters,
+            "parameters": {
+                "simulation_runs": simulation_runs,
+                "confidence_level": confidence_level
+            }
+        }
+    
+    def analyze_value_of_information(
+        self,
+        models: Dict[str, Any],
+        costs: Dict[str, Any],
+        wtp: Sequence[float],
+        output: Optional[str] = None,
+        parameters: Optional[Dict[str, Sequence[str]]] = None,
+        simulation_runs: int = 10_000,
+        seed: Optional[int] = None,
+        status_quo: Optional[str] = "status_quo"
+    ) -> Any:
+        """EVPI and regression-based EVPPI for choosing between interventions.
+        
+        Every model is evaluated on one shared set of draws; its output is
+        the effect and `costs` the cost of adopting it.
+        
+        Args:
+            models: Intervention name -> impact model
+            costs: Intervention name -> cost, fixed or per draw
+            wtp: Willingness to pay per unit of output; for monetary outputs
+                1.0 values benefits at face value
+            output: Effect output; defaults to the total of all numeric outputs
+            parameters: EVPPI group name -> parameter names; defaults to each
+                sampled parameter on its own
+            simulation_runs: Monte Carlo draws
+            seed: Seed for reproducible draws
+            status_quo: Name of a no-intervention strategy with zero effect
+                and cost; None compares the interventions only
+        
+        Returns:
+            VOIResult over the willingness-to-pay grid
+        """
+        from src.analysis.sensitivity.psa import (
+            ProbabilisticSensitivityAnalysis, evaluate_model, model_correlations, model_distributions
+        )
+        from src.analysis.sensitivity.value_of_information import value_of_information
+        
+        distributions: Dict[str, Any] = {}
+        for model in models.values():
+            distributions.update(model_distributions(model))
+        draws = ProbabilisticSensitivityAnalysis(
+            distributions, n_draws=simulation_runs, seed=seed,
+            correlations=model_correlations(*models.values())
+        ).sample()
+        
+        effects: Dict[str, Any] = {}
+        strategy_costs: Dict[str, Any] = {}
+        if status_quo is not None:
+            effects[status_quo], strategy_costs[status_quo] = np.zeros(simulation_runs), 0.0
+        for name, model in models.items():
+            columns = {p: draws[p] for p in model_distributions(model)}
+            effects[name] = evaluate_model(model, columns)["total" if output is None else output]
+            strategy_costs[name] = costs[name]
+        return value_of_information(draws, effects, strategy_costs, wtp, parameters)
+    
+    def analyze_threshold(
+        self,
+        model: Any,
+        parameter: str,
+        target: Any = 0.0,
+        scenarios: Optional[Dict[str, Any]] = None,
+        bounds: Optional[Sequence[Any]] = None,
+        output: Optional[str] = None,
+        objective: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        tolerance: float = 1e-8,
+        max_iterations: int = 200
+    ) -> Any:
+        """Breakeven value of one parameter for many scenarios in one call.
+        
+        Every bisection step evaluates the model once on all unfinished
+        scenarios, so a breakeven map over thousands of population segments
+        or parameter sets costs a few dozen batched evaluations.
+        
+        Args:
+            model: Impact model to analyze
+            parameter: Parameter to solve for, e.g. "iq_increase"
+            target: Value the objective must reach, scalar or per scenario
+            scenarios: Other parameter name -> one value per scenario;
+                scalars apply to every scenario
+            bounds: (low, high) bracket, scalars or per scenario; defaults
+                to the parameter's configured range
+            output: Output to match; defaults to the total of all numeric outputs
+            objective: Maps calculate_impacts() results to the quantity
+                compared with the target, such as net monetary benefit or an
+                ICER; overrides `output`
+            tolerance: Absolute threshold precision in parameter units
+            max_iterations: Most bisection steps
+        
+        Returns:
+            ThresholdResult with thresholds and per-scenario convergence flags
+        """
+        from src.analysis.sensitivity.threshold import bisect
+        
+        scenarios = {name: np.asarray(values, dtype=float) for name, values in (scenarios or {}).items()}
+        low, high = bounds if bounds is not None else self.parameter_ranges[parameter]
+        size = max([1, np.size(target), np.size(low), np.size(high)] + [np.size(v) for v in scenarios.values()])
+        
+        def evaluate(values: np.ndarray, index: np.ndarray) -> np.ndarray:
+            columns = {name: v[index] if np.ndim(v) else v for name, v in scenarios.items()}
+            impacts = model.with_parameters(**{parameter: values}, **columns).calculate_impacts()
+            if objective is not None:
+                result = objective(impacts)
+            else:
+                result = total_output(impacts) if output is None else impacts[output]
+            return np.broadcast_to(np.asarray(result, dtype=float), values.shape)
+        
+        return bisect(evaluate, low, high, target, tolerance=tolerance, max_iterations=max_iterations, size=size)
+    
+    def analyze_parameter_sensitivity(self, model: Any) -> List[SensitivityResult]:
+        """Analyze sensitivity to therapy parameter variations.
+        
+        Results follow the order of the therapy parameter fields; use
+        analyze_tornado() for results ranked by swing.
+        """
+        names = []
+        for param in type(model.therapy_params).model_fields:
             # Skip if we don't have a range for this parameter
             if param not in self.parameter_ranges:
                 continue
-            
-            min_val, max_val = self.parameter_ranges[param]
-            
-            # Create copies of parameters for low and high values
-            low_params = params.copy()
-            low_params[param] = min_val
-            
-            high_params = params.copy()
-            high_params[param] = max_val
-            
-            # Create new parameter objects and update model
-            param_class = model.therapy_params.__class__
-            
-            # Save original params
-            original_params = model.therapy_params
-            
             try:
-                # Test low value
-                model.therapy_params = param_class(**low_params)
-                low_output = sum(v for k,v in model.calculate_impacts().items() if isinstance(v, (int, float)) and k != "parameters")
-                
-                # Test high value
-                model.therapy_params = param_class(**high_params)
-                high_output = sum(v for k,v in model.calculate_impacts().items() if isinstance(v, (int, float)) and k != "parameters")
-                
-                results.append(SensitivityResult(
-                    parameter=param,
-                    base_value=base_val,
-                    low_value=min_val,
-                    high_value=max_val,
-                    base_output=base_output,
-                    low_output=low_output,
-                    high_output=high_output
-                ))
+                # Low and high values must pass the parameter validators
+                for value in self.parameter_ranges[param]:
+                    model.with_parameters(**{param: value})
             except Exception as e:
                 print(f"Warning: Could not analyze sensitivity for {param}: {str(e)}")
                 continue
-            finally:
-                # Restore original params
-                model.therapy_params = original_params
-                
-        return results
-    
-    def analyze_model(self, model: Any) -> Dict[str, Any]:
-        """Analyze sensitivity of a model."""
+            names.append(param)
+        
+        table = self.analyze_tornado(model, names).set_index("parameter")
+        return [
+            SensitivityResult(
+                parameter=param,
+                base_value=table.at[param, "base_value"],
+                low_value=table.at[param, "low_value"],
+                high_value=table.at[param, "high_value"],
+                base_output=table.at[param, "base_output"],
+                low_output=table.at[param, "low_output"],
+                high_output=table.at[param, "high_output"]
+            )
+            for param in names
+        ]
+    
+    def analyze_model(
+        self,
+        model: Any,
+        simulation_runs: int = 1000,
+        confidence_level: float = 0.95,
+        seed: Optional[int] = None,
+        workers: int = 1,
+        summaries_only: bool = False,
+        draws_path: Optional[str] = None,
+        queue_path: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Analyze sensitivity of a model.
+        
+        Combines one-way sensitivity and local elasticities with a
+        probabilistic sensitivity analysis over the distributions attached
+        to the model's parameters.
+        
+        Args:
+            model: Impact model to analyze
+            simulation_runs: Number of Monte Carlo draws
+            confidence_level: Coverage of the reported uncertainty intervals
+            seed: Seed for reproducible draws
+            workers: Worker processes for the simulation; results do not
+                depend on this
+            summaries_only: Keep streaming summaries instead of every draw,
+                so memory does not grow with simulation_runs
+            draws_path: Directory for an on-disk draw store; every draw and
+                output is kept there instead of in memory
+            queue_path: Directory for a resumable work queue; the simulation
+                runs as checkpointed summaries-only shards that other hosts
+                sharing the directory can help with. Without a seed, the
+                queued job's seed is reused so the run resumes
+        """
+        from src.analysis.sensitivity.parallel import ParallelPSARunner
+        from src.analysis.sensitivity.psa import PSAResult, ProbabilisticSensitivityAnalysis
+        from src.analysis.sensitivity.work_queue import PSASummaryJob, queue_seed, run_queue
+        
+        if queue_path is not None:
+            seed = queue_seed(queue_path, seed)
+        analysis = ProbabilisticSensitivityAnalysis.for_model(
+            model, n_draws=simulation_runs, seed=seed, confidence_level=confidence_level
+        )
+        if queue_path is not None:
+            psa = run_queue(queue_path, PSASummaryJob(analysis, model), workers)
+        elif draws_path is not None:
+            psa = PSAResult.from_store(analysis.run_to_store(model, draws_path), confidence_level)
+        elif summaries_only:
+            psa = analysis.run_summaries(model) if workers <= 1 else ParallelPSARunner(analysis, workers).run_summaries(model)
+        else:
+            psa = analysis.run(model) if workers <= 1 else ParallelPSARunner(analysis, workers).run(model)
         results = self.analyze_parameter_sensitivity(model)
+        local_elasticities = self.calculate_elasticities(model, [r.parameter for r in results])
+        for r in results:
+            r.elasticity = local_elasticities[r.parameter]
         
         # Convert to dict for reporting
         return {
             "sensitivity_scores": {
                 r.parameter: r.sensitivity_score for r in results
             },
+            "elasticities": local_elasticities,
             "parameter_impacts": [
                 vars(r) for r in results
             ],
+            "uncertainty": psa.summary(),
             "parameters": {
-                "simulation_runs": 1000,  # Default value
-                "confidence_level": 0.95  # Default value
+                "simulation_runs": psa.n_draws,
+                "confidence_level": psa.confidence_level,
+                "seed": psa.seed
             }
         }
     
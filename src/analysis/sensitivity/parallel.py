@@ -0,0 +1,128 @@
+"""
+Process-pool runner for large probabilistic sensitivity analyses.
+
+Draws are sampled chunk by chunk (each chunk from its own spawned random
+stream) straight into a shared-memory input block. Worker processes attach
+to that block, evaluate their chunks of the model and write the outputs
+into a second shared block, so no parameter or output arrays are pickled.
+Because chunks and their random streams are fixed by the analysis, results
+are bit-identical to a serial run for any number of workers.
+
+In summaries-only mode workers sample their own chunks and return only
+mergeable output summaries, so memory stays constant in the number of draws.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.analysis.sensitivity.psa import PSAResult, ProbabilisticSensitivityAnalysis, evaluate_model
+from src.analysis.sensitivity.streaming import StreamingPSAResult, merge_summaries
+
+# Per-process state set by the pool initializer
+_worker: Dict[str, Any] = {}
+
+def _attach(name: str, shape: Tuple[int, int]) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """Attach to a shared float block owned by the parent process."""
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=float, buffer=block.buf)
+
+def _init_worker(model: Any, input_names: List[str], output_names: List[str], n_draws: int,
+                 input_block: str, output_block: str) -> None:
+    """Attach a worker process to the shared input and output blocks."""
+    inputs_shm, inputs = _attach(input_block, (len(input_names), n_draws))
+    outputs_shm, outputs = _attach(output_block, (len(output_names), n_draws))
+    _worker.update(
+        model=model, input_names=input_names, output_names=output_names,
+        blocks=(inputs_shm, outputs_shm), inputs=inputs, outputs=outputs
+    )
+
+def _run_chunk(start: int, stop: int) -> int:
+    """Evaluate draws [start, stop) and write their outputs in place."""
+    columns = {name: _worker["inputs"][i, start:stop] for i, name in enumerate(_worker["input_names"])}
+    results = evaluate_model(_worker["model"], columns)
+    for j, name in enumerate(_worker["output_names"]):
+        _worker["outputs"][j, start:stop] = results[name]
+    return stop - start
+
+def _summarize_chunk(analysis: ProbabilisticSensitivityAnalysis, model: Any, index: int,
+                     edges: Dict[str, np.ndarray]):
+    """Sample, evaluate and summarize one chunk in a worker."""
+    return analysis.summarize_chunk(model, index, edges)
+
+class ParallelPSARunner:
+    """Run a probabilistic sensitivity analysis on a process pool."""
+
+    def __init__(self, analysis: ProbabilisticSensitivityAnalysis, max_workers: Optional[int] = None):
+        """Initialize the runner.
+
+        Args:
+            analysis: Analysis defining distributions, draws, seed and chunking
+            max_workers: Worker processes; defaults to the CPU count
+        """
+        self.analysis = analysis
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def run(self, model: Any) -> PSAResult:
+        """Sample all draws and evaluate the model on them in parallel."""
+        analysis = self.analysis
+        chunks = analysis.chunks()
+        input_names = list(analysis.distributions)
+        probe = {name: np.array([distribution.mean]) for name, distribution in analysis.distributions.items()}
+        output_names = list(evaluate_model(model, probe))
+
+        n = analysis.n_draws
+        input_shm = shared_memory.SharedMemory(create=True, size=max(1, len(input_names) * n * 8))
+        output_shm = shared_memory.SharedMemory(create=True, size=max(1, len(output_names) * n * 8))
+        inputs = outputs = None
+        try:
+            inputs = np.ndarray((len(input_names), n), dtype=float, buffer=input_shm.buf)
+            outputs = np.ndarray((len(output_names), n), dtype=float, buffer=output_shm.buf)
+            for index, (start, stop) in enumerate(chunks):
+                draws = analysis.sample_chunk(index)
+                for i, name in enumerate(input_names):
+                    inputs[i, start:stop] = draws[name]
+
+            initargs = (model, input_names, output_names, n, input_shm.name, output_shm.name)
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, len(chunks)),
+                                     initializer=_init_worker, initargs=initargs) as pool:
+                done = sum(pool.map(_run_chunk, *zip(*chunks)))
+            if done != n:
+                raise RuntimeError(f"Evaluated {done} of {n} draws")
+
+            # Copy out of shared memory before it is released
+            return PSAResult(
+                inputs={name: inputs[i].copy() for i, name in enumerate(input_names)},
+                outputs={name: outputs[j].copy() for j, name in enumerate(output_names)},
+                confidence_level=analysis.confidence_level,
+                seed=analysis.seed,
+                distributions=dict(analysis.distributions),
+                correlations=analysis.correlations
+            )
+        finally:
+            # Views must be dropped before the blocks can be closed
+            del inputs, outputs
+            input_shm.close()
+            input_shm.unlink()
+            output_shm.close()
+            output_shm.unlink()
+
+    def run_summaries(self, model: Any, bins: int = 50) -> StreamingPSAResult:
+        """Evaluate all chunks in parallel, keeping only mergeable summaries.
+
+        Workers sample their own chunks and return small summaries, which
+        are merged in chunk order to match a serial run exactly.
+        """
+        analysis = self.analysis
+        edges, summaries = analysis.first_chunk(model, bins)
+        indices = range(1, len(analysis.chunks()))
+        if not indices:
+            return StreamingPSAResult(summaries, confidence_level=analysis.confidence_level, seed=analysis.seed)
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(indices))) as pool:
+            for chunk in pool.map(_summarize_chunk, repeat(analysis), repeat(model), indices, repeat(edges)):
+                summaries = merge_summaries(summaries, chunk)
+        return StreamingPSAResult(summaries, confidence_level=analysis.confidence_level, seed=analysis.seed)
@@ -0,0 +1,488 @@
+"""
+Probabilistic sensitivity analysis (PSA).
+
+Parameters are sampled from the distributions attached to the model's
+parameter classes and the model is evaluated once per chunk of draws, with
+every parameter passed through calculate_impacts() as a NumPy column.
+
+Each chunk of draws has its own random stream spawned from the run's seed,
+so a given (seed, chunk_size) always produces the same draws, whether the
+chunks are evaluated serially or in parallel.
+
+Draws come from a pluggable sampler: pseudo-random, scrambled Sobol, Halton
+or Latin hypercube. Correlations declared on the parameter classes are
+applied through a Gaussian copula. An optional convergence monitor ends the
+run early once the output means are precise enough.
+"""
+
+import json
+from functools import lru_cache
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from src import __version__
+from src.analysis.sensitivity.draw_store import DrawStore
+from src.analysis.sensitivity.model_sensitivity import total_output
+from src.analysis.sensitivity.samplers import CopulaSampler, Sampler, get_sampler
+from src.analysis.sensitivity.streaming import (
+    StreamingPSAResult,
+    histogram_edges,
+    merge_summaries,
+    summarize_chunk,
+)
+from src.models.distributions import CorrelationMatrix, Distribution
+from src.models import parameters
+
+def model_distributions(model: Any) -> Dict[str, Distribution]:
+    """Collect the parameter distributions of a model's base and therapy parameters.
+
+    Sampled parameters replace the model's point values during a run.
+    """
+    distributions = dict(getattr(type(model.params), 'distributions', {}))
+    therapy_params = getattr(model, 'therapy_params', None)
+    if therapy_params is not None:
+        distributions.update(getattr(type(therapy_params), 'distributions', {}))
+    return distributions
+
+@lru_cache(maxsize=None)
+def _correlation_matrix(params_classes: Tuple[type, ...]) -> Optional[CorrelationMatrix]:
+    """Validated correlation matrix of some parameter classes, built once per combination."""
+    pairs: Dict[Tuple[str, str], float] = {}
+    for params_class in params_classes:
+        pairs.update(getattr(params_class, 'correlations', {}))
+    return CorrelationMatrix.from_pairs(pairs) if pairs else None
+
+def model_correlations(*models: Any) -> Optional[CorrelationMatrix]:
+    """Correlation matrix declared on the parameter classes of one or more models, if any."""
+    classes: List[type] = []
+    for model in models:
+        classes.append(type(model.params))
+        therapy_params = getattr(model, 'therapy_params', None)
+        if therapy_params is not None:
+            classes.append(type(therapy_params))
+    return _correlation_matrix(tuple(dict.fromkeys(classes)))
+
+def calculator_distributions(calculator: Any) -> Dict[str, Distribution]:
+    """Collect the distributions of every formula input of a calculator.
+
+    Inputs are matched by name against the distributions declared on the
+    intervention and context parameter classes.
+    """
+    declared: Dict[str, Distribution] = {}
+    for params_class in (
+        parameters.CognitiveParams, parameters.KidneyParams, parameters.PhysicalParams,
+        parameters.LongevityParams, parameters.HealthcareParams, parameters.ImpactModifiers,
+        parameters.BasePopulationParams, parameters.BaseEconomicParams
+    ):
+        declared.update(params_class.distributions)
+    return {name: declared[name] for name in calculator.program().symbols if name in declared}
+
+def model_version(model: Any) -> str:
+    """Identifier of a model class and the package version that produced its outputs."""
+    return f"{type(model).__module__}.{type(model).__qualname__}/{__version__}"
+
+def evaluate_model(model: Any, columns: Mapping[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Evaluate a model on parameter columns and return every numeric output per draw.
+
+    The sum of all numeric outputs is included as "total".
+    """
+    size = len(next(iter(columns.values())))
+    impacts = model.with_parameters(**columns).calculate_impacts()
+    outputs = {
+        key: np.broadcast_to(np.asarray(value, dtype=float), (size,))
+        for key, value in impacts.items()
+        if key != "parameters" and isinstance(value, (int, float, np.ndarray))
+    }
+    outputs["total"] = np.broadcast_to(np.asarray(total_output(impacts), dtype=float), (size,))
+    return outputs
+
+@dataclass
+class PSAResult:
+    """Per-draw inputs and outputs of a probabilistic sensitivity analysis.
+
+    Reweighted results (see reweighting.py) carry importance weights, which
+    every statistic below takes into account.
+    """
+    inputs: Dict[str, np.ndarray]
+    outputs: Dict[str, np.ndarray]
+    confidence_level: float = 0.95
+    seed: Optional[int] = None
+    converged: Optional[bool] = None
+    distributions: Dict[str, Distribution] = field(default_factory=dict)
+    weights: Optional[np.ndarray] = None
+    # Gaussian copula the draws were sampled through, if any
+    correlations: Optional[CorrelationMatrix] = None
+    # Sort order of each output, shared with reweighted copies
+    _orders: Dict[str, np.ndarray] = field(default_factory=dict, repr=False, compare=False)
+
+    @property
+    def n_draws(self) -> int:
+        """Number of draws."""
+        return len(next(iter(self.outputs.values())))
+
+    @property
+    def effective_sample_size(self) -> float:
+        """Kish effective sample size, (sum w)^2 / sum w^2."""
+        if self.weights is None:
+            return float(self.n_draws)
+        return float(self.weights.sum() ** 2 / np.dot(self.weights, self.weights))
+
+    def means(self) -> Dict[str, float]:
+        """Mean of each output over the draws."""
+        return {
+            name: float(np.average(values, weights=self.weights))
+            for name, values in self.outputs.items()
+        }
+
+    def _order(self, name: str) -> np.ndarray:
+        """Cached argsort of an output."""
+        if name not in self._orders:
+            self._orders[name] = np.argsort(self.outputs[name], kind="stable")
+        return self._orders[name]
+
+    def _weighted_quantiles(self, name: str, q: np.ndarray) -> np.ndarray:
+        """Quantiles of an output under the importance weights."""
+        order = self._order(name)
+        cumulative = np.cumsum(self.weights[order])
+        index = np.searchsorted(cumulative, q * cumulative[-1])
+        return self.outputs[name][order[np.minimum(index, len(order) - 1)]]
+
+    def intervals(self, confidence_level: Optional[float] = None) -> Dict[str, Tuple[float, float]]:
+        """Percentile interval of each output at the given confidence level."""
+        level = self.confidence_level if confidence_level is None else confidence_level
+        tail = 100 * (1 - level) / 2
+        if self.weights is not None:
+            q = np.array([tail, 100 - tail]) / 100
+            return {
+                name: tuple(float(v) for v in self._weighted_quantiles(name, q))
+                for name in self.outputs
+            }
+        return {
+            name: tuple(float(q) for q in np.percentile(values, [tail, 100 - tail]))
+            for name, values in self.outputs.items()
+        }
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Mean, standard deviation and interval bounds of each output."""
+        intervals = self.intervals()
+        means = self.means()
+        summary = {}
+        for name, values in self.outputs.items():
+            if self.weights is not None:
+                std = float(np.sqrt(np.average((values - means[name]) ** 2, weights=self.weights)))
+            else:
+                std = float(np.std(values, ddof=1)) if len(values) > 1 else 0.0
+            summary[name] = {
+                "mean": means[name],
+                "std": std,
+                "lower": intervals[name][0],
+                "upper": intervals[name][1],
+            }
+        return summary
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per draw with sampled inputs followed by outputs (and weights)."""
+        columns = {**self.inputs, **self.outputs}
+        if self.weights is not None:
+            columns["weight"] = self.weights
+        return pd.DataFrame(columns)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Save draws, outputs and metadata to a compressed .npz file."""
+        metadata = {
+            "confidence_level": self.confidence_level,
+            "seed": self.seed,
+            "converged": self.converged,
+            "distributions": {name: d.to_dict() for name, d in self.distributions.items()},
+            "correlations": None if self.correlations is None else self.correlations.to_dict(),
+            "inputs": list(self.inputs),
+            "outputs": list(self.outputs),
+        }
+        arrays = {f"input_{i}": values for i, values in enumerate(self.inputs.values())}
+        arrays.update({f"output_{i}": values for i, values in enumerate(self.outputs.values())})
+        if self.weights is not None:
+            arrays["weights"] = self.weights
+        np.savez_compressed(path, metadata=np.array(json.dumps(metadata)), **arrays)
+
+    @classmethod
+    def from_store(cls, store: DrawStore, confidence_level: float = 0.95) -> 'PSAResult':
+        """View a stored run as a result backed by memory-mapped columns."""
+        roles = store.manifest["metadata"]
+        return cls(
+            inputs={name: store[f"input.{name}"] for name in roles["inputs"]},
+            outputs={name: store[f"output.{name}"] for name in roles["outputs"]},
+            confidence_level=confidence_level,
+            seed=store.seed,
+            distributions=store.distributions,
+            correlations=store.correlations
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'PSAResult':
+        """Load a result saved with save()."""
+        with np.load(path, allow_pickle=False) as data:
+            metadata = json.loads(str(data["metadata"]))
+            return cls(
+                inputs={name: data[f"input_{i}"] for i, name in enumerate(metadata["inputs"])},
+                outputs={name: data[f"output_{i}"] for i, name in enumerate(metadata["outputs"])},
+                confidence_level=metadata["confidence_level"],
+                seed=metadata["seed"],
+                converged=metadata["converged"],
+                distributions={
+                    name: Distribution.from_dict(d) for name, d in metadata["distributions"].items()
+                },
+                weights=data["weights"] if "weights" in data else None,
+                correlations=(
+                    None if metadata.get("correlations") is None
+                    else CorrelationMatrix.from_dict(metadata["correlations"])
+                )
+            )
+
+class ConvergenceMonitor:
+    """Stops a PSA run once the tracked output means are precise enough.
+
+    After each chunk the confidence-interval half-width of every tracked
+    output mean is compared with the tolerance. For independent draws the
+    interval comes from the pooled draws; for quasi-random and Latin
+    hypercube samplers it comes from the spread of the (independently
+    randomized) chunk means.
+    """
+
+    def __init__(
+        self,
+        tolerance: float,
+        outputs: Optional[Iterable[str]] = None,
+        relative: bool = True,
+        confidence_level: float = 0.95,
+        min_chunks: int = 8
+    ):
+        """Initialize the monitor.
+
+        Args:
+            tolerance: Largest acceptable half-width
+            outputs: Outputs to track; defaults to every output
+            relative: Interpret the tolerance as a fraction of |mean|
+            confidence_level: Coverage of the half-width
+            min_chunks: Chunks evaluated before stopping is considered
+        """
+        self.tolerance = tolerance
+        self.outputs = None if outputs is None else list(outputs)
+        self.relative = relative
+        self.confidence_level = confidence_level
+        self.min_chunks = max(2, min_chunks)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all chunks seen so far."""
+        self._counts: List[int] = []
+        self._sums: Dict[str, List[float]] = {}
+        self._squares: Dict[str, List[float]] = {}
+        self._iid = True
+
+    def update(self, results: Mapping[str, np.ndarray], iid: bool = True) -> bool:
+        """Record one chunk of outputs and report whether every tracked output has converged."""
+        self._iid = iid
+        self._counts.append(len(next(iter(results.values()))))
+        for name in self.outputs or results:
+            values = np.asarray(results[name], dtype=float)
+            self._sums.setdefault(name, []).append(float(values.sum()))
+            self._squares.setdefault(name, []).append(float(np.dot(values, values)))
+        return self.converged()
+
+    def means(self) -> Dict[str, float]:
+        """Running mean of each tracked output."""
+        total = sum(self._counts)
+        return {name: sum(sums) / total for name, sums in self._sums.items()}
+
+    def half_widths(self) -> Dict[str, float]:
+        """Confidence-interval half-width of each tracked output mean."""
+        counts = np.array(self._counts, dtype=float)
+        chunks, total = len(counts), counts.sum()
+        widths = {}
+        for name in self._sums:
+            sums = np.array(self._sums[name])
+            if self._iid:
+                mean = sums.sum() / total
+                variance = max(np.sum(self._squares[name]) / total - mean ** 2, 0.0) * total / (total - 1)
+                widths[name] = stats.norm.ppf(0.5 + self.confidence_level / 2) * np.sqrt(variance / total)
+            else:
+                chunk_means = sums / counts
+                widths[name] = (stats.t.ppf(0.5 + self.confidence_level / 2, chunks - 1)
+                                * np.std(chunk_means, ddof=1) / np.sqrt(chunks))
+        return widths
+
+    def converged(self) -> bool:
+        """Whether enough chunks were seen and every half-width is within tolerance."""
+        if len(self._counts) < self.min_chunks:
+            return False
+        means = self.means()
+        for name, width in self.half_widths().items():
+            limit = self.tolerance * abs(means[name]) if self.relative else self.tolerance
+            if not width <= limit:
+                return False
+        return True
+
+class ProbabilisticSensitivityAnalysis:
+    """Monte Carlo propagation of parameter uncertainty through an impact model."""
+
+    def __init__(
+        self,
+        distributions: Mapping[str, Distribution],
+        n_draws: int = 1000,
+        seed: Optional[int] = None,
+        confidence_level: float = 0.95,
+        chunk_size: int = 100_000,
+        sampler: Union[str, Sampler] = "random",
+        correlations: Optional[CorrelationMatrix] = None
+    ):
+        """Initialize the analysis.
+
+        Args:
+            distributions: Parameter name -> distribution to sample
+            n_draws: Number of Monte Carlo draws
+            seed: Seed for reproducible draws; fresh entropy when omitted
+            confidence_level: Coverage of the reported percentile intervals
+            chunk_size: Draws sampled and evaluated together
+            sampler: "random", "sobol", "halton", "lhs" or a Sampler
+            correlations: Correlations between parameters, sampled through
+                a Gaussian copula over the sampler
+        """
+        if n_draws < 1:
+            raise ValueError("n_draws must be positive")
+        self.distributions = dict(distributions)
+        self.n_draws = n_draws
+        self.seed = np.random.SeedSequence(seed).entropy
+        self.confidence_level = confidence_level
+        self.chunk_size = chunk_size
+        self.sampler = get_sampler(sampler)
+        self.correlations = correlations
+        if correlations is not None:
+            self.sampler = CopulaSampler(correlations, self.sampler)
+
+    @classmethod
+    def for_model(cls, model: Any, **kwargs: Any) -> 'ProbabilisticSensitivityAnalysis':
+        """Create an analysis over every distribution and correlation attached to the model's parameters."""
+        kwargs.setdefault("correlations", model_correlations(model))
+        return cls(model_distributions(model), **kwargs)
+
+    def chunks(self) -> List[Tuple[int, int]]:
+        """(start, stop) draw indices of each chunk."""
+        return [
+            (start, min(start + self.chunk_size, self.n_draws))
+            for start in range(0, self.n_draws, self.chunk_size)
+        ]
+
+    def chunk_seed(self, index: int) -> np.random.SeedSequence:
+        """Independent seed sequence of one chunk, as spawned from the master seed.
+
+        Equal to SeedSequence(seed).spawn(n)[index], built directly so
+        sampling every chunk does not respawn the others.
+        """
+        return np.random.SeedSequence(self.seed, spawn_key=(index,))
+
+    def sample_chunk(self, index: int) -> Dict[str, np.ndarray]:
+        """Sample the draws of one chunk from its own random stream."""
+        start = index * self.chunk_size
+        stop = min(start + self.chunk_size, self.n_draws)
+        return self.sampler.sample(self.distributions, stop - start, self.chunk_seed(index))
+
+    def sample(self) -> Dict[str, np.ndarray]:
+        """Sample every draw, shape (n_draws,) per parameter."""
+        chunks = [self.sample_chunk(i) for i in range(len(self.chunks()))]
+        return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in self.distributions}
+
+    def run(self, model: Any, monitor: Optional[ConvergenceMonitor] = None) -> PSAResult:
+        """Sample draws and evaluate the model on them chunk by chunk.
+
+        With a monitor, n_draws is the most draws taken and the run stops
+        after the first chunk at which the monitor reports convergence.
+        """
+        inputs: Dict[str, np.ndarray] = {}
+        outputs: Dict[str, np.ndarray] = {}
+        converged = None
+        drawn = 0
+        if monitor is not None:
+            monitor.reset()
+        for index, (start, stop) in enumerate(self.chunks()):
+            draws = self.sample_chunk(index)
+            results = evaluate_model(model, draws)
+            if not outputs:
+                inputs = {name: np.empty(self.n_draws) for name in draws}
+                outputs = {name: np.empty(self.n_draws) for name in results}
+            for name, values in draws.items():
+                inputs[name][start:stop] = values
+            for name, values in results.items():
+                outputs[name][start:stop] = values
+            drawn = stop
+            if monitor is not None:
+                converged = monitor.update(results, iid=self.sampler.iid)
+                if converged:
+                    break
+        if drawn < self.n_draws:
+            inputs = {name: values[:drawn] for name, values in inputs.items()}
+            outputs = {name: values[:drawn] for name, values in outputs.items()}
+        return PSAResult(
+            inputs=inputs,
+            outputs=outputs,
+            confidence_level=self.confidence_level,
+            seed=self.seed,
+            converged=converged,
+            distributions=dict(self.distributions),
+            correlations=self.correlations
+        )
+
+    def run_to_store(self, model: Any, path: Union[str, Path]) -> DrawStore:
+        """Evaluate every chunk and append its draws and outputs to an on-disk store.
+
+        Only one chunk is held in memory at a time. Columns are named
+        "input.<parameter>" and "output.<output>".
+        """
+        store = None
+        for index, (start, stop) in enumerate(self.chunks()):
+            draws = self.sample_chunk(index)
+            results = evaluate_model(model, draws)
+            if store is None:
+                store = DrawStore.create(
+                    path,
+                    [f"input.{name}" for name in draws] + [f"output.{name}" for name in results],
+                    capacity=self.n_draws,
+                    distributions=self.distributions,
+                    correlations=self.correlations,
+                    seed=self.seed,
+                    model_version=model_version(model),
+                    metadata={"inputs": list(draws), "outputs": list(results), "sampler": type(self.sampler).__name__}
+                )
+            chunk = {f"input.{name}": values for name, values in draws.items()}
+            chunk.update({f"output.{name}": values for name, values in results.items()})
+            store.append(chunk)
+        store.flush()
+        return store
+
+    def summarize_chunk(self, model: Any, index: int, edges: Optional[Dict[str, np.ndarray]] = None):
+        """Sample and evaluate one chunk, keeping only its output summaries."""
+        return summarize_chunk(evaluate_model(model, self.sample_chunk(index)), edges)
+
+    def first_chunk(self, model: Any, bins: int = 50) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """Fixed histogram edges for every output, derived from the first chunk, and that chunk's summary.
+
+        The first chunk is evaluated once and serves both.
+        """
+        outputs = evaluate_model(model, self.sample_chunk(0))
+        edges = {name: histogram_edges(values, bins) for name, values in outputs.items()}
+        return edges, summarize_chunk(outputs, edges)
+
+    def run_summaries(self, model: Any, bins: int = 50) -> StreamingPSAResult:
+        """Evaluate every chunk but keep only mergeable output summaries.
+
+        Memory use is bounded by one chunk regardless of n_draws. Chunk
+        summaries are merged in chunk order, so parallel runs match exactly.
+        """
+        edges, summaries = self.first_chunk(model, bins)
+        for index in range(1, len(self.chunks())):
+            summaries = merge_summaries(summaries, self.summarize_chunk(model, index, edges))
+        return StreamingPSAResult(summaries, confidence_level=self.confidence_level, seed=self.seed)
@@ -0,0 +1,164 @@
+"""
+Sampler backends for probabilistic sensitivity analysis.
+
+A sampler draws the parameter values of one PSA chunk from that chunk's
+seed. Pseudo-random sampling draws from each distribution directly. The
+quasi-Monte Carlo (scrambled Sobol, scrambled Halton) and Latin hypercube
+samplers generate uniform points and map them through each distribution's
+inverse CDF; every chunk is an independent randomization, so chunk means
+are independent estimates that convergence checks can compare.
+
+Correlated parameters are sampled through a Gaussian copula wrapped around
+any of these: standard normals are correlated with one product by the
+cached Cholesky factor and mapped onto each marginal through a table of its
+quantiles at normal scores, tabulated once per distribution.
+"""
+
+from abc import ABC, abstractmethod
+import warnings
+from functools import lru_cache
+from typing import Dict, Mapping, Tuple, Union
+
+import numpy as np
+from scipy import special
+from scipy.stats import qmc
+
+from src.models.distributions import CorrelationMatrix, Distribution, sample_all
+
+# Normal-score grid of the copula quantile tables; relative error below 1e-7
+NORMAL_SCORE_LIMIT = 8.0
+NORMAL_SCORE_POINTS = 16385
+
+@lru_cache(maxsize=None)
+def _quantile_table(distribution: Distribution) -> Tuple[np.ndarray, np.ndarray]:
+    """Quantiles of a distribution at evenly spaced normal scores, and their differences."""
+    scores = np.linspace(-NORMAL_SCORE_LIMIT, NORMAL_SCORE_LIMIT, NORMAL_SCORE_POINTS)
+    table = distribution.ppf(special.ndtr(scores))
+    slopes = np.diff(table)
+    table.flags.writeable = slopes.flags.writeable = False
+    return table, slopes
+
+def normal_scores_to_values(distribution: Distribution, scores: np.ndarray) -> np.ndarray:
+    """Map standard normal scores onto a distribution, ppf(ndtr(z)), by linear table lookup."""
+    table, slopes = _quantile_table(distribution)
+    step = 2 * NORMAL_SCORE_LIMIT / (NORMAL_SCORE_POINTS - 1)
+    # In place: the lookup runs on millions of draws
+    position = scores * (1 / step)
+    position += NORMAL_SCORE_LIMIT / step
+    np.clip(position, 0, NORMAL_SCORE_POINTS - 1, out=position)
+    index = position.astype(np.intp)
+    np.minimum(index, NORMAL_SCORE_POINTS - 2, out=index)
+    position -= index
+    position *= slopes[index]
+    position += table[index]
+    return position
+
+class Sampler(ABC):
+    """Draws parameter values for one chunk."""
+
+    # Whether individual draws are independent; otherwise only chunks are
+    iid = False
+
+    @abstractmethod
+    def sample(self, distributions: Mapping[str, Distribution], size: int,
+               seed: np.random.SeedSequence) -> Dict[str, np.ndarray]:
+        """Draw `size` values per parameter."""
+        pass
+
+class RandomSampler(Sampler):
+    """Pseudo-random sampling from each distribution."""
+
+    iid = True
+
+    def sample(self, distributions: Mapping[str, Distribution], size: int,
+               seed: np.random.SeedSequence) -> Dict[str, np.ndarray]:
+        return sample_all(dict(distributions), np.random.default_rng(seed), size)
+
+class UnitCubeSampler(Sampler):
+    """Sampler that maps points in the unit hypercube through inverse CDFs."""
+
+    @abstractmethod
+    def unit(self, k: int, size: int, rng: np.random.Generator) -> np.ndarray:
+        """Points in [0, 1)^k, shape (size, k)."""
+        pass
+
+    def sample(self, distributions: Mapping[str, Distribution], size: int,
+               seed: np.random.SeedSequence) -> Dict[str, np.ndarray]:
+        points = self.unit(len(distributions), size, np.random.default_rng(seed))
+        return {name: distribution.ppf(points[:, j]) for j, (name, distribution) in enumerate(distributions.items())}
+
+class SobolSampler(UnitCubeSampler):
+    """Scrambled Sobol points; chunk sizes that are powers of two balance best."""
+
+    def unit(self, k: int, size: int, rng: np.random.Generator) -> np.ndarray:
+        with warnings.catch_warnings():
+            # scipy warns for sizes that are not powers of two
+            warnings.simplefilter("ignore", UserWarning)
+            return qmc.Sobol(k, scramble=True, rng=rng).random(size)
+
+class HaltonSampler(UnitCubeSampler):
+    """Scrambled Halton points."""
+
+    def unit(self, k: int, size: int, rng: np.random.Generator) -> np.ndarray:
+        return qmc.Halton(k, scramble=True, rng=rng).random(size)
+
+class LatinHypercubeSampler(UnitCubeSampler):
+    """Latin hypercube points, one stratum per draw in every dimension."""
+
+    def unit(self, k: int, size: int, rng: np.random.Generator) -> np.ndarray:
+        return qmc.LatinHypercube(k, rng=rng).random(size)
+
+class CopulaSampler(Sampler):
+    """Gaussian copula over another sampler, for correlated parameters.
+
+    Only the correlated parameters go through the copula; the rest are
+    drawn by the base sampler as usual. Unit-cube bases generate one point
+    for all parameters, keeping the quasi-random structure in every
+    dimension.
+    """
+
+    def __init__(self, correlation: CorrelationMatrix, base: Union[str, Sampler] = "random"):
+        """Initialize the sampler.
+
+        Args:
+            correlation: Validated correlation matrix with its Cholesky factor
+            base: Sampler providing the independent points
+        """
+        self.correlation = correlation
+        self.base = get_sampler(base)
+        self.iid = self.base.iid
+
+    def sample(self, distributions: Mapping[str, Distribution], size: int,
+               seed: np.random.SeedSequence) -> Dict[str, np.ndarray]:
+        missing = [name for name in self.correlation.names if name not in distributions]
+        if missing:
+            raise ValueError(f"Correlated parameters without distributions: {', '.join(missing)}")
+        rng = np.random.default_rng(seed)
+        correlated = self.correlation.names
+        if isinstance(self.base, UnitCubeSampler):
+            names = list(distributions)
+            points = self.base.unit(len(names), size, rng)
+            columns = [names.index(name) for name in correlated]
+            scores = self.correlation.correlate(special.ndtri(np.ascontiguousarray(points[:, columns].T)))
+            draws = {name: distributions[name].ppf(points[:, j]) for j, name in enumerate(names) if name not in correlated}
+        else:
+            scores = self.correlation.correlate(rng.standard_normal((len(correlated), size)))
+            draws = sample_all({name: d for name, d in distributions.items() if name not in correlated}, rng, size)
+        for j, name in enumerate(correlated):
+            draws[name] = normal_scores_to_values(distributions[name], scores[j])
+        return {name: draws[name] for name in distributions}
+
+SAMPLERS: Dict[str, Sampler] = {
+    "random": RandomSampler(),
+    "sobol": SobolSampler(),
+    "halton": HaltonSampler(),
+    "lhs": LatinHypercubeSampler(),
+}
+
+def get_sampler(sampler: Union[str, Sampler]) -> Sampler:
+    """Look up a sampler by name, or pass a sampler instance through."""
+    if isinstance(sampler, Sampler):
+        return sampler
+    if sampler not in SAMPLERS:
+        raise ValueError(f"Unknown sampler '{sampler}'; expected one of {', '.join(SAMPLERS)}")
+    return SAMPLERS[sampler]
@@ -0,0 +1,244 @@
+"""
+Mergeable streaming summaries of PSA outputs.
+
+Each accumulator is built from a NumPy chunk and merged with others, so a run
+of any size needs memory for one chunk only. A run folds its per-chunk
+summaries together in chunk order, which makes serial and parallel runs
+produce identical results.
+
+- Moments: count, mean and variance (Chan et al. pairwise update), min, max
+- QuantileSketch: merging t-digest with the arcsine scale function
+- Histogram: fixed bin edges plus underflow and overflow counts
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+@dataclass
+class Moments:
+    """Count, mean, variance, minimum and maximum."""
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    minimum: float = np.inf
+    maximum: float = -np.inf
+
+    @classmethod
+    def from_values(cls, values: np.ndarray) -> 'Moments':
+        """Summarize one chunk."""
+        values = np.asarray(values, dtype=float)
+        if not len(values):
+            return cls()
+        mean = float(values.mean())
+        return cls(
+            count=len(values),
+            mean=mean,
+            m2=float(np.sum((values - mean) ** 2)),
+            minimum=float(values.min()),
+            maximum=float(values.max())
+        )
+
+    def merge(self, other: 'Moments') -> 'Moments':
+        """Combine with another summary (Chan et al.)."""
+        if not other.count:
+            return self
+        if not self.count:
+            return other
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        return Moments(
+            count=count,
+            mean=self.mean + delta * other.count / count,
+            m2=self.m2 + other.m2 + delta ** 2 * self.count * other.count / count,
+            minimum=min(self.minimum, other.minimum),
+            maximum=max(self.maximum, other.maximum)
+        )
+
+    @property
+    def variance(self) -> float:
+        """Sample variance."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation."""
+        return float(np.sqrt(self.variance))
+
+@dataclass
+class QuantileSketch:
+    """Merging t-digest: weighted centroids, densest in the tails.
+
+    Adjacent centroids are merged while they span at most one unit of the
+    scale k(q) = compression / (2π) · asin(2q - 1), which keeps about
+    compression / 2 centroids and small relative errors in the tails.
+    """
+    compression: float = 400
+    means: np.ndarray = field(default_factory=lambda: np.empty(0))
+    weights: np.ndarray = field(default_factory=lambda: np.empty(0))
+    minimum: float = np.inf
+    maximum: float = -np.inf
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, compression: float = 400) -> 'QuantileSketch':
+        """Summarize one chunk."""
+        values = np.sort(np.asarray(values, dtype=float))
+        sketch = cls(compression=compression)
+        if len(values):
+            sketch = cls(compression, values, np.ones(len(values)), float(values[0]), float(values[-1]))
+            sketch._compress()
+        return sketch
+
+    def _scale(self, q: np.ndarray) -> np.ndarray:
+        return self.compression / (2 * np.pi) * np.arcsin(2 * np.clip(q, 0, 1) - 1)
+
+    def _compress(self) -> None:
+        """Merge sorted centroids that fall in the same unit of the scale function."""
+        total = self.weights.sum()
+        left = (np.cumsum(self.weights) - self.weights) / total
+        bucket = np.floor(self._scale(left) - self._scale(np.zeros(1))).astype(np.int64)
+        starts = np.flatnonzero(np.diff(bucket, prepend=-1))
+        weights = np.add.reduceat(self.weights, starts)
+        self.means = np.add.reduceat(self.means * self.weights, starts) / weights
+        self.weights = weights
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """Combine with another sketch."""
+        if not len(other.weights):
+            return self
+        if not len(self.weights):
+            return other
+        means = np.concatenate([self.means, other.means])
+        order = np.argsort(means, kind="stable")
+        merged = QuantileSketch(
+            compression=self.compression,
+            means=means[order],
+            weights=np.concatenate([self.weights, other.weights])[order],
+            minimum=min(self.minimum, other.minimum),
+            maximum=max(self.maximum, other.maximum)
+        )
+        merged._compress()
+        return merged
+
+    @property
+    def count(self) -> float:
+        """Total weight summarized."""
+        return float(self.weights.sum())
+
+    def quantile(self, q) -> np.ndarray:
+        """Estimate quantiles by interpolating between centroid midpoints."""
+        total = self.weights.sum()
+        centers = (np.cumsum(self.weights) - self.weights / 2) / total
+        xp = np.concatenate([[0.0], centers, [1.0]])
+        fp = np.concatenate([[self.minimum], self.means, [self.maximum]])
+        return np.interp(q, xp, fp)
+
+@dataclass
+class Histogram:
+    """Counts over fixed bin edges; counts[0] and counts[-1] hold under- and overflow."""
+    edges: np.ndarray
+    counts: np.ndarray = None
+
+    def __post_init__(self):
+        self.edges = np.asarray(self.edges, dtype=float)
+        if self.counts is None:
+            self.counts = np.zeros(len(self.edges) + 1, dtype=np.int64)
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, edges: np.ndarray) -> 'Histogram':
+        """Summarize one chunk."""
+        edges = np.asarray(edges, dtype=float)
+        index = np.searchsorted(edges, np.asarray(values, dtype=float), side='right')
+        return cls(edges, np.bincount(index, minlength=len(edges) + 1).astype(np.int64))
+
+    def merge(self, other: 'Histogram') -> 'Histogram':
+        """Combine with a histogram over the same edges."""
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Histograms have different bin edges")
+        return Histogram(self.edges, self.counts + other.counts)
+
+    @property
+    def bin_counts(self) -> np.ndarray:
+        """Counts inside the edges, excluding under- and overflow."""
+        return self.counts[1:-1]
+
+@dataclass
+class OutputSummary:
+    """Moments, quantile sketch and histogram of one output."""
+    moments: Moments
+    sketch: QuantileSketch
+    histogram: Optional[Histogram] = None
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, edges: Optional[np.ndarray] = None,
+                    compression: float = 400) -> 'OutputSummary':
+        """Summarize one chunk."""
+        return cls(
+            Moments.from_values(values),
+            QuantileSketch.from_values(values, compression),
+            None if edges is None else Histogram.from_values(values, edges)
+        )
+
+    def merge(self, other: 'OutputSummary') -> 'OutputSummary':
+        """Combine with another summary of the same output."""
+        histogram = self.histogram
+        if histogram is not None and other.histogram is not None:
+            histogram = histogram.merge(other.histogram)
+        return OutputSummary(self.moments.merge(other.moments), self.sketch.merge(other.sketch), histogram)
+
+def histogram_edges(values: np.ndarray, bins: int = 50, padding: float = 0.5) -> np.ndarray:
+    """Fixed bin edges spanning a sample's range, widened by `padding` on each side."""
+    low, high = float(np.min(values)), float(np.max(values))
+    span = (high - low) or max(abs(low), 1.0)
+    return np.linspace(low - padding * span, high + padding * span, bins + 1)
+
+def summarize_chunk(outputs: Dict[str, np.ndarray], edges: Optional[Dict[str, np.ndarray]] = None,
+                    compression: float = 400) -> Dict[str, OutputSummary]:
+    """Summarize every output of one chunk."""
+    edges = edges or {}
+    return {name: OutputSummary.from_values(values, edges.get(name), compression) for name, values in outputs.items()}
+
+def merge_summaries(first: Dict[str, OutputSummary], second: Dict[str, OutputSummary]) -> Dict[str, OutputSummary]:
+    """Merge two per-output summaries."""
+    if not first:
+        return second
+    return {name: first[name].merge(second[name]) for name in first}
+
+@dataclass
+class StreamingPSAResult:
+    """Summaries of a PSA run whose draws were not kept."""
+    summaries: Dict[str, OutputSummary]
+    confidence_level: float = 0.95
+    seed: Optional[int] = None
+
+    @property
+    def n_draws(self) -> int:
+        """Number of draws."""
+        return next(iter(self.summaries.values())).moments.count
+
+    def means(self) -> Dict[str, float]:
+        """Mean of each output over the draws."""
+        return {name: summary.moments.mean for name, summary in self.summaries.items()}
+
+    def intervals(self, confidence_level: Optional[float] = None) -> Dict[str, Tuple[float, float]]:
+        """Sketch-estimated percentile interval of each output."""
+        level = self.confidence_level if confidence_level is None else confidence_level
+        q = np.array([(1 - level) / 2, (1 + level) / 2])
+        return {
+            name: tuple(float(v) for v in summary.sketch.quantile(q))
+            for name, summary in self.summaries.items()
+        }
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Mean, standard deviation and interval bounds of each output."""
+        intervals = self.intervals()
+        return {
+            name: {
+                "mean": s.moments.mean,
+                "std": s.moments.std,
+                "lower": intervals[name][0],
+                "upper": intervals[name][1],
+            }
+            for name, s in self.summaries.items()
+        }
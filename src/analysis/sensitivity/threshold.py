@@ -0,0 +1,103 @@
+"""
+Threshold (breakeven) analysis by vectorized bisection.
+
+Finds, for every scenario at once, the parameter value at which an output
+reaches a target: an effect size that makes net monetary benefit zero, or an
+ICER equal to a willingness to pay. Each bisection step evaluates the model
+once on the midpoints of all unfinished scenarios, so thousands of
+thresholds cost about as many model calls as one.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+ArrayLike = Union[float, np.ndarray]
+
+@dataclass
+class ThresholdResult:
+    """Threshold of each scenario with its convergence state."""
+    values: np.ndarray
+    converged: np.ndarray
+    bracketed: np.ndarray
+    residuals: np.ndarray
+    iterations: int
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per scenario."""
+        return pd.DataFrame({
+            "threshold": self.values,
+            "converged": self.converged,
+            "bracketed": self.bracketed,
+            "residual": self.residuals,
+        })
+
+def bisect(
+    evaluate: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    low: ArrayLike,
+    high: ArrayLike,
+    target: ArrayLike = 0.0,
+    tolerance: float = 1e-8,
+    max_iterations: int = 200,
+    size: Optional[int] = None
+) -> ThresholdResult:
+    """Solve evaluate(x) = target by bracketed bisection for many scenarios at once.
+
+    Args:
+        evaluate: Maps candidate values and the scenario indices they belong
+            to (both shape (m,)) to outputs of shape (m,); only unfinished
+            scenarios are evaluated after the first step
+        low, high: Bracket ends, scalars or one per scenario
+        target: Output to reach, scalar or one per scenario
+        tolerance: Absolute width, in parameter units, below which a
+            scenario's threshold is converged
+        max_iterations: Most bisection steps
+        size: Number of scenarios when every other argument is scalar
+
+    Returns:
+        ThresholdResult; scenarios whose bracket ends give outputs on the
+        same side of the target are not bracketed and get nan
+    """
+    n = size or max(np.size(low), np.size(high), np.size(target))
+    lo = np.array(np.broadcast_to(np.asarray(low, dtype=float), (n,)))
+    hi = np.array(np.broadcast_to(np.asarray(high, dtype=float), (n,)))
+    target = np.broadcast_to(np.asarray(target, dtype=float), (n,))
+    index = np.arange(n)
+
+    f_lo = np.asarray(evaluate(lo, index), dtype=float) - target
+    f_hi = np.asarray(evaluate(hi, index), dtype=float) - target
+    bracketed = np.isfinite(f_lo) & np.isfinite(f_hi) & (np.sign(f_lo) * np.sign(f_hi) <= 0)
+    values = np.full(n, np.nan)
+    residuals = np.full(n, np.nan)
+
+    # Roots exactly at a bracket end need no search
+    for end, f_end in ((lo, f_lo), (hi, f_hi)):
+        exact = bracketed & (f_end == 0) & np.isnan(values)
+        values[exact] = end[exact]
+        residuals[exact] = 0.0
+    active = bracketed & np.isnan(values)
+
+    iterations = 0
+    while active.any() and iterations < max_iterations:
+        iterations += 1
+        at = np.flatnonzero(active)
+        mid = (lo[at] + hi[at]) / 2
+        f_mid = np.asarray(evaluate(mid, at), dtype=float) - target[at]
+        # Keep the half whose ends still straddle the target
+        right = np.sign(f_mid) == np.sign(f_lo[at])
+        lo[at[right]], f_lo[at[right]] = mid[right], f_mid[right]
+        hi[at[~right]] = mid[~right]
+        residuals[at] = f_mid
+        values[at] = mid
+        done = (f_mid == 0) | ((hi[at] - lo[at]) / 2 <= tolerance)
+        active[at[done]] = False
+
+    return ThresholdResult(
+        values=values,
+        converged=bracketed & ~active,
+        bracketed=bracketed,
+        residuals=residuals,
+        iterations=iterations
+    )
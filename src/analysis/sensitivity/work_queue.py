@@ -0,0 +1,390 @@
+"""
+Filesystem work queue for long-running, resumable analyses.
+
+A queue is a directory on a filesystem shared by every participating host;
+no other service is needed:
+
+    job.pkl                   the pickled job, so any host can join
+    job.json                  fingerprint of the job's inputs
+    pending/shard_00000       shards waiting for a worker
+    claimed/shard_00000@<id>  shards being worked on, renamed from pending/
+    done/shard_00000.pkl      checkpointed shard results
+
+A shard is claimed by renaming it out of pending/, which succeeds for
+exactly one worker. Results are written to a temporary file and renamed
+into done/, so a checkpoint is either complete or absent. A restarted run
+skips shards that are done and returns orphaned claims to pending/; it
+refuses to resume a queue created for a job with different inputs. Once
+every shard is done the results are combined by a pairwise tree merge in
+shard order, so the reduction is the same however the shards were run.
+"""
+
+from abc import ABC, abstractmethod
+import json
+import os
+import pickle
+import socket
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.sensitivity.psa import ProbabilisticSensitivityAnalysis
+from src.analysis.sensitivity.streaming import StreamingPSAResult, merge_summaries
+from src.models.gene_therapy.follistatin.fat_reduction_model import MarkovModel, ModelParameters
+
+JOB = "job.pkl"
+FINGERPRINT = "job.json"
+
+def _describe(value: Any) -> Any:
+    """JSON form of an object a job fingerprint refers to."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if hasattr(value, "__dict__"):
+        # Private attributes hold caches, not inputs
+        public = {name: v for name, v in vars(value).items() if not name.startswith("_")}
+        return {"type": type(value).__name__, **public}
+    return repr(value)
+
+class QueueJob(ABC):
+    """Work split into independent shards whose results merge pairwise."""
+
+    @abstractmethod
+    def shards(self) -> int:
+        """Number of shards."""
+        pass
+
+    @abstractmethod
+    def run(self, index: int) -> Any:
+        """Compute the result of one shard."""
+        pass
+
+    @abstractmethod
+    def merge(self, first: Any, second: Any) -> Any:
+        """Combine the results of two adjacent shard ranges, `first` preceding `second`."""
+        pass
+
+    def finalize(self, result: Any) -> Any:
+        """Turn the merged result into the job's output."""
+        return result
+
+    def fingerprint(self) -> Dict[str, Any]:
+        """Inputs that determine the job's results; a queue only resumes a job with the same fingerprint."""
+        return {"job": type(self).__name__}
+
+    def fingerprint_json(self) -> str:
+        """Canonical JSON of the fingerprint, as stored in the queue directory."""
+        return json.dumps(self.fingerprint(), sort_keys=True, default=_describe)
+
+class PSASummaryJob(QueueJob):
+    """Summaries-only probabilistic sensitivity analysis, one shard per chunk."""
+
+    def __init__(self, analysis: ProbabilisticSensitivityAnalysis, model: Any, bins: int = 50):
+        """Initialize the job.
+
+        Args:
+            analysis: Analysis defining distributions, draws, seed and chunking
+            model: Impact model to evaluate
+            bins: Histogram bins per output
+        """
+        self.analysis = analysis
+        self.model = model
+        # Fixed up front so every shard's histograms merge; the chunk
+        # evaluated for them is kept as shard 0's result
+        self.edges, self.first = analysis.first_chunk(model, bins)
+
+    def shards(self) -> int:
+        return len(self.analysis.chunks())
+
+    def run(self, index: int) -> Any:
+        if index == 0:
+            return self.first
+        return self.analysis.summarize_chunk(self.model, index, self.edges)
+
+    def merge(self, first: Any, second: Any) -> Any:
+        return merge_summaries(first, second)
+
+    def finalize(self, result: Any) -> StreamingPSAResult:
+        return StreamingPSAResult(result, confidence_level=self.analysis.confidence_level, seed=self.analysis.seed)
+
+    def fingerprint(self) -> Dict[str, Any]:
+        return {
+            "job": type(self).__name__,
+            "seed": self.analysis.seed,
+            "n_draws": self.analysis.n_draws,
+            "chunk_size": self.analysis.chunk_size,
+            "confidence_level": self.analysis.confidence_level,
+            "sampler": self.analysis.sampler,
+            "distributions": self.analysis.distributions,
+            "model": type(self.model).__name__,
+            "parameters": self.model.parameter_values(),
+            "edges": self.edges,
+        }
+
+class CohortSimulationJob(QueueJob):
+    """Markov cohort simulations of many parameter scenarios."""
+
+    def __init__(self, scenarios: Sequence[ModelParameters], shard_size: int = 100):
+        """Initialize the job.
+
+        Args:
+            scenarios: Model parameters of each scenario
+            shard_size: Scenarios simulated per shard
+        """
+        self.scenarios = list(scenarios)
+        self.shard_size = shard_size
+
+    def shards(self) -> int:
+        return -(-len(self.scenarios) // self.shard_size)
+
+    def run(self, index: int) -> Dict[str, np.ndarray]:
+        start = index * self.shard_size
+        totals: Dict[str, List[float]] = {"scenario": [], "qalys": [], "costs": []}
+        for offset, params in enumerate(self.scenarios[start:start + self.shard_size]):
+            model = MarkovModel(params)
+            model.build_transition_matrix()
+            results = model.run_cohort_simulation(as_frame=False)
+            totals["scenario"].append(start + offset)
+            totals["qalys"].append(results.qalys.sum())
+            totals["costs"].append(results.costs.sum())
+        return {name: np.array(values) for name, values in totals.items()}
+
+    def merge(self, first: Dict[str, np.ndarray], second: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        return {name: np.concatenate([first[name], second[name]]) for name in first}
+
+    def finalize(self, result: Dict[str, np.ndarray]) -> pd.DataFrame:
+        """Total QALYs and costs of each scenario over the time horizon."""
+        return pd.DataFrame(result).astype({"scenario": int})
+
+    def fingerprint(self) -> Dict[str, Any]:
+        return {"job": type(self).__name__, "shard_size": self.shard_size, "scenarios": self.scenarios}
+
+def tree_merge(results: Sequence[Any], merge) -> Any:
+    """Combine results pairwise, level by level, keeping their order."""
+    results = list(results)
+    if not results:
+        raise ValueError("Nothing to merge")
+    while len(results) > 1:
+        merged = [merge(results[i], results[i + 1]) for i in range(0, len(results) - 1, 2)]
+        if len(results) % 2:
+            merged.append(results[-1])
+        results = merged
+    return results[0]
+
+def worker_id() -> str:
+    """Identifier of this process, unique across hosts."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Write a file under a temporary name and rename it into place."""
+    temporary = path.with_name(f".{path.name}.{worker_id()}.tmp")
+    with open(temporary, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+class WorkQueue:
+    """Shards of a job, claimed and checkpointed through a shared directory."""
+
+    def __init__(self, directory: Union[str, Path]):
+        """Open an existing queue."""
+        self.directory = Path(directory)
+        with open(self.directory / JOB, "rb") as f:
+            self.job: QueueJob = pickle.load(f)
+        self.n_shards = self.job.shards()
+
+    @classmethod
+    def create(cls, directory: Union[str, Path], job: QueueJob) -> 'WorkQueue':
+        """Create a queue for a job, or reopen the queue already in `directory`.
+
+        Reopening keeps the stored job and its checkpoints, so a restarted
+        run resumes instead of starting over. The job must have the same
+        fingerprint as the stored one, or old results would be returned for
+        new inputs.
+        """
+        directory = Path(directory)
+        fingerprint = job.fingerprint_json()
+        if (directory / JOB).exists():
+            queue = cls(directory)
+            if queue.n_shards != job.shards():
+                raise ValueError(
+                    f"Queue at {directory} has {queue.n_shards} shards, the job has {job.shards()}"
+                )
+            stored = (directory / FINGERPRINT).read_text() if (directory / FINGERPRINT).exists() else None
+            if stored != fingerprint:
+                raise ValueError(
+                    f"Queue at {directory} was created for a different job; use a new directory"
+                )
+            return queue
+        for sub in ("pending", "claimed", "done"):
+            (directory / sub).mkdir(parents=True, exist_ok=True)
+        for index in range(job.shards()):
+            (directory / "pending" / cls._name(index)).touch()
+        _atomic_write(directory / FINGERPRINT, fingerprint.encode())
+        # Written last: a queue with a job file is fully populated
+        _atomic_write(directory / JOB, pickle.dumps(job))
+        return cls(directory)
+
+    @staticmethod
+    def _name(index: int) -> str:
+        return f"shard_{index:05d}"
+
+    @staticmethod
+    def _index(name: str) -> int:
+        return int(name.split("@")[0].split(".")[0][len("shard_"):])
+
+    def _checkpoint(self, index: int) -> Path:
+        return self.directory / "done" / f"{self._name(index)}.pkl"
+
+    def completed(self) -> List[int]:
+        """Indices of shards with a checkpoint."""
+        return sorted(
+            self._index(path.name) for path in (self.directory / "done").iterdir()
+            if path.name.startswith("shard_") and path.suffix == ".pkl"
+        )
+
+    def is_complete(self) -> bool:
+        """Whether every shard has a checkpoint."""
+        return len(self.completed()) == self.n_shards
+
+    def claim(self, worker: Optional[str] = None) -> Optional[int]:
+        """Claim a pending shard, or return None when none is left.
+
+        The rename out of pending/ succeeds for exactly one worker; losers
+        move on to the next shard.
+        """
+        worker = worker or worker_id()
+        for name in sorted(os.listdir(self.directory / "pending")):
+            claimed = self.directory / "claimed" / f"{name}@{worker}"
+            try:
+                os.rename(self.directory / "pending" / name, claimed)
+            except FileNotFoundError:
+                continue
+            # Claim age is measured from now, not from queue creation
+            os.utime(claimed)
+            index = self._index(name)
+            if self._checkpoint(index).exists():
+                claimed.unlink()
+                continue
+            return index
+        return None
+
+    def complete(self, index: int, result: Any, worker: Optional[str] = None) -> None:
+        """Checkpoint a shard's result and release its claim."""
+        worker = worker or worker_id()
+        _atomic_write(self._checkpoint(index), pickle.dumps(result))
+        claim = self.directory / "claimed" / f"{self._name(index)}@{worker}"
+        if claim.exists():
+            claim.unlink()
+
+    def recover(self, older_than: Optional[float] = None) -> int:
+        """Return orphaned claims to pending/.
+
+        Args:
+            older_than: Only recover claims at least this many seconds old,
+                leaving live claims of other hosts alone; None recovers all
+
+        Returns:
+            Number of shards returned to pending/
+        """
+        recovered = 0
+        now = time.time()
+        for path in (self.directory / "claimed").iterdir():
+            if older_than is not None and now - path.stat().st_mtime < older_than:
+                continue
+            index = self._index(path.name)
+            try:
+                if self._checkpoint(index).exists():
+                    path.unlink()
+                else:
+                    os.rename(path, self.directory / "pending" / self._name(index))
+                    recovered += 1
+            except FileNotFoundError:
+                # Completed or recovered by another worker meanwhile
+                continue
+        return recovered
+
+    def work(self, worker: Optional[str] = None) -> int:
+        """Claim, run and checkpoint shards until none is pending; returns shards run."""
+        worker = worker or worker_id()
+        done = 0
+        while (index := self.claim(worker)) is not None:
+            self.complete(index, self.job.run(index), worker)
+            done += 1
+        return done
+
+    def reduce(self) -> Any:
+        """Tree-merge every checkpoint in shard order and finalize the job's output."""
+        missing = sorted(set(range(self.n_shards)) - set(self.completed()))
+        if missing:
+            raise RuntimeError(f"{len(missing)} of {self.n_shards} shards are not done, e.g. shard {missing[0]}")
+        results = []
+        for index in range(self.n_shards):
+            with open(self._checkpoint(index), "rb") as f:
+                results.append(pickle.load(f))
+        return self.job.finalize(tree_merge(results, self.job.merge))
+
+def queue_seed(directory: Union[str, Path], seed: Optional[int] = None) -> Optional[int]:
+    """Seed for a PSA job run through the queue in `directory`.
+
+    An unseeded analysis draws fresh entropy, so it would never match the
+    job already queued there; it takes the stored job's seed instead, which
+    lets a restarted run resume and another host join.
+    """
+    if seed is None and (Path(directory) / JOB).exists():
+        job = WorkQueue(directory).job
+        if isinstance(job, PSASummaryJob):
+            return job.analysis.seed
+    return seed
+
+def _work(directory: str) -> int:
+    """Work on a queue from a pool process."""
+    return WorkQueue(directory).work()
+
+def run_queue(
+    directory: Union[str, Path],
+    job: QueueJob,
+    workers: int = 1,
+    stale_after: Optional[float] = None,
+    poll_interval: float = 1.0
+) -> Any:
+    """Run a job through a work queue, resuming from any earlier checkpoints.
+
+    Other hosts can join with WorkQueue(directory).work() at any time.
+
+    Args:
+        directory: Queue directory on a shared filesystem
+        job: Job to run; when the directory already holds a queue, the job
+            must have the stored job's fingerprint and its checkpoints are
+            resumed
+        workers: Local worker processes
+        stale_after: Seconds after which another worker's claim is treated
+            as abandoned; None treats every claim found at startup as
+            orphaned, which is right when this is the only host, and never
+            takes over claims while waiting for other hosts
+        poll_interval: Seconds between checks while other hosts finish
+
+    Returns:
+        The job's finalized output
+    """
+    queue = WorkQueue.create(directory, job)
+    queue.recover(stale_after)
+    while True:
+        if workers <= 1:
+            queue.work()
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(_work, [str(queue.directory)] * workers))
+        if queue.is_complete():
+            return queue.reduce()
+        time.sleep(poll_interval)
+        if stale_after is not None:
+            queue.recover(stale_after)
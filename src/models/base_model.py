@@ -1,11 +1,18 @@
 """Base model for all impact calculations."""
 
-from typing import Dict, Any, Optional
-from pydantic import BaseModel, Field
+import copy
+from typing import ClassVar, Dict, Any, Iterator, Mapping, Optional
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
 from abc import ABC, abstractmethod
 
+from src.models.discounting import DiscountRegime, DiscountRegimeStack, annuity_factor
+from src.models.distributions import Distribution, Gamma, Normal, Triangular
+
 class BaseParameters(BaseModel):
     """Base parameters shared across all models."""
+    model_config = ConfigDict(arbitrary_types_allowed=True, frozen=True)
+    
     population_size: int = Field(default=331900000, description="Total US population")
     medicare_population: int = Field(default=73000000, description="Population over 60")
     adult_population: int = Field(default=258300000, description="Adult population (18+)")
@@ -13,6 +20,57 @@ class BaseParameters(BaseModel):
     gdp_per_capita: float = Field(default=65000, description="US GDP per capita")
     discount_rate: float = Field(default=0.03, description="Annual discount rate for future values")
     time_horizon_years: int = Field(default=10, description="Time horizon for calculations in years")
+    discounting: Optional[DiscountRegime] = Field(default=None, description="Cost and effect discount curves; overrides discount_rate when set")
+    
+    # Parameter uncertainty for probabilistic sensitivity analysis
+    distributions: ClassVar[Dict[str, Distribution]] = {
+        "medicare_per_capita": Gamma.from_moments(mean=12500, sd=1250),
+        "gdp_per_capita": Normal(mu=65000, sigma=3250),
+        "discount_rate": Triangular(low=0.015, mode=0.03, high=0.05),
+    }
+
+class ParameterSnapshot(Mapping[str, Any]):
+    """Immutable parameter values at which to evaluate a model.
+    
+    Arrays are copied and made read-only, so a snapshot can be shared across
+    threads and sessions without locks.
+    """
+    __slots__ = ("_values",)
+    
+    def __init__(self, values: Mapping[str, Any]):
+        frozen = {}
+        for name, value in values.items():
+            if isinstance(value, np.ndarray):
+                value = value.copy()
+                value.flags.writeable = False
+            frozen[name] = value
+        object.__setattr__(self, "_values", frozen)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("ParameterSnapshot is immutable")
+    
+    def __getitem__(self, name: str) -> Any:
+        return self._values[name]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+    
+    def __len__(self) -> int:
+        return len(self._values)
+    
+    def __repr__(self) -> str:
+        return f"ParameterSnapshot({self._values!r})"
+    
+    def replace(self, **overrides: Any) -> 'ParameterSnapshot':
+        """Return a new snapshot with some values replaced."""
+        return ParameterSnapshot({**self._values, **overrides})
+
+def _updated(params: BaseModel, updates: Dict[str, Any]) -> BaseModel:
+    """Copy of a parameter object with values replaced, validating the scalar ones."""
+    scalars = {k: v for k, v in updates.items() if np.isscalar(v)}
+    if scalars:
+        params = type(params).model_validate({**params.model_dump(), **scalars})
+    return params.model_copy(update={k: v for k, v in updates.items() if k not in scalars})
 
 class BaseImpactModel(ABC):
     """Abstract base class for all impact models."""
@@ -25,12 +83,88 @@ class BaseImpactModel(ABC):
         """Calculate health and economic impacts."""
         pass
     
-    def calculate_npv(self, annual_value: float, years: int) -> float:
-        """Calculate net present value of future cash flows."""
-        npv = 0
-        for year in range(years):
-            npv += annual_value / ((1 + self.params.discount_rate) ** year)
-        return npv
+    def parameter_values(self) -> Dict[str, Any]:
+        """Get base and therapy parameter values by name."""
+        values = self.params.model_dump()
+        therapy_params = getattr(self, 'therapy_params', None)
+        if therapy_params is not None:
+            values.update(therapy_params.model_dump())
+        return values
+    
+    def with_parameters(self, **overrides: Any) -> 'BaseImpactModel':
+        """Return a shallow copy of this model with parameter values replaced.
+        
+        Names are looked up in the therapy parameters first, then the base
+        parameters. Scalar values are validated like constructor arguments;
+        NumPy arrays and dual numbers are passed through unvalidated so whole
+        batches can flow through the impact calculations. This model is left
+        unchanged.
+        """
+        view = copy.copy(self)
+        remaining = dict(overrides)
+        therapy_params = getattr(self, 'therapy_params', None)
+        if therapy_params is not None:
+            updates = {k: remaining.pop(k) for k in list(remaining) if k in type(therapy_params).model_fields}
+            if updates:
+                view.therapy_params = _updated(therapy_params, updates)
+        updates = {k: remaining.pop(k) for k in list(remaining) if k in type(self.params).model_fields}
+        if updates:
+            view.params = _updated(self.params, updates)
+        if remaining:
+            raise ValueError(f"Unknown parameters for {type(self).__name__}: {', '.join(remaining)}")
+        return view
+    
+    def snapshot(self, **overrides: Any) -> ParameterSnapshot:
+        """Freeze the current base and therapy parameter values, with optional overrides."""
+        unknown = set(overrides) - set(self.parameter_values())
+        if unknown:
+            raise ValueError(f"Unknown parameters for {type(self).__name__}: {', '.join(sorted(unknown))}")
+        return ParameterSnapshot({**self.parameter_values(), **overrides})
+    
+    def evaluate(self, parameters: Mapping[str, Any]) -> Dict[str, Any]:
+        """Calculate impacts at a parameter snapshot (or any overrides) without touching this model.
+        
+        Parameter objects are frozen and every evaluation works on its own
+        shallow copy, so one model can serve concurrent evaluations.
+        """
+        return self.with_parameters(**parameters).calculate_impacts()
+    
+    def calculate_npv(self, annual_value: float, years: int, kind: str = "cost") -> float:
+        """Calculate net present value of a constant annual cash flow.
+        
+        Accepts scalar or array annual values (and discount rates), so a
+        whole batch of scenarios is discounted in one call. `kind` selects
+        the cost or effect curve when a discount regime is configured.
+        """
+        discounting = self.params.discounting
+        if discounting is None:
+            return annual_value * annuity_factor(self.params.discount_rate, years)
+        factor = discounting.annuity(years, kind)
+        if np.ndim(factor):
+            # Stacked regimes lead the output shape
+            factor = np.reshape(factor, np.shape(factor) + (1,) * np.ndim(annual_value))
+        return annual_value * factor
+    
+    def calculate_impacts_by_regime(self, regimes: Mapping[str, DiscountRegime]) -> Dict[str, Dict[str, Any]]:
+        """Calculate impacts under several discount regimes in a single pass.
+        
+        Annual values are computed once and discounted with every regime;
+        this model is left unchanged.
+        """
+        names = list(regimes)
+        view = copy.copy(self)
+        view.params = self.params.model_copy(
+            update={"discounting": DiscountRegimeStack([regimes[name] for name in names])}
+        )
+        impacts = view.calculate_impacts()
+        
+        results = {}
+        for i, name in enumerate(names):
+            results[name] = {
+                key: value[i] if isinstance(value, np.ndarray) else value
+                for key, value in impacts.items()
+            }
+        return results
     
     def calculate_medicare_savings(self, reduction_percentage: float) -> float:
         """Calculate Medicare savings based on a reduction percentage."""
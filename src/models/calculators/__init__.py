@@ -1,7 +1,10 @@
 """Impact calculators for different intervention pathways."""
 
 from abc import ABC, abstractmethod
-from typing import TextIO, Dict
+from functools import lru_cache
+from typing import Any, TextIO, Dict, Mapping, Optional, Tuple, Union
+
+import numpy as np
 
 from src.models.parameters import (
     BasePopulationParams,
@@ -9,9 +12,16 @@ from src.models.parameters import (
     HealthcareParams,
     ImpactModifiers
 )
+from .formulas import Formula, FormulaProgram, compile_formulas
 
 class BaseCalculator(ABC):
-    """Base class for impact calculators."""
+    """Base class for impact calculators.
+    
+    Subclasses declare their pathway outputs once in `formulas`; the same
+    declarations drive calculate(), calculate_batch() and report equations.
+    """
+    
+    formulas: Tuple[Formula, ...] = ()
     
     def __init__(
         self,
@@ -25,10 +35,59 @@ class BaseCalculator(ABC):
         self.healthcare = healthcare
         self.modifiers = modifiers
     
-    @abstractmethod
+    @classmethod
+    def program(cls) -> FormulaProgram:
+        """Get the compiled formula program for this calculator class."""
+        if '_program' not in cls.__dict__:
+            cls._program = compile_formulas(cls.formulas)
+        return cls._program
+    
+    def environment(self, params: Mapping[str, Any]) -> Dict[str, Any]:
+        """Formula inputs: context parameter fields, overridden by `params`."""
+        env = {}
+        for group in (self.pop, self.econ, self.healthcare, self.modifiers):
+            for name in type(group).model_fields:
+                env[name] = getattr(group, name)
+        env.update(params)
+        return env
+    
     def calculate(self, params: Dict) -> Dict:
         """Calculate impacts from intervention parameters."""
-        pass
+        return self.program()(self.environment(params))
+    
+    def calculate_batch(self, columns: Mapping[str, Union[float, np.ndarray]]) -> Dict[str, np.ndarray]:
+        """Calculate impacts for many parameter combinations at once.
+        
+        Args:
+            columns: Parameter columns keyed by name. Intervention parameters
+                (as passed to calculate()) and fields of the population,
+                economic, healthcare and modifier parameters may be given.
+                Columns broadcast against each other.
+        
+        Returns:
+            Result arrays keyed like calculate(), all with the batch shape.
+            Values are identical to calling calculate() per scenario.
+        """
+        columns = {name: np.asarray(values, dtype=float) for name, values in columns.items()}
+        shape = np.broadcast_shapes(*(values.shape for values in columns.values()))
+        return _broadcast_results(self.calculate(columns), shape)
+    
+    def formula(self, name: str) -> Formula:
+        """Get the declared formula for an output."""
+        for formula in self.formulas:
+            if formula.name == name:
+                return formula
+        raise KeyError(f"{type(self).__name__} has no formula '{name}'")
+    
+    def render_equation(self, name: str, params: Optional[Mapping[str, Any]] = None) -> str:
+        """Render an output's equation, plus the values used when `params` is given."""
+        formula = self.formula(name)
+        equation = formula.equation()
+        if params is not None:
+            values = self.environment(params)
+            values.update(self.calculate(params))
+            equation += f"\n{formula.label} = {formula.expr.render(values)}"
+        return equation
 
     @abstractmethod
     def write_calculations(self, f: TextIO, params: Dict, results: Dict) -> None:
@@ -41,6 +100,54 @@ class BaseCalculator(ABC):
         """
         pass
 
+def _broadcast_results(results: Mapping[str, Any], shape: Tuple[int, ...]) -> Dict[str, np.ndarray]:
+    """Broadcast every result to the batch shape."""
+    return {
+        key: value if np.shape(value) == shape else np.array(np.broadcast_to(value, shape))
+        for key, value in results.items()
+    }
+
+def evaluate_pathways(
+    calculators: Mapping[str, BaseCalculator],
+    columns: Mapping[str, Union[float, np.ndarray]]
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """Evaluate several calculators over a batch in one fused program.
+    
+    Subexpressions shared between pathways (such as the quality-adjusted
+    target population) are computed once for the whole batch. Calculators
+    must share the same context parameters.
+    
+    Returns:
+        Results per calculator name, as calculate_batch() would return them.
+    """
+    env: Dict[str, Any] = {}
+    for name, calculator in calculators.items():
+        for key, value in calculator.environment({}).items():
+            if key in env and env[key] != value:
+                raise ValueError(f"Calculator '{name}' has a different value for '{key}'")
+            env[key] = value
+    columns = {name: np.asarray(values, dtype=float) for name, values in columns.items()}
+    env.update(columns)
+    shape = np.broadcast_shapes(*(values.shape for values in columns.values()))
+    
+    program = _fused_program(tuple((name, type(calculator)) for name, calculator in calculators.items()))
+    flat = program(env)
+    return {
+        name: _broadcast_results(
+            {formula.name: flat[f"{name}.{formula.name}"] for formula in calculator.formulas}, shape
+        )
+        for name, calculator in calculators.items()
+    }
+
+@lru_cache(maxsize=32)
+def _fused_program(members: Tuple[Tuple[str, type], ...]) -> FormulaProgram:
+    """Compile the formulas of several calculator classes into one program."""
+    outputs = {}
+    for name, calculator_class in members:
+        for formula in calculator_class.formulas:
+            outputs[f"{name}.{formula.name}"] = formula
+    return FormulaProgram(outputs)
+
 from .physical import PhysicalCalculator
 from .cognitive import CognitiveCalculator
 from .kidney import KidneyCalculator
@@ -49,6 +156,7 @@ from .healthcare import HealthcareCalculator
 
 __all__ = [
     'BaseCalculator',
+    'evaluate_pathways',
     'PhysicalCalculator',
     'CognitiveCalculator',
     'KidneyCalculator',
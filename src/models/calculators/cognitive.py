@@ -2,45 +2,38 @@
 
 from typing import Dict, TextIO
 
-from src.utils.reporting.formatters import format_currency, format_equation, format_number
+from src.utils.reporting.formatters import format_currency, format_number
+from src.utils.reporting.writers import write_formula
 from . import BaseCalculator
+from .formulas import (
+    ALZHEIMERS_TO_MEDICARE,
+    ANNUAL_ALZHEIMERS_COST,
+    ANNUAL_PRODUCTIVITY,
+    IQ_TO_GDP,
+    MEDICARE_BENEFICIARIES,
+    QUALITY_ADJUSTED_POPULATION,
+    TARGET_POPULATION,
+    Formula,
+    Symbol,
+)
+
+IQ_INCREASE = Symbol('iq_increase', 'IQ_Increase', default=0)
+ALZHEIMERS_REDUCTION = Symbol('alzheimers_reduction', "Alzheimer's_Reduction_%", default=0) / 100
 
 class CognitiveCalculator(BaseCalculator):
     """Calculator for cognitive intervention impacts."""
 
-    def calculate(self, params: Dict) -> Dict:
-        """Calculate impacts from cognitive changes."""
-        iq_increase = params.get('iq_increase', 0)
-        alzheimers_reduction = params.get('alzheimers_reduction', 0) / 100
-        
-        # Calculate GDP impact from IQ improvement
-        gdp_impact = (
-            self.pop.target_population * 
-            iq_increase * 
-            self.modifiers.iq_to_gdp * 
-            self.econ.annual_productivity
-        )
-        
-        # Calculate Medicare savings from reduced Alzheimer's
-        alzheimers_savings = (
-            self.pop.medicare_beneficiaries * 
-            alzheimers_reduction * 
-            self.modifiers.alzheimers_to_medicare * 
-            self.healthcare.annual_alzheimers_cost
-        )
-        
-        # Calculate QALYs from cognitive improvements
-        qalys = (
-            self.pop.target_population * 
-            (iq_increase * 0.01 + alzheimers_reduction * 0.05) * 
-            self.modifiers.health_quality
-        )
-        
-        return {
-            'gdp_impact': gdp_impact,
-            'alzheimers_savings': alzheimers_savings,
-            'qalys_gained': qalys
-        }
+    formulas = (
+        # GDP impact from IQ improvement
+        Formula('gdp_impact', "GDP Impact",
+                TARGET_POPULATION * IQ_INCREASE * IQ_TO_GDP * ANNUAL_PRODUCTIVITY),
+        # Medicare savings from reduced Alzheimer's
+        Formula('alzheimers_savings', "Alzheimer's Savings",
+                MEDICARE_BENEFICIARIES * ALZHEIMERS_REDUCTION * ALZHEIMERS_TO_MEDICARE * ANNUAL_ALZHEIMERS_COST),
+        # QALYs from cognitive improvements
+        Formula('qalys_gained', "QALYs",
+                QUALITY_ADJUSTED_POPULATION * (IQ_INCREASE * 0.01 + ALZHEIMERS_REDUCTION * 0.05)),
+    )
     
     def write_calculations(self, f: TextIO, params: Dict, results: Dict) -> None:
         """Write cognitive impact calculations to report."""
@@ -48,18 +41,15 @@ class CognitiveCalculator(BaseCalculator):
         
         # GDP impact from IQ increase
         f.write("Economic gains from improved cognitive function:\n\n")
-        equation = "GDP Impact = Population × IQ_Increase × IQ_to_GDP × Annual_Productivity"
-        f.write(format_equation(equation))
+        write_formula(f, self, 'gdp_impact', params)
         f.write(f"\nAnnual GDP impact: {format_currency(results['gdp_impact'])}\n\n")
         
         # Medicare savings from Alzheimer's reduction
         f.write("Medicare savings from reduced Alzheimer's progression:\n\n")
-        equation = "Alzheimer's Savings = Beneficiaries × Reduction × Cost × Medicare_Impact"
-        f.write(format_equation(equation))
+        write_formula(f, self, 'alzheimers_savings', params)
         f.write(f"\nAnnual Medicare savings: {format_currency(results['alzheimers_savings'])}\n\n")
         
         # QALY impact
         f.write("Quality-adjusted life years gained from cognitive improvements:\n\n")
-        equation = "QALYs = Population × (IQ_Effect + Alzheimer's_Effect) × Health_Quality"
-        f.write(format_equation(equation))
-        f.write(f"\nTotal QALYs gained: {format_number(results['qalys_gained'])}\n\n") 
\ No newline at end of file
+        write_formula(f, self, 'qalys_gained', params)
+        f.write(f"\nTotal QALYs gained: {format_number(results['qalys_gained'])}\n\n") 
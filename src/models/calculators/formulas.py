@@ -0,0 +1,269 @@
+"""Declarative formula graph for the impact calculators.
+
+Each pathway formula is declared once as an expression over named symbols.
+The same declaration is evaluated (for scalars, NumPy columns or any other
+numeric type) and rendered as equation text for reports, so the arithmetic
+and the documented equation cannot drift apart.
+
+Formulas are compiled into a flat program in which structurally identical
+subexpressions (e.g. target_population × health_quality) are computed once,
+even when they come from different calculators.
+"""
+
+from abc import ABC, abstractmethod
+import operator
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+_OPERATORS: Dict[str, Tuple[Callable[[Any, Any], Any], str, int]] = {
+    '+': (operator.add, '+', 1),
+    '-': (operator.sub, '-', 1),
+    '*': (operator.mul, '×', 2),
+    '/': (operator.truediv, '/', 2),
+}
+
+def _format_value(value: Any) -> str:
+    """Format a number for substituted equations."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return "…"  # Arrays and other non-scalars are not substituted
+    if abs(value) >= 1000:
+        return f"{value:,.0f}"
+    return f"{value:g}"
+
+class Expr(ABC):
+    """Node in a formula graph."""
+
+    precedence = 3
+
+    @property
+    @abstractmethod
+    def key(self) -> Tuple:
+        """Structural key used to merge identical subexpressions."""
+        pass
+
+    @property
+    def children(self) -> Tuple['Expr', ...]:
+        """Child nodes evaluated before this node."""
+        return ()
+
+    @abstractmethod
+    def apply(self, args: List[Any], env: Mapping[str, Any]) -> Any:
+        """Compute this node from evaluated children and the environment."""
+        pass
+
+    @abstractmethod
+    def render(self, values: Optional[Mapping[str, Any]] = None) -> str:
+        """Render as equation text, substituting `values` for symbols if given."""
+        pass
+
+    def symbols(self) -> Dict[str, 'Symbol']:
+        """All symbols referenced by this expression."""
+        found = {}
+        for child in self.children:
+            found.update(child.symbols())
+        return found
+
+    def _binary(self, op: str, other: Any, reflected: bool = False) -> 'BinOp':
+        other = other if isinstance(other, Expr) else Const(other)
+        return BinOp(op, other, self) if reflected else BinOp(op, self, other)
+
+    def __add__(self, other): return self._binary('+', other)
+    def __radd__(self, other): return self._binary('+', other, reflected=True)
+    def __sub__(self, other): return self._binary('-', other)
+    def __rsub__(self, other): return self._binary('-', other, reflected=True)
+    def __mul__(self, other): return self._binary('*', other)
+    def __rmul__(self, other): return self._binary('*', other, reflected=True)
+    def __truediv__(self, other): return self._binary('/', other)
+    def __rtruediv__(self, other): return self._binary('/', other, reflected=True)
+    def __abs__(self): return Abs(self)
+
+class Symbol(Expr):
+    """Named input resolved from the evaluation environment."""
+
+    def __init__(self, name: str, label: Optional[str] = None, default: Optional[float] = None):
+        self.name = name
+        self.label = label or name.title()
+        self.default = default
+
+    @property
+    def key(self) -> Tuple:
+        return ('symbol', self.name)
+
+    def apply(self, args: List[Any], env: Mapping[str, Any]) -> Any:
+        if self.name in env:
+            return env[self.name]
+        if self.default is None:
+            raise KeyError(f"Missing value for formula input '{self.name}'")
+        return self.default
+
+    def render(self, values: Optional[Mapping[str, Any]] = None) -> str:
+        if values is not None:
+            return _format_value(values.get(self.name, self.default))
+        return self.label
+
+    def symbols(self) -> Dict[str, 'Symbol']:
+        return {self.name: self}
+
+class Const(Expr):
+    """Literal constant."""
+
+    def __init__(self, value: float):
+        self.value = value
+
+    @property
+    def key(self) -> Tuple:
+        return ('const', self.value)
+
+    def apply(self, args: List[Any], env: Mapping[str, Any]) -> Any:
+        return self.value
+
+    def render(self, values: Optional[Mapping[str, Any]] = None) -> str:
+        return _format_value(self.value)
+
+class BinOp(Expr):
+    """Binary arithmetic operation."""
+
+    def __init__(self, op: str, left: Expr, right: Expr):
+        self.op = op
+        self.left = left
+        self.right = right
+        self.precedence = _OPERATORS[op][2]
+
+    @property
+    def key(self) -> Tuple:
+        return (self.op, self.left.key, self.right.key)
+
+    @property
+    def children(self) -> Tuple[Expr, ...]:
+        return (self.left, self.right)
+
+    def apply(self, args: List[Any], env: Mapping[str, Any]) -> Any:
+        return _OPERATORS[self.op][0](args[0], args[1])
+
+    def render(self, values: Optional[Mapping[str, Any]] = None) -> str:
+        left = self.left.render(values)
+        right = self.right.render(values)
+        if self.left.precedence < self.precedence:
+            left = f"({left})"
+        # Left-associative: a right operand of equal precedence needs parentheses for - and /
+        if self.right.precedence < self.precedence or (
+            self.right.precedence == self.precedence and self.op in '-/'
+        ):
+            right = f"({right})"
+        return f"{left} {_OPERATORS[self.op][1]} {right}"
+
+class Abs(Expr):
+    """Absolute value."""
+
+    def __init__(self, operand: Expr):
+        self.operand = operand
+
+    @property
+    def key(self) -> Tuple:
+        return ('abs', self.operand.key)
+
+    @property
+    def children(self) -> Tuple[Expr, ...]:
+        return (self.operand,)
+
+    def apply(self, args: List[Any], env: Mapping[str, Any]) -> Any:
+        return abs(args[0])
+
+    def render(self, values: Optional[Mapping[str, Any]] = None) -> str:
+        return f"|{self.operand.render(values)}|"
+
+class Formula(Expr):
+    """Named pathway output.
+
+    Evaluates like its expression; when referenced inside another formula it
+    renders as its label instead of being expanded.
+    """
+
+    def __init__(self, name: str, label: str, expr: Expr):
+        self.name = name
+        self.label = label
+        self.expr = expr if isinstance(expr, Expr) else Const(expr)
+
+    @property
+    def key(self) -> Tuple:
+        return self.expr.key
+
+    @property
+    def children(self) -> Tuple[Expr, ...]:
+        return (self.expr,)
+
+    def apply(self, args: List[Any], env: Mapping[str, Any]) -> Any:
+        return args[0]
+
+    def render(self, values: Optional[Mapping[str, Any]] = None) -> str:
+        if values is not None and self.name in values:
+            return _format_value(values[self.name])
+        return self.label.replace(' ', '_')
+
+    def equation(self, values: Optional[Mapping[str, Any]] = None) -> str:
+        """Render as `Label = expression`."""
+        return f"{self.label} = {self.expr.render(values)}"
+
+class FormulaProgram:
+    """Formulas compiled into a flat evaluation program.
+
+    Nodes with the same structural key are evaluated once, so intermediates
+    shared by several outputs (or several calculators) are reused.
+    """
+
+    def __init__(self, outputs: Mapping[str, Expr]):
+        self._steps: List[Tuple[Expr, Tuple[int, ...]]] = []
+        self._slots: Dict[Tuple, int] = {}
+        self.outputs = {name: self._compile(expr) for name, expr in outputs.items()}
+        self.symbols: Dict[str, Symbol] = {}
+        for expr in outputs.values():
+            self.symbols.update(expr.symbols())
+
+    def _compile(self, expr: Expr) -> int:
+        """Append the steps for `expr` and return its slot."""
+        if isinstance(expr, Formula):
+            return self._compile(expr.expr)
+        key = expr.key
+        if key not in self._slots:
+            args = tuple(self._compile(child) for child in expr.children)
+            self._slots[key] = len(self._steps)
+            self._steps.append((expr, args))
+        return self._slots[key]
+
+    @property
+    def size(self) -> int:
+        """Number of distinct nodes evaluated per call."""
+        return len(self._steps)
+
+    def __call__(self, env: Mapping[str, Any]) -> Dict[str, Any]:
+        """Evaluate every output against `env`."""
+        values: List[Any] = []
+        for node, args in self._steps:
+            values.append(node.apply([values[i] for i in args], env))
+        return {name: values[slot] for name, slot in self.outputs.items()}
+
+def compile_formulas(formulas: Iterable[Formula], prefix: str = '') -> FormulaProgram:
+    """Compile formulas into a program keyed by (optionally prefixed) name."""
+    return FormulaProgram({f"{prefix}{formula.name}": formula for formula in formulas})
+
+# Symbols for calculator context fields (population, economic, healthcare, modifiers)
+TARGET_POPULATION = Symbol('target_population', 'Target_Population')
+TOTAL_POPULATION = Symbol('total_population', 'Total_Population')
+MEDICARE_BENEFICIARIES = Symbol('medicare_beneficiaries', 'Beneficiaries')
+WORKFORCE_FRACTION = Symbol('workforce_fraction', 'Workforce_Fraction')
+ANNUAL_PRODUCTIVITY = Symbol('annual_productivity', 'Annual_Productivity')
+ANNUAL_HOSPITAL_VISITS = Symbol('annual_hospital_visits', 'Annual_Hospital_Visits')
+ANNUAL_ALZHEIMERS_COST = Symbol('annual_alzheimers_cost', "Annual_Alzheimer's_Cost")
+ANNUAL_CKD_COST = Symbol('annual_ckd_cost', 'Annual_CKD_Cost')
+COST_PER_HOSPITAL_VISIT = Symbol('cost_per_hospital_visit', 'Cost_per_Visit')
+SAVINGS_PER_LB_MUSCLE = Symbol('savings_per_lb_muscle', 'Savings_per_lb_Muscle')
+SAVINGS_PER_LB_FAT = Symbol('savings_per_lb_fat', 'Savings_per_lb_Fat')
+IQ_TO_GDP = Symbol('iq_to_gdp', 'IQ_to_GDP')
+KIDNEY_TO_MEDICARE = Symbol('kidney_to_medicare', 'Kidney_to_Medicare')
+ALZHEIMERS_TO_MEDICARE = Symbol('alzheimers_to_medicare', "Alzheimer's_to_Medicare")
+HEALTH_QUALITY = Symbol('health_quality', 'Health_Quality')
+LIFESPAN_TO_GDP = Symbol('lifespan_to_gdp', 'Lifespan_to_GDP')
+
+# Shared by every QALY pathway that scales with health quality
+QUALITY_ADJUSTED_POPULATION = TARGET_POPULATION * HEALTH_QUALITY
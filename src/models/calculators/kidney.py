@@ -2,36 +2,32 @@
 
 from typing import Dict, TextIO
 
-from src.utils.reporting.formatters import format_currency, format_equation, format_number
+from src.utils.reporting.formatters import format_currency, format_number
+from src.utils.reporting.writers import write_formula
 from . import BaseCalculator
+from .formulas import (
+    ANNUAL_CKD_COST,
+    KIDNEY_TO_MEDICARE,
+    MEDICARE_BENEFICIARIES,
+    QUALITY_ADJUSTED_POPULATION,
+    Formula,
+    Symbol,
+)
+
+EGFR_IMPROVEMENT = Symbol('egfr_improvement', 'eGFR_Improvement', default=0)
+CKD_REDUCTION = Symbol('ckd_progression_reduction', 'CKD_Reduction_%', default=0) / 100
 
 class KidneyCalculator(BaseCalculator):
     """Calculator for kidney intervention impacts."""
 
-    def calculate(self, params: Dict) -> Dict:
-        """Calculate impacts from kidney function changes."""
-        egfr_improvement = params.get('egfr_improvement', 0)
-        ckd_reduction = params.get('ckd_progression_reduction', 0) / 100
-        
-        # Calculate Medicare savings from improved kidney function
-        medicare_savings = (
-            self.pop.medicare_beneficiaries * 
-            ckd_reduction * 
-            self.modifiers.kidney_to_medicare * 
-            self.healthcare.annual_ckd_cost
-        )
-        
-        # Calculate QALYs from kidney improvements
-        qalys = (
-            self.pop.target_population * 
-            (egfr_improvement * 0.02 + ckd_reduction * 0.1) * 
-            self.modifiers.health_quality
-        )
-        
-        return {
-            'medicare_savings': medicare_savings,
-            'qalys_gained': qalys
-        }
+    formulas = (
+        # Medicare savings from improved kidney function
+        Formula('medicare_savings', "Medicare Savings",
+                MEDICARE_BENEFICIARIES * CKD_REDUCTION * KIDNEY_TO_MEDICARE * ANNUAL_CKD_COST),
+        # QALYs from kidney improvements
+        Formula('qalys_gained', "QALYs",
+                QUALITY_ADJUSTED_POPULATION * (EGFR_IMPROVEMENT * 0.02 + CKD_REDUCTION * 0.1)),
+    )
     
     def write_calculations(self, f: TextIO, params: Dict, results: Dict) -> None:
         """Write kidney impact calculations to report."""
@@ -39,12 +35,10 @@ class KidneyCalculator(BaseCalculator):
         
         # Medicare savings
         f.write("Medicare savings from reduced CKD progression:\n\n")
-        equation = "Medicare Savings = Beneficiaries × CKD_Reduction × Cost × Medicare_Impact"
-        f.write(format_equation(equation))
+        write_formula(f, self, 'medicare_savings', params)
         f.write(f"\nAnnual Medicare savings: {format_currency(results['medicare_savings'])}\n\n")
         
         # QALY impact
         f.write("Quality-adjusted life years gained from kidney improvements:\n\n")
-        equation = "QALYs = Population × (eGFR_Effect + CKD_Effect) × Health_Quality"
-        f.write(format_equation(equation))
-        f.write(f"\nTotal QALYs gained: {format_number(results['qalys_gained'])}\n\n") 
\ No newline at end of file
+        write_formula(f, self, 'qalys_gained', params)
+        f.write(f"\nTotal QALYs gained: {format_number(results['qalys_gained'])}\n\n") 
@@ -2,35 +2,38 @@
 
 from typing import Dict, TextIO
 
-from src.utils.reporting.formatters import format_currency, format_equation, format_number
+from src.utils.reporting.formatters import format_currency, format_number
+from src.utils.reporting.writers import write_formula
 from . import BaseCalculator
+from .formulas import (
+    ANNUAL_PRODUCTIVITY,
+    HEALTH_QUALITY,
+    LIFESPAN_TO_GDP,
+    TARGET_POPULATION,
+    WORKFORCE_FRACTION,
+    Formula,
+    Symbol,
+)
+
+LIFESPAN_INCREASE = Symbol('lifespan_increase_years', 'Lifespan_Increase', default=0)
+HEALTH_IMPROVEMENT = Symbol('healthspan_improvement_percent', 'Healthspan_Improvement_%', default=0) / 100
+
+# GDP impact from extended productive years
+WORKING_YEARS = Formula('working_years', "Working Years", LIFESPAN_INCREASE * WORKFORCE_FRACTION)
+ANNUAL_GDP = Formula('annual_gdp_impact', "Annual GDP Impact",
+                     TARGET_POPULATION * WORKING_YEARS * ANNUAL_PRODUCTIVITY)
 
 class LongevityCalculator(BaseCalculator):
     """Calculator for longevity intervention impacts."""
 
-    def calculate(self, params: Dict) -> Dict:
-        """Calculate impacts from longevity changes."""
-        lifespan_increase = params.get('lifespan_increase_years', 0)
-        health_improvement = params.get('healthspan_improvement_percent', 0) / 100
-        
-        # Calculate GDP impact from extended productive years
-        working_years = lifespan_increase * self.pop.workforce_fraction
-        annual_gdp = self.pop.target_population * working_years * self.econ.annual_productivity
-        lifetime_gdp = annual_gdp * self.modifiers.lifespan_to_gdp
-        
-        # Calculate QALYs from extended life and improved health
-        qalys = (
-            self.pop.target_population * 
-            lifespan_increase * 
-            (1 + health_improvement * self.modifiers.health_quality)
-        )
-        
-        return {
-            'working_years': working_years,
-            'annual_gdp_impact': annual_gdp,
-            'lifetime_gdp_impact': lifetime_gdp,
-            'qalys_gained': qalys
-        }
+    formulas = (
+        WORKING_YEARS,
+        ANNUAL_GDP,
+        Formula('lifetime_gdp_impact', "Lifetime GDP Impact", ANNUAL_GDP * LIFESPAN_TO_GDP),
+        # QALYs from extended life and improved health
+        Formula('qalys_gained', "QALYs",
+                TARGET_POPULATION * LIFESPAN_INCREASE * (1 + HEALTH_IMPROVEMENT * HEALTH_QUALITY)),
+    )
     
     def write_calculations(self, f: TextIO, params: Dict, results: Dict) -> None:
         """Write longevity impact calculations to report."""
@@ -38,14 +41,13 @@ class LongevityCalculator(BaseCalculator):
         f.write("Economic gains from increased productive lifespan:\n\n")
         
         # GDP impact
-        equation = "GDP Impact = Population × Workforce_Fraction × Lifespan_Increase × Annual_Productivity"
-        f.write(format_equation(equation))
+        write_formula(f, self, 'annual_gdp_impact', params)
         f.write(f"\nAdditional productive years: {results['working_years']:.2f}\n")
         f.write(f"Annual GDP impact: {format_currency(results['annual_gdp_impact'])}\n")
-        f.write(f"Lifetime GDP impact: {format_currency(results['lifetime_gdp_impact'])}\n\n")
+        write_formula(f, self, 'lifetime_gdp_impact', params)
+        f.write(f"\nLifetime GDP impact: {format_currency(results['lifetime_gdp_impact'])}\n\n")
         
         # QALY impact
         f.write("Quality-adjusted life years gained:\n\n")
-        equation = "QALYs = Population × Lifespan_Increase × (1 + Health_Quality_Improvement)"
-        f.write(format_equation(equation))
-        f.write(f"\nTotal QALYs gained: {format_number(results['qalys_gained'])}\n\n") 
\ No newline at end of file
+        write_formula(f, self, 'qalys_gained', params)
+        f.write(f"\nTotal QALYs gained: {format_number(results['qalys_gained'])}\n\n") 
@@ -2,35 +2,34 @@
 
 from typing import Dict, TextIO
 
-from src.utils.reporting.formatters import format_currency, format_equation
+from src.utils.reporting.formatters import format_currency
+from src.utils.reporting.writers import write_formula
 from . import BaseCalculator
+from .formulas import (
+    SAVINGS_PER_LB_FAT,
+    SAVINGS_PER_LB_MUSCLE,
+    TARGET_POPULATION,
+    Formula,
+    Symbol,
+)
+
+MUSCLE_CHANGE = Symbol('muscle_mass_change_lb', 'Muscle_Change', default=0)
+FAT_CHANGE = Symbol('fat_mass_change_lb', 'Fat_Change', default=0)
+
+# Healthcare savings from body composition changes
+MUSCLE_SAVINGS = Formula('muscle_savings', "Muscle Savings",
+                         TARGET_POPULATION * MUSCLE_CHANGE * SAVINGS_PER_LB_MUSCLE)
+FAT_SAVINGS = Formula('fat_savings', "Fat Savings",
+                      TARGET_POPULATION * abs(FAT_CHANGE) * SAVINGS_PER_LB_FAT)
 
 class PhysicalCalculator(BaseCalculator):
     """Calculator for physical intervention impacts."""
 
-    def calculate(self, params: Dict) -> Dict:
-        """Calculate impacts from physical changes."""
-        muscle_change = params.get('muscle_mass_change_lb', 0)
-        fat_change = params.get('fat_mass_change_lb', 0)
-        
-        # Calculate healthcare savings from body composition changes
-        muscle_savings = (
-            self.pop.target_population * 
-            muscle_change * 
-            self.healthcare.savings_per_lb_muscle
-        )
-        
-        fat_savings = (
-            self.pop.target_population * 
-            abs(fat_change) * 
-            self.healthcare.savings_per_lb_fat
-        )
-        
-        return {
-            'muscle_savings': muscle_savings,
-            'fat_savings': fat_savings,
-            'total_savings': muscle_savings + fat_savings
-        }
+    formulas = (
+        MUSCLE_SAVINGS,
+        FAT_SAVINGS,
+        Formula('total_savings', "Total Savings", MUSCLE_SAVINGS + FAT_SAVINGS),
+    )
     
     def write_calculations(self, f: TextIO, params: Dict, results: Dict) -> None:
         """Write physical impact calculations to report."""
@@ -38,12 +37,10 @@ class PhysicalCalculator(BaseCalculator):
         f.write("Healthcare savings from body composition changes:\n\n")
         
         # Muscle mass impact
-        equation = "Muscle Savings = Population × Muscle_Change × $12/lb"
-        f.write(format_equation(equation))
+        write_formula(f, self, 'muscle_savings', params)
         f.write(f"\nMuscle-related savings: {format_currency(results['muscle_savings'])}\n\n")
         
         # Fat mass impact
-        equation = "Fat Savings = Population × Fat_Change × $8/lb"
-        f.write(format_equation(equation))
+        write_formula(f, self, 'fat_savings', params)
         f.write(f"\nFat-related savings: {format_currency(results['fat_savings'])}\n")
-        f.write(f"Total composition savings: {format_currency(results['total_savings'])}\n\n") 
\ No newline at end of file
+        f.write(f"Total composition savings: {format_currency(results['total_savings'])}\n\n") 
@@ -0,0 +1,205 @@
+"""Discounting utilities shared by all impact models.
+
+Discount-factor vectors are cached by (rate, horizon) and returned read-only so
+they can be shared between models and threads. Cash flows are assumed to occur
+at the start of each year, so year 0 is undiscounted.
+
+Discount curves (flat, piecewise, continuous, with optional half-cycle
+correction) and cost/effect regimes precompute their factor tables once.
+"""
+
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+ArrayLike = Union[float, np.ndarray]
+
+@lru_cache(maxsize=256)
+def _cached_discount_factors(rate: float, years: int) -> np.ndarray:
+    """Build and freeze the discount-factor vector for a flat rate."""
+    factors = (1 + rate) ** -np.arange(years, dtype=float)
+    factors.setflags(write=False)
+    return factors
+
+def discount_factors(rate: ArrayLike, years: int) -> np.ndarray:
+    """Return discount factors for years 0..years-1.
+
+    Scalar rates hit a cache and return a read-only vector of shape (years,).
+    Array rates return factors of shape rate.shape + (years,).
+    """
+    if np.ndim(rate) == 0:
+        return _cached_discount_factors(float(rate), int(years))
+    rate = np.asarray(rate, dtype=float)
+    return (1 + rate[..., np.newaxis]) ** -np.arange(years, dtype=float)
+
+def annuity_factor(rate: ArrayLike, years: ArrayLike) -> ArrayLike:
+    """Present value of 1 per year paid at the start of each of `years` years.
+
+    Uses the closed form (1 - v**n) / (1 - v) with v = 1 / (1 + rate), which
+    equals the sum of the discount factors. Works elementwise on arrays.
+    """
+    if isinstance(rate, np.ndarray) or isinstance(years, np.ndarray):
+        rate = np.asarray(rate, dtype=float)
+        v = 1 / (1 + rate)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            factor = (1 - v ** years) / (1 - v)
+        return np.where(rate == 0, years, factor)
+    if rate == 0:
+        return years
+    v = 1 / (1 + rate)
+    return (1 - v ** years) / (1 - v)
+
+def npv(cash_flows: np.ndarray, rate: ArrayLike) -> ArrayLike:
+    """Discount annual cash-flow streams to present value.
+
+    Args:
+        cash_flows: Array of shape (..., years); the last axis is time.
+        rate: Scalar rate, or an array broadcastable to cash_flows.shape[:-1]
+            giving one rate per stream.
+
+    Returns:
+        Present values with shape cash_flows.shape[:-1].
+    """
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    factors = discount_factors(rate, cash_flows.shape[-1])
+    if factors.ndim == 1:
+        return cash_flows @ factors
+    return np.sum(cash_flows * factors, axis=-1)
+
+class DiscountCurve:
+    """Flat annual discount curve with precomputed factor tables.
+    
+    Factor and cumulative-factor tables are built once up to `max_horizon`
+    (and grown on demand), so the NPV of a constant annual value over any
+    horizon is a table lookup and the NPV of a cash-flow stream is a dot
+    product. With half-cycle correction, each year's flow is discounted
+    from the middle of the year rather than its start.
+    """
+    
+    def __init__(self, rate: float = 0.03, half_cycle_correction: bool = False, max_horizon: int = 100):
+        self.rate = rate
+        self.half_cycle_correction = half_cycle_correction
+        self._build_tables(max_horizon)
+    
+    def log_factors(self, times: np.ndarray) -> np.ndarray:
+        """Log discount factor at each (possibly fractional) time in years."""
+        return -times * np.log1p(self.rate)
+    
+    def _build_tables(self, horizon: int) -> None:
+        """Precompute discount factors and their running sums."""
+        times = np.arange(horizon, dtype=float)
+        if self.half_cycle_correction:
+            times += 0.5
+        factors = np.exp(self.log_factors(times))
+        cumulative = np.concatenate(([0.0], np.cumsum(factors)))
+        factors.setflags(write=False)
+        cumulative.setflags(write=False)
+        self._factors = factors
+        self._cumulative = cumulative
+    
+    def _ensure_horizon(self, years: int) -> None:
+        """Grow the tables if a longer horizon is requested."""
+        if years > len(self._factors):
+            self._build_tables(max(int(years), 2 * len(self._factors)))
+    
+    def factors(self, years: int) -> np.ndarray:
+        """Return the read-only discount factors for years 0..years-1."""
+        self._ensure_horizon(years)
+        return self._factors[:years]
+    
+    def annuity(self, years: ArrayLike) -> ArrayLike:
+        """Present value of 1 per year over `years` years (table lookup)."""
+        self._ensure_horizon(int(np.max(years)))
+        return self._cumulative[years]
+    
+    def npv(self, cash_flows: np.ndarray) -> ArrayLike:
+        """Discount cash-flow streams of shape (..., years) to present value."""
+        cash_flows = np.asarray(cash_flows, dtype=float)
+        return cash_flows @ self.factors(cash_flows.shape[-1])
+    
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(rate={self.rate}, half_cycle_correction={self.half_cycle_correction})"
+
+class ContinuousDiscountCurve(DiscountCurve):
+    """Discount curve with continuous compounding, factor = exp(-rate * t)."""
+    
+    def log_factors(self, times: np.ndarray) -> np.ndarray:
+        """Log discount factor at each time in years."""
+        return -self.rate * times
+
+class PiecewiseDiscountCurve(DiscountCurve):
+    """Discount curve whose annual rate steps at given years.
+    
+    Example, a 3.5% rate for the first 30 years then 1.5%:
+        PiecewiseDiscountCurve([(0, 0.035), (30, 0.015)])
+    """
+    
+    def __init__(self, schedule: Sequence[Tuple[float, float]], half_cycle_correction: bool = False,
+                 max_horizon: int = 100):
+        schedule = sorted(schedule)
+        if not schedule or schedule[0][0] != 0:
+            raise ValueError("Discount schedule must start at year 0")
+        self.schedule = schedule
+        self._starts = np.array([start for start, _ in schedule], dtype=float)
+        self._log_rates = np.log1p([rate for _, rate in schedule])
+        self._ends = np.append(self._starts[1:], np.inf)
+        super().__init__(rate=schedule[0][1], half_cycle_correction=half_cycle_correction,
+                         max_horizon=max_horizon)
+    
+    def log_factors(self, times: np.ndarray) -> np.ndarray:
+        """Integrate the stepped log rate from 0 to each time."""
+        times = np.asarray(times, dtype=float)[..., np.newaxis]
+        exposure = np.clip(times - self._starts, 0, self._ends - self._starts)
+        return -exposure @ self._log_rates
+    
+    def __repr__(self) -> str:
+        return f"PiecewiseDiscountCurve({self.schedule}, half_cycle_correction={self.half_cycle_correction})"
+
+class DiscountRegime:
+    """Pair of discount curves for costs and health effects.
+    
+    When no effect curve is given, effects are discounted like costs.
+    """
+    
+    def __init__(self, costs: DiscountCurve, effects: Optional[DiscountCurve] = None):
+        self.costs = costs
+        self.effects = effects or costs
+    
+    @classmethod
+    def flat(cls, rate: float, half_cycle_correction: bool = False) -> 'DiscountRegime':
+        """Create a regime with one flat rate for costs and effects."""
+        return cls(DiscountCurve(rate, half_cycle_correction=half_cycle_correction))
+    
+    def curve(self, kind: str = "cost") -> DiscountCurve:
+        """Return the curve for "cost" or "effect" flows."""
+        if kind == "cost":
+            return self.costs
+        if kind == "effect":
+            return self.effects
+        raise ValueError(f"Unknown discounting kind: {kind}")
+    
+    def annuity(self, years: ArrayLike, kind: str = "cost") -> ArrayLike:
+        """Present value of 1 per year over `years` years."""
+        return self.curve(kind).annuity(years)
+    
+    def npv(self, cash_flows: np.ndarray, kind: str = "cost") -> ArrayLike:
+        """Discount cash-flow streams of shape (..., years)."""
+        return self.curve(kind).npv(cash_flows)
+    
+    def __repr__(self) -> str:
+        return f"DiscountRegime(costs={self.costs!r}, effects={self.effects!r})"
+
+class DiscountRegimeStack:
+    """Several regimes evaluated together along a leading axis.
+    
+    Annuity factors come back with shape (n_regimes,), letting a model run
+    once and report every regime from the same undiscounted annual values.
+    """
+    
+    def __init__(self, regimes: Sequence[DiscountRegime]):
+        self.regimes = list(regimes)
+    
+    def annuity(self, years: int, kind: str = "cost") -> np.ndarray:
+        """Annuity factor for each regime, shape (n_regimes,)."""
+        return np.array([regime.annuity(years, kind) for regime in self.regimes])
@@ -0,0 +1,319 @@
+"""Probability distributions for uncertain model parameters.
+
+Parameter classes attach these to their fields through a `distributions`
+class attribute, which probabilistic sensitivity analysis samples from.
+All sampling is vectorized: one call draws every value for a parameter.
+Inverse CDFs (`ppf`) map uniform quasi-random points onto each distribution,
+and log densities (`logpdf`) let stored draws be reweighted to new ones;
+CDFs (`cdf`) recover the copula scores of correlated draws when reweighting.
+Correlations between parameters are declared as a `correlations` class
+attribute of pairwise coefficients and sampled through a Gaussian copula.
+"""
+
+import math
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import linalg, special
+
+class Distribution(ABC):
+    """Base class for parameter distributions."""
+
+    @abstractmethod
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """Draw `size` independent values."""
+        pass
+
+    @abstractmethod
+    def ppf(self, q: np.ndarray) -> np.ndarray:
+        """Inverse cumulative distribution function, elementwise."""
+        pass
+
+    @abstractmethod
+    def logpdf(self, x: np.ndarray) -> np.ndarray:
+        """Log probability density, elementwise; -inf outside the support."""
+        pass
+
+    @abstractmethod
+    def cdf(self, x: np.ndarray) -> np.ndarray:
+        """Cumulative distribution function, elementwise."""
+        pass
+
+    @property
+    @abstractmethod
+    def mean(self) -> float:
+        """Expected value."""
+        pass
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize as {"type": class name, **parameters}."""
+        return {"type": type(self).__name__, **asdict(self)}
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> 'Distribution':
+        """Recreate a distribution serialized with to_dict()."""
+        data = dict(data)
+        kinds = {kind.__name__: kind for kind in Distribution.__subclasses__()}
+        kind = data.pop("type")
+        if kind not in kinds:
+            raise ValueError(f"Unknown distribution type '{kind}'")
+        return kinds[kind](**data)
+
+@dataclass(frozen=True)
+class Normal(Distribution):
+    """Normal distribution."""
+    mu: float
+    sigma: float
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        return rng.normal(self.mu, self.sigma, size)
+
+    def ppf(self, q: np.ndarray) -> np.ndarray:
+        return self.mu + self.sigma * special.ndtri(q)
+
+    def logpdf(self, x: np.ndarray) -> np.ndarray:
+        z = (np.asarray(x, dtype=float) - self.mu) / self.sigma
+        return -0.5 * z ** 2 - math.log(self.sigma * math.sqrt(2 * math.pi))
+
+    def cdf(self, x: np.ndarray) -> np.ndarray:
+        return special.ndtr((np.asarray(x, dtype=float) - self.mu) / self.sigma)
+
+    @property
+    def mean(self) -> float:
+        return self.mu
+
+@dataclass(frozen=True)
+class LogNormal(Distribution):
+    """Log-normal distribution; mu and sigma are on the log scale."""
+    mu: float
+    sigma: float
+
+    @classmethod
+    def from_moments(cls, mean: float, sd: float) -> 'LogNormal':
+        """Create from the mean and standard deviation on the natural scale."""
+        sigma2 = math.log(1 + (sd / mean) ** 2)
+        return cls(mu=math.log(mean) - sigma2 / 2, sigma=math.sqrt(sigma2))
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        return rng.lognormal(self.mu, self.sigma, size)
+
+    def ppf(self, q: np.ndarray) -> np.ndarray:
+        return np.exp(self.mu + self.sigma * special.ndtri(q))
+
+    def logpdf(self, x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_x = np.log(x)
+            density = -log_x - math.log(self.sigma * math.sqrt(2 * math.pi)) - (log_x - self.mu) ** 2 / (2 * self.sigma ** 2)
+        return np.where(x > 0, density, -np.inf)
+
+    def cdf(self, x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(x > 0, special.ndtr((np.log(x) - self.mu) / self.sigma), 0.0)
+
+    @property
+    def mean(self) -> float:
+        return math.exp(self.mu + self.sigma ** 2 / 2)
+
+@dataclass(frozen=True)
+class Beta(Distribution):
+    """Beta distribution, optionally rescaled from [0, 1] to [low, high]."""
+    alpha: float
+    beta: float
+    low: float = 0.0
+    high: float = 1.0
+
+    @classmethod
+    def from_moments(cls, mean: float, sd: float) -> 'Beta':
+        """Create a [0, 1] beta from its mean and standard deviation."""
+        common = mean * (1 - mean) / sd ** 2 - 1
+        if common <= 0:
+            raise ValueError("Standard deviation too large for a beta distribution")
+        return cls(alpha=mean * common, beta=(1 - mean) * common)
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        return self.low + (self.high - self.low) * rng.beta(self.alpha, self.beta, size)
+
+    def ppf(self, q: np.ndarray) -> np.ndarray:
+        return self.low + (self.high - self.low) * special.betaincinv(self.alpha, self.beta, q)
+
+    def logpdf(self, x: np.ndarray) -> np.ndarray:
+        width = self.high - self.low
+        z = (np.asarray(x, dtype=float) - self.low) / width
+        with np.errstate(divide='ignore', invalid='ignore'):
+            density = ((self.alpha - 1) * np.log(z) + (self.beta - 1) * np.log1p(-z)
+                       - special.betaln(self.alpha, self.beta) - math.log(width))
+        return np.where((z > 0) & (z < 1), density, -np.inf)
+
+    def cdf(self, x: np.ndarray) -> np.ndarray:
+        z = (np.asarray(x, dtype=float) - self.low) / (self.high - self.low)
+        return special.betainc(self.alpha, self.beta, np.clip(z, 0, 1))
+
+    @property
+    def mean(self) -> float:
+        return self.low + (self.high - self.low) * self.alpha / (self.alpha + self.beta)
+
+@dataclass(frozen=True)
+class Gamma(Distribution):
+    """Gamma distribution with shape and scale."""
+    shape: float
+    scale: float
+
+    @classmethod
+    def from_moments(cls, mean: float, sd: float) -> 'Gamma':
+        """Create from the mean and standard deviation."""
+        return cls(shape=(mean / sd) ** 2, scale=sd ** 2 / mean)
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        return rng.gamma(self.shape, self.scale, size)
+
+    def ppf(self, q: np.ndarray) -> np.ndarray:
+        return self.scale * special.gammaincinv(self.shape, q)
+
+    def logpdf(self, x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            density = ((self.shape - 1) * np.log(x) - x / self.scale
+                       - special.gammaln(self.shape) - self.shape * math.log(self.scale))
+        return np.where(x > 0, density, -np.inf)
+
+    def cdf(self, x: np.ndarray) -> np.ndarray:
+        return special.gammainc(self.shape, np.maximum(np.asarray(x, dtype=float), 0) / self.scale)
+
+    @property
+    def mean(self) -> float:
+        return self.shape * self.scale
+
+@dataclass(frozen=True)
+class Triangular(Distribution):
+    """Triangular distribution on [low, high] peaking at mode."""
+    low: float
+    mode: float
+    high: float
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        return rng.triangular(self.low, self.mode, self.high, size)
+
+    def ppf(self, q: np.ndarray) -> np.ndarray:
+        q = np.asarray(q, dtype=float)
+        width = self.high - self.low
+        split = (self.mode - self.low) / width
+        rising = self.low + np.sqrt(q * width * (self.mode - self.low))
+        falling = self.high - np.sqrt((1 - q) * width * (self.high - self.mode))
+        return np.where(q < split, rising, falling)
+
+    def logpdf(self, x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x, dtype=float)
+        width = self.high - self.low
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rising = 2 * (x - self.low) / (width * (self.mode - self.low))
+            falling = 2 * (self.high - x) / (width * (self.high - self.mode))
+            density = np.log(np.where(x < self.mode, rising, falling))
+        return np.where((x > self.low) & (x < self.high), density, -np.inf)
+
+    def cdf(self, x: np.ndarray) -> np.ndarray:
+        x = np.clip(np.asarray(x, dtype=float), self.low, self.high)
+        width = self.high - self.low
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rising = (x - self.low) ** 2 / (width * (self.mode - self.low))
+            falling = 1 - (self.high - x) ** 2 / (width * (self.high - self.mode))
+        return np.where(x < self.mode, rising, falling)
+
+    @property
+    def mean(self) -> float:
+        return (self.low + self.mode + self.high) / 3
+
+def sample_all(distributions: Dict[str, Distribution], rng: np.random.Generator, size: int) -> Dict[str, np.ndarray]:
+    """Draw `size` values for every parameter, one vectorized call each."""
+    return {name: distribution.sample(rng, size) for name, distribution in distributions.items()}
+
+class CorrelationMatrix:
+    """Validated correlation matrix of a Gaussian copula, with its Cholesky factor.
+
+    Coefficients are correlations of the latent standard normals; the
+    marginals keep their own distributions. The factor is computed once, on
+    construction.
+    """
+
+    def __init__(self, names: Sequence[str], matrix: np.ndarray):
+        """Validate a correlation matrix.
+
+        Args:
+            names: Parameter of each row and column
+            matrix: Symmetric positive definite matrix with a unit diagonal
+        """
+        names = list(names)
+        matrix = np.array(matrix, dtype=float)
+        if len(set(names)) != len(names):
+            raise ValueError("Correlated parameter names must be unique")
+        if matrix.shape != (len(names), len(names)):
+            raise ValueError(f"Correlation matrix must be {len(names)}x{len(names)}, got {matrix.shape}")
+        if not np.allclose(matrix, matrix.T):
+            raise ValueError("Correlation matrix must be symmetric")
+        if not np.allclose(np.diag(matrix), 1.0):
+            raise ValueError("Correlation matrix must have a unit diagonal")
+        if np.any(np.abs(matrix) > 1):
+            raise ValueError("Correlations must lie in [-1, 1]")
+        try:
+            cholesky = np.linalg.cholesky(matrix)
+        except np.linalg.LinAlgError:
+            raise ValueError("Correlation matrix must be positive definite") from None
+        self.names = names
+        self.matrix = matrix
+        self.cholesky = cholesky
+        self.matrix.flags.writeable = False
+        self.cholesky.flags.writeable = False
+
+    @classmethod
+    def from_pairs(cls, pairs: Mapping[Tuple[str, str], float]) -> 'CorrelationMatrix':
+        """Build a matrix from pairwise coefficients; unlisted pairs are uncorrelated."""
+        names = list(dict.fromkeys(name for pair in pairs for name in pair))
+        index = {name: i for i, name in enumerate(names)}
+        matrix = np.eye(len(names))
+        for (a, b), rho in pairs.items():
+            if a == b:
+                raise ValueError(f"Parameter '{a}' cannot be correlated with itself")
+            matrix[index[a], index[b]] = matrix[index[b], index[a]] = rho
+        return cls(names, matrix)
+
+    def coefficient(self, first: str, second: str) -> float:
+        """Correlation of two parameters; zero when either is not in the matrix."""
+        if first not in self.names or second not in self.names:
+            return 0.0
+        return float(self.matrix[self.names.index(first), self.names.index(second)])
+
+    def subset(self, names: Sequence[str]) -> Optional['CorrelationMatrix']:
+        """Correlations among some of the parameters, or None when none of them are correlated."""
+        kept = [name for name in self.names if name in set(names)]
+        index = [self.names.index(name) for name in kept]
+        matrix = self.matrix[np.ix_(index, index)]
+        if not np.any(matrix - np.eye(len(kept))):
+            return None
+        return CorrelationMatrix(kept, matrix)
+
+    def correlate(self, normals: np.ndarray) -> np.ndarray:
+        """Correlate independent standard normals, one row per name, in one product."""
+        return self.cholesky @ normals
+
+    def log_density(self, scores: np.ndarray) -> np.ndarray:
+        """Log density of the Gaussian copula at normal scores, one row per name.
+
+        This is the log joint normal density minus the log marginal
+        densities, -(z'(R^-1 - I)z)/2 - log|R|/2, solved through the
+        Cholesky factor.
+        """
+        whitened = linalg.solve_triangular(self.cholesky, scores, lower=True, check_finite=False)
+        quadratic = np.einsum('ij,ij->j', whitened, whitened) - np.einsum('ij,ij->j', scores, scores)
+        return -0.5 * quadratic - np.log(np.diag(self.cholesky)).sum()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize as {"names": [...], "matrix": [[...], ...]}."""
+        return {"names": list(self.names), "matrix": self.matrix.tolist()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CorrelationMatrix':
+        """Recreate a matrix serialized with to_dict()."""
+        return cls(data["names"], np.array(data["matrix"]))
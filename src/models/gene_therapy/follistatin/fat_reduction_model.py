@@ -1,6 +1,9 @@
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple
+from dataclasses import dataclass
+from typing import Dict, List, Tuple, Union
+
+from src.models.discounting import discount_factors
 
 class ModelParameters:
     """Stores all input parameters for the economic model"""
@@ -46,6 +49,28 @@ class ModelParameters:
             'post_intervention': 0.8
         }
 
+@dataclass
+class CohortTrace:
+    """Cohort trace and yearly outcomes of one simulation"""
+    states: List[str]
+    trace: np.ndarray  # (years x states) cohort after each year's transitions
+    qalys: np.ndarray  # (years,)
+    costs: np.ndarray  # (years,)
+    
+    @property
+    def years(self) -> np.ndarray:
+        """Simulation years, starting at 1"""
+        return np.arange(1, len(self.trace) + 1)
+    
+    def to_frame(self) -> pd.DataFrame:
+        """One row per year with outcomes and the cohort distribution"""
+        return pd.DataFrame({
+            'year': self.years,
+            'qalys': self.qalys,
+            'costs': self.costs,
+            'cohort_distribution': list(self.trace)
+        })
+
 class MarkovModel:
     """Discrete-time Markov cohort model implementation"""
     
@@ -66,42 +91,116 @@ class MarkovModel:
             [0.0, 0.0, 0.0, 0.0, 1.0]       # Dead
         ])
         
-    def run_cohort_simulation(self) -> pd.DataFrame:
-        """Run the cohort simulation over time horizon"""
-        results = []
+    def run_cohort_simulation(self, as_frame: bool = True,
+                              discounted: bool = False) -> Union[pd.DataFrame, CohortTrace]:
+        """Run the cohort simulation over time horizon
+        
+        The trace is kept in a preallocated (years x states) array and all
+        yearly outcomes come from one product with the state weight and cost
+        vectors, discounted in the same step when requested.
+        
+        Args:
+            as_frame: Return a DataFrame (built from the arrays) instead of a CohortTrace
+            discounted: Discount outcomes at the parameters' discount rate,
+                each year's at the end of that year
+        """
+        years = self.params.time_horizon
+        trace = np.empty((years, len(self.states)))
         cohort = np.zeros(len(self.states))
         cohort[0] = self.params.population_size  # Start all in healthy state
         
-        for year in range(self.params.time_horizon):
+        for year in range(years):
             # Apply transitions
-            cohort = np.dot(cohort, self.transition_matrix)
-            
-            # Calculate outcomes
-            qalys = self._calculate_qalys(cohort)
-            costs = self._calculate_costs(cohort, year)
-            
-            results.append({
-                'year': year + 1,
-                'qalys': qalys,
-                'costs': costs,
-                'cohort_distribution': cohort.copy()
-            })
-            
-        return pd.DataFrame(results)
+            cohort = cohort @ self.transition_matrix
+            trace[year] = cohort
+        
+        # Calculate outcomes: (years x states) @ (states x [qalys, costs])
+        values = np.column_stack([
+            self.state_values(self.params.qaly_weights),
+            self.state_values(self.params.healthcare_costs)
+        ])
+        if discounted:
+            outcomes = np.einsum('y,ys,so->yo', self._discount_factors(), trace, values)
+        else:
+            outcomes = trace @ values
+        
+        result = CohortTrace(list(self.states), trace, outcomes[:, 0], outcomes[:, 1])
+        return result.to_frame() if as_frame else result
+    
+    def _discount_factors(self) -> np.ndarray:
+        """Discount factors of simulation years 1..n
+        
+        Outcomes are counted after each year's transitions, so year t is
+        discounted by (1 + r)**-t, as in src/analysis/analysis.py.
+        """
+        return discount_factors(self.params.discount_rate, self.params.time_horizon + 1)[1:]
+    
+    def state_values(self, values: Dict[str, float]) -> np.ndarray:
+        """Per-state vector of a state -> value mapping; missing states (and death) are 0"""
+        return np.array([values.get(state, 0.0) for state in self.states[:-1]] + [0.0])
+    
+    def run_cohort_simulation_batch(self, transition_matrices: np.ndarray,
+                                    initial_distributions: np.ndarray = None,
+                                    qaly_weights: np.ndarray = None,
+                                    state_costs: np.ndarray = None,
+                                    return_trace: bool = False,
+                                    discounted: bool = False) -> Dict[str, np.ndarray]:
+        """Run many cohort simulations at once, advancing every cohort together each year
+        
+        Args:
+            transition_matrices: (scenarios x states x states) stack, or one
+                (states x states) matrix shared by all scenarios
+            initial_distributions: (scenarios x states) starting cohorts, or one
+                (states,) vector; defaults to the whole population healthy
+            qaly_weights: (scenarios x states) or (states,) QALY weights;
+                defaults to the parameters' weights
+            state_costs: (scenarios x states) or (states,) annual costs;
+                defaults to the parameters' healthcare costs
+            return_trace: Also return the (scenarios x years x states) cohort trace
+            discounted: Discount outcomes at the parameters' discount rate,
+                each year's at the end of that year
+        
+        Returns:
+            "qalys" and "costs" of shape (scenarios x years), and "trace" if requested
+        """
+        n_states = len(self.states)
+        matrices = np.asarray(transition_matrices, dtype=float)
+        if initial_distributions is None:
+            initial_distributions = np.eye(n_states)[0] * self.params.population_size
+        cohort = np.asarray(initial_distributions, dtype=float)
+        weights = self.state_values(self.params.qaly_weights) if qaly_weights is None else np.asarray(qaly_weights, dtype=float)
+        costs = self.state_values(self.params.healthcare_costs) if state_costs is None else np.asarray(state_costs, dtype=float)
+        n = max(a.shape[0] if a.ndim == ndim else 1 for a, ndim in ((matrices, 3), (cohort, 2), (weights, 2), (costs, 2)))
+        cohort = np.array(np.broadcast_to(cohort, (n, n_states)))
+        
+        years = self.params.time_horizon
+        qalys = np.empty((n, years))
+        annual_costs = np.empty((n, years))
+        trace = np.empty((n, years, n_states)) if return_trace else None
+        for year in range(years):
+            # One product advances every cohort; a shared matrix needs no batch axis
+            cohort = cohort @ matrices if matrices.ndim == 2 else np.einsum('si,sij->sj', cohort, matrices)
+            qalys[:, year] = np.einsum('si,si->s', cohort, np.broadcast_to(weights, cohort.shape))
+            annual_costs[:, year] = np.einsum('si,si->s', cohort, np.broadcast_to(costs, cohort.shape))
+            if return_trace:
+                trace[:, year] = cohort
+        
+        if discounted:
+            factors = self._discount_factors()
+            qalys *= factors
+            annual_costs *= factors
+        results = {'qalys': qalys, 'costs': annual_costs}
+        if return_trace:
+            results['trace'] = trace
+        return results
     
     def _calculate_qalys(self, cohort: np.ndarray) -> float:
         """Calculate QALYs for current cohort distribution"""
-        return sum(
-            cohort[i] * self.params.qaly_weights[state]
-            for i, state in enumerate(self.states[:-1])  # Exclude dead state
-        )
+        return float(cohort @ self.state_values(self.params.qaly_weights))
     
     def _calculate_costs(self, cohort: np.ndarray, year: int) -> float:
         """Calculate annual healthcare costs"""
-        return sum(
-            cohort[i] * self.params.healthcare_costs.get(state, 0)
-            for i, state in enumerate(self.states[:-1])  # Exclude dead state
-        )
+        return float(cohort @ self.state_values(self.params.healthcare_costs))
 
 class EconomicCalculator:
     """Handles economic outcome calculations"""
@@ -109,13 +208,160 @@ class EconomicCalculator:
     @staticmethod
     def calculate_icer(intervention_cost: float, control_cost: float,
                        intervention_qaly: float, control_qaly: float) -> float:
-        """Calculate incremental cost-effectiveness ratio"""
-        return (intervention_cost - control_cost) / (intervention_qaly - control_qaly)
+        """Calculate incremental cost-effectiveness ratio
+        
+        Equal QALYs give +inf when the intervention costs more, -inf when it
+        costs less and nan when costs are equal too. Broadcasts over arrays.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            icer = np.true_divide(np.subtract(intervention_cost, control_cost),
+                                  np.subtract(intervention_qaly, control_qaly))
+        return float(icer) if np.ndim(icer) == 0 else icer
+    
+    @staticmethod
+    def calculate_frontier(costs: np.ndarray, effects: np.ndarray) -> Dict[str, np.ndarray]:
+        """Calculate the cost-effectiveness frontier of many strategies, per draw
+        
+        Strategies are sorted by cost (O(n log n)); strongly dominated ones
+        (no more effective than a cheaper or equally costly option) are
+        removed with a running maximum of effect, and extendedly dominated
+        ones (ICER above that of the next more effective option) by a
+        monotone-chain hull. Every step runs across all draws at once.
+        
+        Args:
+            costs: Costs of shape (draws, strategies), or (strategies,) for one draw
+            effects: Effects (e.g. QALYs) of the same shape
+        
+        Returns:
+            Arrays shaped like the inputs, in strategy order:
+            "efficient": strategy is on the frontier
+            "strongly_dominated", "extendedly_dominated": reason it is not
+            "icer": ICER versus the previous frontier strategy; nan for the
+                cheapest frontier strategy and for dominated strategies
+            "rank": position in cost order (0 = cheapest)
+        """
+        costs = np.asarray(costs, dtype=float)
+        effects = np.asarray(effects, dtype=float)
+        single = costs.ndim == 1
+        cost = np.atleast_2d(costs)
+        effect = np.broadcast_to(np.atleast_2d(effects), cost.shape)
+        n, k = cost.shape
+        rows = np.arange(n)
+        
+        # Sort by cost; at equal cost the more effective option comes first
+        order = np.lexsort((-effect, cost), axis=1)
+        c = np.take_along_axis(cost, order, axis=1)
+        e = np.take_along_axis(effect, order, axis=1)
+        best_before = np.maximum.accumulate(e, axis=1)
+        strong = np.zeros((n, k), dtype=bool)
+        strong[:, 1:] = e[:, 1:] <= best_before[:, :-1]
+        
+        # Monotone chain over the remaining options: drop the top of the
+        # hull while its ICER exceeds the ICER of the newcomer over it
+        hull = np.zeros((n, k), dtype=np.intp)
+        size = np.zeros(n, dtype=np.intp)
+        for j in range(k):
+            active = ~strong[:, j]
+            while True:
+                deep = active & (size >= 2)
+                a = hull[rows, np.maximum(size - 2, 0)]
+                b = hull[rows, np.maximum(size - 1, 0)]
+                ca, cb, ea, eb = c[rows, a], c[rows, b], e[rows, a], e[rows, b]
+                pop = deep & ((cb - ca) * (e[:, j] - eb) > (c[:, j] - cb) * (eb - ea))
+                if not pop.any():
+                    break
+                size[pop] -= 1
+            hull[rows[active], size[active]] = j
+            size[active] += 1
+        
+        members = np.arange(k) < size[:, None]
+        efficient = np.zeros((n, k), dtype=bool)
+        efficient[np.nonzero(members)[0], hull[members]] = True
+        hull_cost = np.take_along_axis(c, hull, axis=1)
+        hull_effect = np.take_along_axis(e, hull, axis=1)
+        icer = np.full((n, k), np.nan)
+        steps = members[:, 1:]
+        step_icer = (hull_cost[:, 1:] - hull_cost[:, :-1]) / np.where(steps, hull_effect[:, 1:] - hull_effect[:, :-1], 1.0)
+        icer[np.nonzero(steps)[0], hull[:, 1:][steps]] = step_icer[steps]
+        
+        def unsort(values: np.ndarray) -> np.ndarray:
+            result = np.empty_like(values)
+            np.put_along_axis(result, order, values, axis=1)
+            return result[0] if single else result
+        
+        return {
+            'efficient': unsort(efficient),
+            'strongly_dominated': unsort(strong),
+            'extendedly_dominated': unsort(~strong & ~efficient),
+            'icer': unsort(icer),
+            'rank': unsort(np.broadcast_to(np.arange(k), (n, k)).copy())
+        }
     
     @staticmethod
     def calculate_roi(total_benefits: float, total_costs: float) -> float:
         """Calculate return on investment"""
         return (total_benefits - total_costs) / total_costs
+    
+    @staticmethod
+    def calculate_nmb(cost, effect, wtp):
+        """Calculate net monetary benefit, wtp * effect - cost; broadcasts over arrays"""
+        return np.asarray(wtp) * effect - cost
+    
+    @staticmethod
+    def calculate_acceptability(costs: Dict[str, np.ndarray], effects: Dict[str, np.ndarray],
+                                wtp: np.ndarray, chunk_size: int = 1_000_000) -> Dict[str, pd.DataFrame]:
+        """Calculate CEAC, CEAF and expected net monetary benefit from PSA draws
+        
+        Net monetary benefit is formed as one (draws x WTP) broadcast per
+        strategy and chunk of draws, keeping a running best strategy, so at
+        most chunk_size elements per array are alive at once.
+        
+        Args:
+            costs: Strategy -> cost per draw (or a fixed cost)
+            effects: Strategy -> effect per draw (e.g. QALYs)
+            wtp: Willingness-to-pay grid per unit of effect
+            chunk_size: Most (draws x WTP) elements per chunk
+        
+        Returns:
+            "ceac": probability each strategy is optimal, per WTP
+            "expected_nmb": expected net monetary benefit of each strategy, per WTP
+            "ceaf": strategy with the highest expected NMB and its probability of being optimal, per WTP
+        """
+        strategies = list(effects)
+        wtp = np.asarray(wtp, dtype=float)
+        n = max(np.size(effects[s]) for s in strategies)
+        effect = np.column_stack([np.broadcast_to(np.asarray(effects[s], dtype=float), (n,)) for s in strategies])
+        cost = np.column_stack([np.broadcast_to(np.asarray(costs[s], dtype=float), (n,)) for s in strategies])
+        
+        # Times each strategy is optimal, accumulated chunk by chunk; ties go
+        # to the first strategy
+        counts = np.zeros((len(wtp), len(strategies)), dtype=np.int64)
+        rows = max(1, chunk_size // len(wtp))
+        for start in range(0, n, rows):
+            best_nmb = np.multiply.outer(effect[start:start + rows, 0], wtp)
+            best_nmb -= cost[start:start + rows, 0, None]
+            best = np.zeros(best_nmb.shape, dtype=np.min_scalar_type(len(strategies)))
+            for s in range(1, len(strategies)):
+                nmb = np.multiply.outer(effect[start:start + rows, s], wtp)
+                nmb -= cost[start:start + rows, s, None]
+                best[nmb > best_nmb] = s
+                np.maximum(best_nmb, nmb, out=best_nmb)
+            for s in range(len(strategies)):
+                counts[:, s] += np.count_nonzero(best == s, axis=0)
+        ceac = counts / n
+        
+        # Expected NMB is linear in the draws, so it needs only their means
+        expected = wtp[:, None] * effect.mean(axis=0) - cost.mean(axis=0)
+        optimal = expected.argmax(axis=1)
+        index = pd.Index(wtp, name='wtp')
+        return {
+            'ceac': pd.DataFrame(ceac, index=index, columns=strategies),
+            'expected_nmb': pd.DataFrame(expected, index=index, columns=strategies),
+            'ceaf': pd.DataFrame({
+                'optimal': [strategies[i] for i in optimal],
+                'probability': ceac[np.arange(len(wtp)), optimal]
+            }, index=index)
+        }
 
 # Example usage
 if __name__ == "__main__":
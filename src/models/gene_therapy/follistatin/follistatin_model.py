@@ -5,17 +5,33 @@ This module implements models for analyzing the impact of Follistatin therapy
 showing 2 lb muscle gain and 2 lb fat reduction across US population.
 """
 
-from typing import Dict, Any
-from pydantic import BaseModel, Field
+from typing import ClassVar, Dict, Any, Tuple
+from pydantic import BaseModel, ConfigDict, Field
 from src.models.base_model import BaseImpactModel, BaseParameters
+from src.models.distributions import Distribution, Gamma, Triangular
 
 class FollistatinParameters(BaseModel):
     """Parameters for Follistatin therapy impact model."""
+    model_config = ConfigDict(frozen=True)
+    
     muscle_gain_lbs: float = Field(default=2.0, description="Average muscle mass gain in pounds")
     fat_loss_lbs: float = Field(default=2.0, description="Average fat mass reduction in pounds")
     obesity_cost_per_lb: float = Field(default=92.0, description="Healthcare cost per pound of excess fat")
     productivity_per_lb_muscle: float = Field(default=147.0, description="Productivity value per pound of muscle")
     medicare_savings_per_lb: float = Field(default=100.0, description="Medicare savings per pound of improved body composition")
+    
+    # Parameter uncertainty for probabilistic sensitivity analysis
+    distributions: ClassVar[Dict[str, Distribution]] = {
+        "muscle_gain_lbs": Triangular(low=1.0, mode=2.0, high=3.0),
+        "fat_loss_lbs": Triangular(low=1.0, mode=2.0, high=3.0),
+        "obesity_cost_per_lb": Gamma.from_moments(mean=92.0, sd=18.4),
+        "productivity_per_lb_muscle": Gamma.from_moments(mean=147.0, sd=29.4),
+        "medicare_savings_per_lb": Gamma.from_moments(mean=100.0, sd=20.0),
+    }
+    # Gaussian copula correlations between the distributions above
+    correlations: ClassVar[Dict[Tuple[str, str], float]] = {
+        ("muscle_gain_lbs", "fat_loss_lbs"): 0.6,
+    }
 
 class FollistatinModel(BaseImpactModel):
     """Analyzes economic impact of Follistatin gene therapy."""
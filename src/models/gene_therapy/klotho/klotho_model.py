@@ -9,18 +9,36 @@ This module implements models for analyzing the impact of Klotho therapy showing
 See questions.md for full requirements.
 """
 
-from typing import Dict, Any
-from pydantic import BaseModel, Field
+from typing import ClassVar, Dict, Any, Tuple
+from pydantic import BaseModel, ConfigDict, Field
 from src.models.base_model import BaseImpactModel, BaseParameters
+from src.models.distributions import Distribution, Gamma, LogNormal, Triangular
 
 class KlothoParameters(BaseModel):
     """Parameters specific to Klotho therapy."""
+    model_config = ConfigDict(frozen=True)
+    
     iq_increase: float = Field(default=3.5, description="IQ point increase (2-5 range)")
     alzheimers_delay_years: float = Field(default=2.0, description="Alzheimer's progression delay in years")
     kidney_delay_years: float = Field(default=2.0, description="Kidney disease progression delay in years")
     alzheimers_annual_cost: float = Field(default=355e9, description="Total US annual Alzheimer's cost")
     esrd_annual_cost: float = Field(default=87e9, description="Total US annual ESRD cost")
     cognitive_value_per_iq: float = Field(default=2200, description="Annual economic value per IQ point")
+    
+    # Parameter uncertainty for probabilistic sensitivity analysis
+    distributions: ClassVar[Dict[str, Distribution]] = {
+        "iq_increase": Triangular(low=2.0, mode=3.5, high=5.0),
+        "alzheimers_delay_years": Gamma.from_moments(mean=2.0, sd=0.5),
+        "kidney_delay_years": Gamma.from_moments(mean=2.0, sd=0.5),
+        "alzheimers_annual_cost": Gamma.from_moments(mean=355e9, sd=35.5e9),
+        "esrd_annual_cost": Gamma.from_moments(mean=87e9, sd=8.7e9),
+        "cognitive_value_per_iq": LogNormal.from_moments(mean=2200, sd=440),
+    }
+    # Gaussian copula correlations between the distributions above
+    correlations: ClassVar[Dict[Tuple[str, str], float]] = {
+        ("iq_increase", "alzheimers_delay_years"): 0.5,
+        ("alzheimers_delay_years", "kidney_delay_years"): 0.3,
+    }
 
 class KlothoModel(BaseImpactModel):
     """Models the health and economic impacts of Klotho gene therapy."""
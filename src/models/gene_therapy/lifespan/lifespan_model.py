@@ -5,17 +5,29 @@ This module implements models for analyzing the economic impact of
 2.5% lifespan extension, including GDP impacts and Medicare savings.
 """
 
-from typing import Dict, Any
-from pydantic import BaseModel, Field
+from typing import ClassVar, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field
 from src.models.base_model import BaseImpactModel, BaseParameters
+from src.models.distributions import Beta, Distribution, Triangular
 
 class LifespanParameters(BaseModel):
     """Parameters specific to lifespan extension therapy."""
+    model_config = ConfigDict(frozen=True)
+    
     lifespan_increase_pct: float = Field(default=2.5, description="Percentage increase in lifespan")
     workforce_participation_rate: float = Field(default=0.63, description="Workforce participation rate")
     age_related_care_pct: float = Field(default=0.85, description="Percentage of Medicare spent on age-related care")
     qaly_value: float = Field(default=100000, description="Value of one quality-adjusted life year")
     health_quality_factor: float = Field(default=0.8, description="Health quality factor for extended years")
+    
+    # Parameter uncertainty for probabilistic sensitivity analysis
+    distributions: ClassVar[Dict[str, Distribution]] = {
+        "lifespan_increase_pct": Triangular(low=1.5, mode=2.5, high=3.5),
+        "workforce_participation_rate": Beta.from_moments(mean=0.63, sd=0.02),
+        "age_related_care_pct": Beta.from_moments(mean=0.85, sd=0.03),
+        "qaly_value": Triangular(low=50000, mode=100000, high=150000),
+        "health_quality_factor": Beta.from_moments(mean=0.8, sd=0.05),
+    }
 
 class LifespanModel(BaseImpactModel):
     """Models the economic impacts of lifespan extension therapy."""
@@ -51,7 +63,7 @@ class LifespanModel(BaseImpactModel):
             self.therapy_params.qaly_value *
             self.therapy_params.health_quality_factor
         ) / self.params.time_horizon_years
-        return self.calculate_npv(annual_value, self.params.time_horizon_years)
+        return self.calculate_npv(annual_value, self.params.time_horizon_years, kind="effect")
     
     def calculate_impacts(self) -> Dict[str, Any]:
         """Calculate all economic impacts."""
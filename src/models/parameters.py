@@ -1,13 +1,21 @@
 """Parameter classes for economic impact models."""
 
-from typing import Dict, Any, Optional
+from typing import ClassVar, Dict, Any, Optional
 from pydantic import BaseModel, Field, validator, computed_field
 
+from src.models.distributions import Beta, Distribution, Gamma, Normal, Triangular
+
 class CognitiveParams(BaseModel):
     """Parameters for cognitive effects."""
     iq_increase: float = Field(description="IQ increase in points")
     alzheimers_reduction: float = Field(description="Alzheimer's progression reduction percentage")
     
+    # Parameter uncertainty for probabilistic sensitivity analysis
+    distributions: ClassVar[Dict[str, Distribution]] = {
+        "iq_increase": Triangular(low=0.0, mode=2.5, high=5.0),
+        "alzheimers_reduction": Triangular(low=5.0, mode=15.0, high=25.0),
+    }
+    
     @validator('iq_increase')
     def validate_iq(cls, v: float) -> float:
         """Validate IQ increase."""
@@ -27,6 +35,12 @@ class KidneyParams(BaseModel):
     egfr_improvement: float = Field(description="eGFR improvement in mL/min/1.73m²")
     ckd_progression_reduction: float = Field(description="CKD progression reduction percentage")
     
+    # Parameter uncertainty for probabilistic sensitivity analysis
+    distributions: ClassVar[Dict[str, Distribution]] = {
+        "egfr_improvement": Triangular(low=4.0, mode=8.0, high=12.0),
+        "ckd_progression_reduction": Triangular(low=10.0, mode=20.0, high=30.0),
+    }
+    
     @validator('egfr_improvement')
     def validate_egfr(cls, v: float) -> float:
         """Validate eGFR improvement."""
@@ -46,6 +60,12 @@ class PhysicalParams(BaseModel):
     muscle_mass_change_lb: float = Field(description="Muscle mass change in pounds (positive = gain)")
     fat_mass_change_lb: float = Field(description="Fat mass change in pounds (positive = gain)")
     
+    # Parameter uncertainty for probabilistic sensitivity analysis
+    distributions: ClassVar[Dict[str, Distribution]] = {
+        "muscle_mass_change_lb": Triangular(low=0.5, mode=2.0, high=3.5),
+        "fat_mass_change_lb": Triangular(low=-3.5, mode=-2.0, high=-0.5),
+    }
+    
     @validator('muscle_mass_change_lb')
     def validate_muscle(cls, v: float) -> float:
         """Validate muscle mass change."""
@@ -65,6 +85,12 @@ class LongevityParams(BaseModel):
     lifespan_increase_years: float = Field(description="Lifespan increase in years")
     healthspan_improvement_percent: float = Field(description="Healthspan improvement percentage")
     
+    # Parameter uncertainty for probabilistic sensitivity analysis
+    distributions: ClassVar[Dict[str, Distribution]] = {
+        "lifespan_increase_years": Triangular(low=1.0, mode=2.0, high=3.0),
+        "healthspan_improvement_percent": Triangular(low=60.0, mode=80.0, high=95.0),
+    }
+    
     @validator('lifespan_increase_years')
     def validate_lifespan(cls, v: float) -> float:
         """Validate lifespan increase."""
@@ -89,6 +115,16 @@ class HealthcareParams(BaseModel):
     savings_per_lb_muscle: float = Field(description="Healthcare savings per pound of muscle")
     savings_per_lb_fat: float = Field(description="Healthcare savings per pound of fat loss")
     
+    # Parameter uncertainty for probabilistic sensitivity analysis
+    distributions: ClassVar[Dict[str, Distribution]] = {
+        "hospital_visit_reduction_percent": Triangular(low=5.0, mode=12.0, high=20.0),
+        "annual_alzheimers_cost": Gamma.from_moments(mean=305e9, sd=30.5e9),
+        "annual_ckd_cost": Gamma.from_moments(mean=87e9, sd=8.7e9),
+        "cost_per_hospital_visit": Gamma.from_moments(mean=113664.0, sd=11366.4),
+        "savings_per_lb_muscle": Gamma.from_moments(mean=12.0, sd=2.4),
+        "savings_per_lb_fat": Gamma.from_moments(mean=8.0, sd=1.6),
+    }
+    
     @validator('hospital_visit_reduction_percent')
     def validate_reduction(cls, v: float) -> float:
         """Validate hospital visit reduction."""
@@ -110,6 +146,15 @@ class ImpactModifiers(BaseModel):
     alzheimers_to_medicare: float = Field(description="Medicare savings from reduced Alzheimer's")
     health_quality: float = Field(description="Health quality multiplier")
     lifespan_to_gdp: float = Field(description="GDP impact from increased lifespan")
+    
+    # Parameter uncertainty for probabilistic sensitivity analysis
+    distributions: ClassVar[Dict[str, Distribution]] = {
+        "iq_to_gdp": Gamma.from_moments(mean=0.02, sd=0.005),
+        "kidney_to_medicare": Beta.from_moments(mean=0.4, sd=0.05),
+        "alzheimers_to_medicare": Beta.from_moments(mean=0.5, sd=0.05),
+        "health_quality": Beta.from_moments(mean=0.8, sd=0.05),
+        "lifespan_to_gdp": Beta.from_moments(mean=0.6, sd=0.05),
+    }
 
 class BasePopulationParams(BaseModel):
     """Base population parameters."""
@@ -118,6 +163,11 @@ class BasePopulationParams(BaseModel):
     medicare_beneficiaries: int = Field(description="Number of Medicare beneficiaries")
     workforce_fraction: float = Field(description="Fraction of population in workforce")
     
+    # Parameter uncertainty for probabilistic sensitivity analysis
+    distributions: ClassVar[Dict[str, Distribution]] = {
+        "workforce_fraction": Beta.from_moments(mean=0.63, sd=0.02),
+    }
+    
     @validator('target_population')
     def validate_target(cls, v: int, values: Dict) -> int:
         """Validate target population."""
@@ -131,6 +181,13 @@ class BaseEconomicParams(BaseModel):
     annual_productivity: float = Field(description="Annual productivity per worker")
     discount_rate: float = Field(description="Annual discount rate")
     
+    # Parameter uncertainty for probabilistic sensitivity analysis
+    distributions: ClassVar[Dict[str, Distribution]] = {
+        "annual_healthcare_cost": Gamma.from_moments(mean=12500.0, sd=1250.0),
+        "annual_productivity": Normal(mu=68000.0, sigma=3400.0),
+        "discount_rate": Triangular(low=0.015, mode=0.03, high=0.05),
+    }
+    
     @validator('annual_healthcare_cost', 'annual_productivity')
     def validate_positive(cls, v: float) -> float:
         """Validate positive values."""
@@ -5,7 +5,8 @@ from .writers import (
     write_executive_summary,
     write_study_design,
     write_intervention_analysis,
-    write_economic_calculations
+    write_economic_calculations,
+    write_formula
 )
 
 __all__ = [
@@ -13,5 +14,6 @@ __all__ = [
     'write_executive_summary',
     'write_study_design',
     'write_intervention_analysis',
-    'write_economic_calculations'
+    'write_economic_calculations',
+    'write_formula'
 ] 
\ No newline at end of file
@@ -5,10 +5,20 @@ from typing import TextIO, Dict, Any, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from src.models.base_model import BaseImpactModel
+    from src.models.calculators import BaseCalculator
     from src.models.report import Report
 
 from .formatters import format_currency, format_percentage, format_number, format_equation
 
+def write_formula(
+    f: TextIO,
+    calculator: 'BaseCalculator',
+    name: str,
+    params: Dict[str, Any]
+) -> None:
+    """Write a calculator output's declared equation with the values used."""
+    f.write(format_equation(calculator.render_equation(name, params)))
+
 def write_executive_summary(
     f: TextIO,
     intervention_config: Dict[str, Any],
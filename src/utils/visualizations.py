@@ -206,4 +206,86 @@ def plot_sensitivity_comparison(sensitivity_results: pd.DataFrame) -> go.Figure:
         )
     )
     
-    return fig 
\ No newline at end of file
+    return fig
+
+def plot_acceptability_curves(curves: Dict[str, pd.DataFrame]) -> go.Figure:
+    """Create cost-effectiveness acceptability curves with the frontier."""
+    fig = go.Figure()
+    
+    ceac = curves['ceac']
+    for strategy in ceac.columns:
+        fig.add_trace(go.Scatter(
+            x=ceac.index,
+            y=ceac[strategy],
+            name=strategy,
+            mode='lines'
+        ))
+    
+    ceaf = curves['ceaf']
+    fig.add_trace(go.Scatter(
+        x=ceaf.index,
+        y=ceaf['probability'],
+        name='Frontier (CEAF)',
+        mode='lines',
+        line=dict(color='black', dash='dash'),
+        customdata=ceaf['optimal'],
+        hovertemplate='%{customdata}: %{y:.1%}<extra>Frontier</extra>'
+    ))
+    
+    fig.update_layout(
+        title='Cost-Effectiveness Acceptability',
+        xaxis_title='Willingness to Pay ($ per unit of effect)',
+        yaxis_title='Probability Cost-Effective',
+        xaxis_tickformat='$,.0f',
+        yaxis_tickformat='.0%',
+        yaxis_range=[0, 1],
+        hovermode='x unified',
+        height=450,
+        margin=dict(l=20, r=20, t=50, b=50),
+        title_x=0.5,
+        title_y=0.98,
+        legend=dict(
+            orientation="h",
+            yanchor="top",
+            y=-0.15,
+            xanchor="center",
+            x=0.5
+        )
+    )
+    
+    return fig
+
+def plot_expected_nmb(curves: Dict[str, pd.DataFrame]) -> go.Figure:
+    """Create expected net monetary benefit curves."""
+    fig = go.Figure()
+    
+    expected = curves['expected_nmb']
+    for strategy in expected.columns:
+        fig.add_trace(go.Scatter(
+            x=expected.index,
+            y=expected[strategy],
+            name=strategy,
+            mode='lines'
+        ))
+    
+    fig.update_layout(
+        title='Expected Net Monetary Benefit',
+        xaxis_title='Willingness to Pay ($ per unit of effect)',
+        yaxis_title='Expected NMB ($)',
+        xaxis_tickformat='$,.0f',
+        yaxis_tickformat='$,.0f',
+        hovermode='x unified',
+        height=450,
+        margin=dict(l=20, r=20, t=50, b=50),
+        title_x=0.5,
+        title_y=0.98,
+        legend=dict(
+            orientation="h",
+            yanchor="top",
+            y=-0.15,
+            xanchor="center",
+            x=0.5
+        )
+    )
+    
+    return fig
@@ -0,0 +1,50 @@
+"""Tests for dual-number elasticities."""
+
+import pytest
+
+from src.analysis.sensitivity.autodiff import Dual
+from src.analysis.sensitivity.model_sensitivity import ModelSensitivityAnalyzer, total_output
+from src.models.gene_therapy.follistatin.follistatin_model import FollistatinModel
+from src.models.gene_therapy.klotho.klotho_model import KlothoModel
+from src.models.gene_therapy.lifespan.lifespan_model import LifespanModel
+
+def finite_difference_elasticity(model, name: str, step: float = 1e-6) -> float:
+    """Central-difference elasticity of the total output."""
+    base = model.parameter_values()[name]
+    high = total_output(model.with_parameters(**{name: base * (1 + step)}).calculate_impacts())
+    low = total_output(model.with_parameters(**{name: base * (1 - step)}).calculate_impacts())
+    return (high - low) / (2 * step * total_output(model.calculate_impacts()))
+
+def test_dual_arithmetic():
+    x, y = Dual.variables({'x': 2.0, 'y': 3.0}).values()
+    z = (x * y + 1) / y - abs(-x) ** 2 + 2 ** x
+    assert z.value == pytest.approx(7 / 3 - 4 + 4)
+    # dz/dx = 1 - 2x + 2^x ln 2, dz/dy = -1/y^2
+    assert z.grad[0] == pytest.approx(1 - 4 + 4 * 0.6931471805599453)
+    assert z.grad[1] == pytest.approx(-1 / 9)
+
+@pytest.mark.parametrize("model", [FollistatinModel(), KlothoModel(), LifespanModel()])
+def test_elasticities_match_finite_differences(model):
+    analyzer = ModelSensitivityAnalyzer()
+    result = analyzer.calculate_elasticities(model)
+    assert result
+    for name, elasticity in result.items():
+        assert elasticity == pytest.approx(finite_difference_elasticity(model, name), abs=1e-6)
+
+def test_elasticities_leave_model_untouched():
+    model = KlothoModel()
+    before = model.calculate_impacts()
+    ModelSensitivityAnalyzer().calculate_elasticities(model)
+    assert model.calculate_impacts() == before
+
+def test_calculator_elasticities(calculator_context):
+    from src.models.calculators import LongevityCalculator
+    calculator = LongevityCalculator(**calculator_context)
+    params = {'lifespan_increase_years': 2.0, 'healthspan_improvement_percent': 50.0}
+    result = ModelSensitivityAnalyzer().calculate_calculator_elasticities(
+        calculator, params, 'qalys_gained', context_parameters=['health_quality']
+    )
+    # QALYs = pop × L × (1 + h/100 × q): linear in L, elasticity of h and q is (h q/100)/(1 + h q/100)
+    assert result['lifespan_increase_years'] == pytest.approx(1.0)
+    assert result['healthspan_improvement_percent'] == pytest.approx(0.4 / 1.4)
+    assert result['health_quality'] == pytest.approx(0.4 / 1.4)
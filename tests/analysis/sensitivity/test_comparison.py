@@ -0,0 +1,89 @@
+"""Tests for intervention comparisons with variance reduction."""
+
+import numpy as np
+import pytest
+
+from src.analysis.sensitivity import comparison
+from src.analysis.sensitivity.comparison import compare_interventions
+from src.analysis.sensitivity.model_sensitivity import ModelSensitivityAnalyzer
+from src.models.base_model import BaseParameters
+from src.models.gene_therapy.follistatin.follistatin_model import FollistatinModel
+from src.models.gene_therapy.klotho.klotho_model import KlothoModel
+from src.models.gene_therapy.lifespan.lifespan_model import LifespanModel
+
+def horizon_models():
+    return {
+        "ten_years": LifespanModel(base_params=BaseParameters(time_horizon_years=10)),
+        "twenty_years": LifespanModel(base_params=BaseParameters(time_horizon_years=20)),
+    }
+
+def test_common_random_numbers_reduce_difference_variance():
+    shared = compare_interventions(horizon_models(), n_draws=20_000, seed=0)
+    independent = compare_interventions(horizon_models(), n_draws=20_000, seed=0, common_random_numbers=False)
+    assert "discount_rate" in shared.common_parameters
+    assert independent.common_parameters == []
+    
+    factor = shared.variance_reduction("twenty_years", "ten_years")["common_random_numbers"]
+    observed = (np.var(independent.outputs["twenty_years"] - independent.outputs["ten_years"])
+                / np.var(shared.outputs["twenty_years"] - shared.outputs["ten_years"]))
+    assert factor > 10
+    assert factor == pytest.approx(observed, rel=0.1)
+    assert independent.variance_reduction("twenty_years", "ten_years")["common_random_numbers"] == 1.0
+
+def test_control_variate_is_unbiased_and_tighter():
+    result = compare_interventions({"klotho": KlothoModel()}, n_draws=20_000, seed=1)
+    plain = result.estimate("klotho", control_variate=False)
+    controlled = result.estimate("klotho")
+    assert controlled["mean"] == pytest.approx(plain["mean"], rel=3 * plain["std_error"] / plain["mean"])
+    assert controlled["std_error"] < plain["std_error"] / 3
+    factor = result.variance_reduction("klotho")["control_variate"]
+    assert factor == pytest.approx((plain["std_error"] / controlled["std_error"]) ** 2, rel=0.01)
+
+def test_control_is_exact_for_linear_outputs():
+    model = FollistatinModel()
+    result = compare_interventions({"follistatin": model}, n_draws=100, seed=2, output="medicare_savings")
+    # The control's known mean is the output at the parameter means
+    assert result.control_means["follistatin"] == pytest.approx(
+        model.with_parameters(discount_rate=BaseParameters.distributions["discount_rate"].mean,
+                              medicare_savings_per_lb=100.0, muscle_gain_lbs=2.0,
+                              fat_loss_lbs=2.0).calculate_impacts()["medicare_savings"]
+    )
+
+def test_draws_keep_declared_correlations(monkeypatch):
+    evaluate = comparison.evaluate_model
+    draws = []
+    
+    def record(model, columns):
+        # Controls are evaluated at the parameter means, one row each
+        if len(next(iter(columns.values()))) > 1:
+            draws.append(columns)
+        return evaluate(model, columns)
+    
+    monkeypatch.setattr(comparison, "evaluate_model", record)
+    models = {
+        "klotho": KlothoModel(),
+        "klotho_twenty_years": KlothoModel(base_params=BaseParameters(time_horizon_years=20)),
+        "follistatin": FollistatinModel(),
+    }
+    result = compare_interventions(models, n_draws=50_000, seed=4)
+    
+    # Therapy parameters are not in every model, so each model samples its own correlated draws
+    assert "iq_increase" not in result.common_parameters
+    klotho, _, follistatin = draws
+    assert np.corrcoef(klotho["iq_increase"], klotho["alzheimers_delay_years"])[0, 1] == pytest.approx(0.5, abs=0.02)
+    assert np.corrcoef(follistatin["muscle_gain_lbs"], follistatin["fat_loss_lbs"])[0, 1] == pytest.approx(0.6, abs=0.02)
+    
+    draws.clear()
+    pair = {name: models[name] for name in ("klotho", "klotho_twenty_years")}
+    result = compare_interventions(pair, n_draws=50_000, seed=4)
+    assert {"iq_increase", "alzheimers_delay_years", "kidney_delay_years"} <= set(result.common_parameters)
+    np.testing.assert_array_equal(draws[0]["iq_increase"], draws[1]["iq_increase"])
+    assert np.corrcoef(draws[0]["alzheimers_delay_years"], draws[0]["kidney_delay_years"])[0, 1] == pytest.approx(0.3, abs=0.02)
+
+def test_compare_models_report():
+    report = ModelSensitivityAnalyzer().compare_models(
+        {"follistatin": FollistatinModel(), "lifespan": LifespanModel()}, simulation_runs=2000, seed=3
+    )
+    reductions = report["comparisons"]["lifespan"]["variance_reduction"]
+    assert set(reductions) == {"control_variate", "common_random_numbers", "combined"}
+    assert report["common_parameters"] == ["medicare_per_capita", "gdp_per_capita", "discount_rate"]
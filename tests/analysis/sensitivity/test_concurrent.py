@@ -0,0 +1,60 @@
+"""Tests for concurrent evaluation of a shared model."""
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from src.analysis.sensitivity.concurrent import ConcurrentEvaluator
+from src.analysis.sensitivity.model_sensitivity import ModelSensitivityAnalyzer
+from src.models.base_model import ParameterSnapshot
+from src.models.gene_therapy.follistatin.follistatin_model import FollistatinModel
+from src.models.gene_therapy.klotho.klotho_model import KlothoModel
+
+def test_parameters_are_frozen():
+    model = KlothoModel()
+    with pytest.raises(ValidationError):
+        model.therapy_params.iq_increase = 5.0
+    with pytest.raises(ValidationError):
+        model.params.discount_rate = 0.05
+
+def test_snapshots_are_immutable():
+    values = np.array([2.0, 3.0])
+    snapshot = KlothoModel().snapshot(iq_increase=values)
+    values[0] = 99.0
+    assert snapshot["iq_increase"][0] == 2.0
+    with pytest.raises(ValueError):
+        snapshot["iq_increase"][0] = 1.0
+    with pytest.raises(AttributeError):
+        snapshot.extra = 1
+    assert snapshot.replace(iq_increase=4.0)["iq_increase"] == 4.0
+    assert isinstance(snapshot.replace(), ParameterSnapshot)
+    with pytest.raises(ValueError):
+        KlothoModel().snapshot(unknown=1.0)
+
+def test_concurrent_snapshot_evaluations():
+    model = KlothoModel()
+    before = model.parameter_values()
+    snapshots = [model.snapshot(iq_increase=v, discount_rate=r)
+                 for v in np.linspace(2, 5, 20) for r in np.linspace(0.02, 0.06, 10)]
+    with ConcurrentEvaluator(model, max_workers=8) as evaluator:
+        results = evaluator.evaluate(snapshots)
+    expected = [model.evaluate(s) for s in snapshots]
+    assert [r["cognitive_value"] for r in results] == [e["cognitive_value"] for e in expected]
+    assert model.parameter_values() == before
+
+def test_concurrent_analyses_match_serial():
+    model = FollistatinModel()
+    analyzer = ModelSensitivityAnalyzer()
+    jobs = {
+        "tornado": analyzer.analyze_tornado,
+        "grid": lambda m: analyzer.analyze_grid(m, {"muscle_gain_lbs": 15, "fat_loss_lbs": 15}).values,
+        "sobol": lambda m: analyzer.analyze_sobol(m, n=256, seed=1, n_bootstrap=20).total_order,
+        "psa": lambda m: analyzer.analyze_model(m, simulation_runs=2000, seed=3)["uncertainty"],
+    }
+    with ConcurrentEvaluator(model, max_workers=4) as evaluator:
+        concurrent = evaluator.run(jobs)
+    serial = {name: job(model) for name, job in jobs.items()}
+    assert concurrent["tornado"].equals(serial["tornado"])
+    np.testing.assert_array_equal(concurrent["grid"], serial["grid"])
+    np.testing.assert_array_equal(concurrent["sobol"], serial["sobol"])
+    assert concurrent["psa"] == serial["psa"]
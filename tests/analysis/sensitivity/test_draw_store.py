@@ -0,0 +1,77 @@
+"""Tests for the memory-mapped draw store."""
+
+import json
+
+import numpy as np
+import pytest
+
+from src.analysis.sensitivity.draw_store import DrawStore
+from src.analysis.sensitivity.model_sensitivity import ModelSensitivityAnalyzer
+from src.analysis.sensitivity.psa import PSAResult, ProbabilisticSensitivityAnalysis
+from src.models.gene_therapy.follistatin.fat_reduction_model import MarkovModel, ModelParameters
+from src.models.gene_therapy.klotho.klotho_model import KlothoModel
+from src.models.gene_therapy.lifespan.lifespan_model import LifespanModel
+
+def test_append_grow_and_reopen(tmp_path):
+    store = DrawStore.create(tmp_path / "store", ["a", "b"], capacity=4, seed=9, model_version="test/1")
+    for start in range(0, 30, 10):
+        store.append({"a": np.arange(start, start + 10), "b": np.ones(10)})
+    store.close()
+    
+    reader = DrawStore(tmp_path / "store")
+    assert reader.size == 30
+    assert reader.seed == 9 and reader.model_version == "test/1"
+    np.testing.assert_array_equal(reader["a"], np.arange(30))
+    assert not reader["a"].flags.writeable
+    chunks = list(reader.iter_chunks(chunk_size=12, names=["a"]))
+    assert [len(chunk["a"]) for chunk in chunks] == [12, 12, 6]
+    with pytest.raises(ValueError):
+        reader.append({"a": [1.0], "b": [1.0]})
+    with pytest.raises(FileExistsError):
+        DrawStore.create(tmp_path / "store", ["a"])
+
+def test_rejects_ragged_chunks(tmp_path):
+    store = DrawStore.create(tmp_path / "store", ["a", "b"])
+    with pytest.raises(ValueError):
+        store.append({"a": np.ones(3), "b": np.ones(2)})
+
+def test_psa_run_to_store(tmp_path):
+    model = LifespanModel()
+    analysis = ProbabilisticSensitivityAnalysis.for_model(model, n_draws=25_000, seed=3, chunk_size=4000)
+    in_memory = analysis.run(model)
+    store = analysis.run_to_store(model, tmp_path / "lifespan")
+    
+    manifest = json.loads((tmp_path / "lifespan" / "manifest.json").read_text())
+    assert manifest["size"] == 25_000
+    assert "LifespanModel" in manifest["model_version"]
+    assert manifest["distributions"]["qaly_value"]["type"] == "Triangular"
+    
+    stored = PSAResult.from_store(DrawStore(tmp_path / "lifespan"))
+    np.testing.assert_array_equal(stored.outputs["qaly_value"], in_memory.outputs["qaly_value"])
+    np.testing.assert_array_equal(stored.inputs["qaly_value"], in_memory.inputs["qaly_value"])
+    assert stored.distributions == in_memory.distributions
+    assert stored.summary() == in_memory.summary()
+
+def test_store_keeps_correlations(tmp_path):
+    model = KlothoModel()
+    analysis = ProbabilisticSensitivityAnalysis.for_model(model, n_draws=1000, seed=3)
+    analysis.run_to_store(model, tmp_path / "klotho")
+    stored = PSAResult.from_store(DrawStore(tmp_path / "klotho"))
+    assert stored.correlations.names == analysis.correlations.names
+    np.testing.assert_array_equal(stored.correlations.matrix, analysis.correlations.matrix)
+
+def test_analyze_model_with_draw_store(tmp_path):
+    results = ModelSensitivityAnalyzer().analyze_model(
+        LifespanModel(), simulation_runs=2000, seed=1, draws_path=str(tmp_path / "draws")
+    )
+    assert DrawStore(tmp_path / "draws").size == 2000
+    assert results["parameters"]["simulation_runs"] == 2000
+
+def test_markov_outputs(tmp_path):
+    model = MarkovModel(ModelParameters())
+    model.build_transition_matrix()
+    yearly = model.run_cohort_simulation()
+    store = DrawStore.create(tmp_path / "markov", {"year": (), "qalys": (), "costs": (), "cohort_distribution": (5,)})
+    store.append(yearly)
+    np.testing.assert_allclose(store["costs"], yearly["costs"])
+    np.testing.assert_allclose(store["cohort_distribution"][-1], yearly["cohort_distribution"].iloc[-1])
@@ -0,0 +1,31 @@
+"""Tests for n-way sensitivity grids."""
+
+import numpy as np
+import pytest
+
+from src.analysis.sensitivity.model_sensitivity import (
+    BYTES_PER_SCENARIO,
+    ModelSensitivityAnalyzer,
+    total_output,
+)
+from src.models.gene_therapy.klotho.klotho_model import KlothoModel
+
+def test_two_way_grid_matches_pointwise_evaluation():
+    model = KlothoModel()
+    grid = ModelSensitivityAnalyzer().analyze_grid(model, {"iq_increase": 5, "alzheimers_delay_years": [1.0, 2.5]})
+    
+    assert grid.values.shape == (5, 2)
+    np.testing.assert_allclose(grid.axes["iq_increase"], np.linspace(2.0, 5.0, 5))
+    expected = total_output(model.with_parameters(iq_increase=2.75, alzheimers_delay_years=2.5).calculate_impacts())
+    assert grid.values[1, 1] == pytest.approx(expected)
+    assert len(grid.to_frame()) == 10
+
+def test_chunked_grid_matches_broadcast_grid():
+    model = KlothoModel()
+    axes = {"iq_increase": 20, "alzheimers_delay_years": 15, "discount_rate": 10}
+    full = ModelSensitivityAnalyzer().analyze_grid(model, axes, output="dementia_savings")
+    chunked = ModelSensitivityAnalyzer(memory_budget_bytes=BYTES_PER_SCENARIO * 7).analyze_grid(
+        model, axes, output="dementia_savings"
+    )
+    assert full.values.shape == (20, 15, 10)
+    np.testing.assert_allclose(chunked.values, full.values)
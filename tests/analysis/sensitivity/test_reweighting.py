@@ -0,0 +1,100 @@
+"""Tests for saving PSA runs and importance-reweighted what-if analysis."""
+
+import time
+
+import numpy as np
+import pytest
+
+from src.analysis.sensitivity.psa import PSAResult, ProbabilisticSensitivityAnalysis
+from src.analysis.sensitivity.reweighting import reweight, what_if
+from src.models.distributions import Triangular
+from src.models.gene_therapy.klotho.klotho_model import KlothoModel
+
+@pytest.fixture(scope="module")
+def klotho_run():
+    model = KlothoModel()
+    return model, ProbabilisticSensitivityAnalysis.for_model(model, n_draws=200_000, seed=0).run(model)
+
+def test_save_and_load(tmp_path, klotho_run):
+    _, result = klotho_run
+    path = tmp_path / "klotho_psa.npz"
+    result.save(path)
+    loaded = PSAResult.load(path)
+    assert loaded.distributions == result.distributions
+    assert loaded.seed == result.seed
+    assert loaded.correlations.names == result.correlations.names
+    np.testing.assert_array_equal(loaded.correlations.matrix, result.correlations.matrix)
+    np.testing.assert_array_equal(loaded.outputs["total"], result.outputs["total"])
+    np.testing.assert_array_equal(loaded.inputs["iq_increase"], result.inputs["iq_increase"])
+
+def test_reweighting_matches_fresh_run(klotho_run):
+    model, result = klotho_run
+    narrower = {"iq_increase": Triangular(low=3.0, mode=3.5, high=4.0)}
+    weighted = what_if(result, narrower, model)
+    assert weighted.weights is not None
+    assert 0.1 * result.n_draws < weighted.effective_sample_size < result.n_draws
+    assert weighted.inputs is result.inputs
+    
+    distributions = {**result.distributions, **narrower}
+    fresh = ProbabilisticSensitivityAnalysis(
+        distributions, n_draws=200_000, seed=1, correlations=result.correlations
+    ).run(model)
+    assert weighted.means()["total"] == pytest.approx(fresh.means()["total"], rel=0.005)
+    for reweighted_bound, fresh_bound in zip(weighted.intervals()["total"], fresh.intervals()["total"]):
+        assert reweighted_bound == pytest.approx(fresh_bound, rel=0.02)
+
+def _correlation(result, first, second):
+    """Correlation of two inputs, weighted when the result is."""
+    weights = np.ones(result.n_draws) if result.weights is None else result.weights
+    x, y = result.inputs[first], result.inputs[second]
+    covariance = np.cov(x, y, aweights=weights)
+    return covariance[0, 1] / np.sqrt(covariance[0, 0] * covariance[1, 1])
+
+def test_reweighting_correlated_input_keeps_the_copula(klotho_run):
+    model, result = klotho_run
+    shifted = {"alzheimers_delay_years": Triangular(low=1.5, mode=2.5, high=3.0)}
+    weighted = reweight(result, shifted)
+    fresh = ProbabilisticSensitivityAnalysis(
+        {**result.distributions, **shifted}, n_draws=200_000, seed=1, correlations=result.correlations
+    ).run(model)
+    
+    for other in ("iq_increase", "kidney_delay_years"):
+        assert _correlation(weighted, "alzheimers_delay_years", other) == pytest.approx(
+            _correlation(fresh, "alzheimers_delay_years", other), abs=0.01
+        )
+    # The partner's marginal moves with the correlated input
+    iq = np.average(weighted.inputs["iq_increase"], weights=weighted.weights)
+    assert iq == pytest.approx(fresh.inputs["iq_increase"].mean(), rel=0.002)
+    assert weighted.means()["total"] == pytest.approx(fresh.means()["total"], rel=0.005)
+
+def test_unchanged_distribution_has_full_ess(klotho_run):
+    _, result = klotho_run
+    same = reweight(result, {"iq_increase": result.distributions["iq_increase"]})
+    assert same.effective_sample_size == pytest.approx(result.n_draws)
+
+def test_falls_back_to_fresh_sampling(klotho_run):
+    model, result = klotho_run
+    wider = {"iq_increase": Triangular(low=1.0, mode=3.5, high=6.0)}
+    with pytest.raises(ValueError, match="do not cover"):
+        what_if(result, wider)
+    fresh = what_if(result, wider, model, seed=2)
+    assert fresh.weights is None
+    assert fresh.inputs["iq_increase"].min() < 2.0
+    assert fresh.correlations is result.correlations
+    assert _correlation(fresh, "iq_increase", "alzheimers_delay_years") == pytest.approx(0.5, abs=0.03)
+
+def test_low_effective_sample_size_is_reported(klotho_run):
+    _, result = klotho_run
+    # Covered by the stored draws, but concentrated on a sliver of them
+    sharp = {"iq_increase": Triangular(low=3.45, mode=3.5, high=3.55)}
+    with pytest.raises(ValueError, match="Effective sample size"):
+        what_if(result, sharp)
+
+def test_what_if_is_fast(klotho_run):
+    model, result = klotho_run
+    # The first weighted query sorts each output once; later what-ifs reuse the order
+    what_if(result, {"iq_increase": Triangular(low=2.0, mode=3.5, high=5.0)}, model).summary()
+    start = time.perf_counter()
+    weighted = what_if(result, {"iq_increase": Triangular(low=2.5, mode=3.5, high=4.5)}, model)
+    weighted.summary()
+    assert time.perf_counter() - start < 0.5
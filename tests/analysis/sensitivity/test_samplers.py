@@ -0,0 +1,51 @@
+"""Tests for PSA sampler backends and convergence-based stopping."""
+
+import numpy as np
+import pytest
+
+from src.analysis.sensitivity.psa import ConvergenceMonitor, ProbabilisticSensitivityAnalysis
+from src.analysis.sensitivity.samplers import SAMPLERS, get_sampler
+from src.models.distributions import Gamma, Triangular
+from src.models.gene_therapy.klotho.klotho_model import KlothoModel
+from src.models.gene_therapy.lifespan.lifespan_model import LifespanModel
+
+@pytest.mark.parametrize("name", list(SAMPLERS))
+def test_sampler_marginals(name):
+    distributions = {"a": Gamma.from_moments(mean=10.0, sd=2.0), "b": Triangular(0.0, 1.0, 5.0)}
+    draws = get_sampler(name).sample(distributions, 4096, np.random.SeedSequence(0))
+    assert draws["a"].shape == (4096,)
+    assert draws["a"].mean() == pytest.approx(10.0, rel=0.02)
+    assert draws["b"].mean() == pytest.approx(2.0, rel=0.02)
+    assert draws["b"].min() >= 0 and draws["b"].max() <= 5
+
+def test_latin_hypercube_stratifies_each_dimension():
+    points = get_sampler("lhs").unit(3, 100, np.random.default_rng(0))
+    for j in range(3):
+        np.testing.assert_array_equal(np.sort(np.floor(points[:, j] * 100)), np.arange(100))
+
+def test_unknown_sampler():
+    with pytest.raises(ValueError):
+        get_sampler("mersenne")
+
+def test_monitor_stops_run_early():
+    model = LifespanModel()
+    analysis = ProbabilisticSensitivityAnalysis.for_model(model, n_draws=1_000_000, seed=0, chunk_size=1024)
+    result = analysis.run(model, ConvergenceMonitor(0.01, outputs=["total"]))
+    assert result.converged
+    assert result.n_draws < 1_000_000 and result.n_draws % 1024 == 0
+    assert len(result.inputs["qaly_value"]) == result.n_draws
+
+@pytest.mark.parametrize("model", [KlothoModel(), LifespanModel()])
+def test_quasi_random_needs_fewer_draws(model):
+    def draws_needed(sampler):
+        analysis = ProbabilisticSensitivityAnalysis.for_model(
+            model, n_draws=2_000_000, seed=0, chunk_size=1024, sampler=sampler
+        )
+        result = analysis.run(model, ConvergenceMonitor(0.002, outputs=["total"]))
+        assert result.converged
+        return result.n_draws, result.means()["total"]
+    
+    random_draws, random_mean = draws_needed("random")
+    sobol_draws, sobol_mean = draws_needed("sobol")
+    assert random_draws >= 5 * sobol_draws
+    assert sobol_mean == pytest.approx(random_mean, rel=0.005)
@@ -0,0 +1,85 @@
+"""Tests for mergeable streaming PSA summaries."""
+
+import numpy as np
+import pytest
+
+from src.analysis.sensitivity.model_sensitivity import ModelSensitivityAnalyzer
+from src.analysis.sensitivity.parallel import ParallelPSARunner
+from src.analysis.sensitivity.psa import ProbabilisticSensitivityAnalysis
+from src.analysis.sensitivity.streaming import Histogram, Moments, QuantileSketch
+from src.models.gene_therapy.lifespan.lifespan_model import LifespanModel
+
+@pytest.fixture
+def values():
+    return np.random.default_rng(0).lognormal(0, 1, 200_000)
+
+def test_moments_merge(values):
+    merged = Moments()
+    for chunk in np.array_split(values, 7):
+        merged = merged.merge(Moments.from_values(chunk))
+    assert merged.count == len(values)
+    assert merged.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert merged.variance == pytest.approx(values.var(ddof=1), rel=1e-10)
+    assert (merged.minimum, merged.maximum) == (values.min(), values.max())
+
+def test_quantile_sketch_accuracy(values):
+    sketch = QuantileSketch()
+    for chunk in np.array_split(values, 20):
+        sketch = sketch.merge(QuantileSketch.from_values(chunk))
+    assert len(sketch.weights) <= 250
+    assert sketch.count == len(values)
+    q = np.array([0.001, 0.025, 0.5, 0.975, 0.999])
+    np.testing.assert_allclose(sketch.quantile(q), np.quantile(values, q), rtol=0.01)
+
+def test_histogram_merge_is_exact(values):
+    edges = np.linspace(0, 10, 21)
+    merged = Histogram(edges)
+    for chunk in np.array_split(values, 5):
+        merged = merged.merge(Histogram.from_values(chunk, edges))
+    np.testing.assert_array_equal(merged.bin_counts, np.histogram(values[values < 10], edges)[0])
+    assert merged.counts[-1] == np.sum(values >= 10)
+    with pytest.raises(ValueError):
+        merged.merge(Histogram(np.linspace(0, 1, 3)))
+
+def test_summaries_match_full_run():
+    model = LifespanModel()
+    analysis = ProbabilisticSensitivityAnalysis.for_model(model, n_draws=50_000, seed=4, chunk_size=5000)
+    full = analysis.run(model).summary()
+    streamed = analysis.run_summaries(model)
+    assert streamed.n_draws == 50_000
+    for name, stats in streamed.summary().items():
+        assert stats["mean"] == pytest.approx(full[name]["mean"], rel=1e-12)
+        assert stats["std"] == pytest.approx(full[name]["std"], rel=1e-9)
+        assert stats["lower"] == pytest.approx(full[name]["lower"], rel=0.01)
+        assert stats["upper"] == pytest.approx(full[name]["upper"], rel=0.01)
+
+def test_parallel_summaries_are_exact():
+    model = LifespanModel()
+    analysis = ProbabilisticSensitivityAnalysis.for_model(model, n_draws=20_000, seed=5, chunk_size=2000)
+    serial = analysis.run_summaries(model)
+    parallel = ParallelPSARunner(analysis, max_workers=3).run_summaries(model)
+    assert parallel.summary() == serial.summary()
+    for name in serial.summaries:
+        np.testing.assert_array_equal(parallel.summaries[name].histogram.counts, serial.summaries[name].histogram.counts)
+        np.testing.assert_array_equal(parallel.summaries[name].sketch.means, serial.summaries[name].sketch.means)
+
+def test_analyze_model_summaries_only():
+    results = ModelSensitivityAnalyzer().analyze_model(LifespanModel(), simulation_runs=3000, seed=6, summaries_only=True)
+    assert results["parameters"]["simulation_runs"] == 3000
+    assert set(results["uncertainty"]["total"]) == {"mean", "std", "lower", "upper"}
+
+def test_chunk_seeds_match_spawned_children():
+    analysis = ProbabilisticSensitivityAnalysis.for_model(LifespanModel(), n_draws=10_000, seed=8, chunk_size=1000)
+    spawned = np.random.SeedSequence(8).spawn(len(analysis.chunks()))
+    for index in (0, 3, 9):
+        assert analysis.chunk_seed(index).generate_state(4).tolist() == spawned[index].generate_state(4).tolist()
+
+def test_summaries_evaluate_each_chunk_once(monkeypatch):
+    from src.analysis.sensitivity import psa
+    model = LifespanModel()
+    analysis = ProbabilisticSensitivityAnalysis.for_model(model, n_draws=5000, seed=9, chunk_size=1000)
+    calls = []
+    evaluate = psa.evaluate_model
+    monkeypatch.setattr(psa, "evaluate_model", lambda m, columns: calls.append(1) or evaluate(m, columns))
+    assert analysis.run_summaries(model).n_draws == 5000
+    assert len(calls) == len(analysis.chunks())
@@ -0,0 +1,61 @@
+"""Tests for batched threshold analysis."""
+
+import numpy as np
+import pytest
+
+from src.analysis.sensitivity.model_sensitivity import ModelSensitivityAnalyzer, total_output
+from src.analysis.sensitivity.threshold import bisect
+from src.models.gene_therapy.klotho.klotho_model import KlothoModel
+from src.models.gene_therapy.lifespan.lifespan_model import LifespanModel
+
+def test_bisect_many_roots():
+    targets = np.linspace(0.5, 8.0, 1000)
+    result = bisect(lambda x, index: x ** 2, 0.0, 3.0, targets, tolerance=1e-10)
+    assert result.converged.all()
+    np.testing.assert_allclose(result.values, np.sqrt(targets), atol=1e-9)
+
+def test_unbracketed_and_unfinished_scenarios():
+    result = bisect(lambda x, index: x, np.array([-1.0, 1.0]), np.array([1.0, 2.0]))
+    assert list(result.bracketed) == [True, False]
+    assert result.values[0] == pytest.approx(0.0, abs=1e-8)
+    assert np.isnan(result.values[1]) and not result.converged[1]
+    
+    short = bisect(lambda x, index: x - 0.3, 0.0, 1.0, max_iterations=5, tolerance=1e-12, size=3)
+    assert short.iterations == 5
+    assert short.bracketed.all() and not short.converged.any()
+    assert np.abs(short.values - 0.3).max() < 1 / 2 ** 5
+
+def test_only_unfinished_scenarios_are_evaluated():
+    calls = []
+    def evaluate(x, index):
+        calls.append(len(index))
+        return x - np.where(index == 0, 0.5, 0.123456789)
+    bisect(evaluate, 0.0, 1.0, size=2)
+    # Scenario 0 hits its root exactly on the first midpoint
+    assert calls[:3] == [2, 2, 2] and calls[3] == 1
+
+def test_breakeven_map_for_klotho():
+    model = KlothoModel()
+    populations, rates = np.meshgrid(np.linspace(1e8, 3e8, 20), np.linspace(0.02, 0.06, 25), indexing="ij")
+    scenarios = {"adult_population": populations.ravel(), "discount_rate": rates.ravel()}
+    result = ModelSensitivityAnalyzer().analyze_threshold(
+        model, "iq_increase", target=1.5e13, scenarios=scenarios, bounds=(0.0, 10.0)
+    )
+    assert result.converged.all()
+    check = model.with_parameters(iq_increase=result.values, **scenarios).calculate_impacts()
+    np.testing.assert_allclose(total_output(check), 1.5e13, rtol=1e-8)
+    # Larger populations break even at smaller effects
+    grid = result.values.reshape(populations.shape)
+    assert (np.diff(grid, axis=0) < 0).all()
+
+def test_threshold_on_net_monetary_benefit():
+    cost = 3e13
+    result = ModelSensitivityAnalyzer().analyze_threshold(
+        LifespanModel(), "lifespan_increase_pct",
+        scenarios={"qaly_value": [50_000, 100_000, 150_000]},
+        bounds=(0.0, 20.0),
+        objective=lambda impacts: total_output(impacts) - cost
+    )
+    assert result.converged.all()
+    assert (np.diff(result.values) < 0).all()
+    assert result.to_frame()["residual"].abs().max() < 1e-3 * cost
@@ -0,0 +1,54 @@
+"""Tests for batched one-way (tornado) sensitivity."""
+
+import pytest
+
+from src.analysis.sensitivity.model_sensitivity import ModelSensitivityAnalyzer, total_output
+from src.models.gene_therapy.follistatin.follistatin_model import FollistatinModel
+from src.models.gene_therapy.klotho.klotho_model import KlothoModel
+from src.models.gene_therapy.lifespan.lifespan_model import LifespanModel
+
+@pytest.mark.parametrize("model", [FollistatinModel(), KlothoModel(), LifespanModel()])
+def test_tornado_matches_one_at_a_time_runs(model):
+    analyzer = ModelSensitivityAnalyzer()
+    table = analyzer.analyze_tornado(model)
+    
+    assert list(table["swing"]) == sorted(table["swing"], reverse=True)
+    for row in table.itertuples():
+        low = total_output(model.with_parameters(**{row.parameter: row.low_value}).calculate_impacts())
+        high = total_output(model.with_parameters(**{row.parameter: row.high_value}).calculate_impacts())
+        assert row.low_output == pytest.approx(low)
+        assert row.high_output == pytest.approx(high)
+        assert row.base_output == pytest.approx(total_output(model.calculate_impacts()))
+
+def test_tornado_single_output():
+    table = ModelSensitivityAnalyzer().analyze_tornado(KlothoModel(), output="kidney_savings")
+    swings = dict(zip(table["parameter"], table["swing"]))
+    assert swings["iq_increase"] == 0
+    assert swings["discount_rate"] > 0
+
+def test_analyzer_does_not_mutate_model():
+    model = LifespanModel()
+    therapy_params = model.therapy_params
+    params = model.params
+    ModelSensitivityAnalyzer().analyze_model(model)
+    assert model.therapy_params is therapy_params
+    assert model.params is params
+
+def test_parameter_sensitivity_keeps_field_order_and_validates(capsys):
+    analyzer = ModelSensitivityAnalyzer()
+    model = KlothoModel()
+    results = analyzer.analyze_parameter_sensitivity(model)
+    assert [r.parameter for r in results] == ["iq_increase", "alzheimers_delay_years"]
+    table = analyzer.analyze_tornado(model, ["iq_increase", "alzheimers_delay_years"]).set_index("parameter")
+    for r in results:
+        assert r.high_output == table.at[r.parameter, "high_output"]
+    
+    analyzer.parameter_ranges["iq_increase"] = ("two", 5.0)
+    results = analyzer.analyze_parameter_sensitivity(model)
+    assert [r.parameter for r in results] == ["alzheimers_delay_years"]
+    assert "iq_increase" in capsys.readouterr().out
+
+def test_scalar_overrides_are_validated():
+    with pytest.raises(ValueError):
+        KlothoModel().with_parameters(iq_increase="two")
+    assert KlothoModel().with_parameters(time_horizon_years=12.0).params.time_horizon_years == 12
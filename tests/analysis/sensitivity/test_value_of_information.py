@@ -0,0 +1,74 @@
+"""Tests for EVPI and regression-based EVPPI."""
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from src.analysis.sensitivity.model_sensitivity import ModelSensitivityAnalyzer
+from src.analysis.sensitivity.value_of_information import _decision_value, spline_basis, value_of_information
+from src.models.gene_therapy.follistatin.follistatin_model import FollistatinModel
+
+def _expected_gain(a, s):
+    """E[max(0, a + X)] - max(0, a) for X ~ Normal(0, s)."""
+    return a * stats.norm.cdf(a / s) + s * stats.norm.pdf(a / s) - max(a, 0.0)
+
+def test_evppi_matches_closed_form():
+    rng = np.random.default_rng(0)
+    n = 200_000
+    x1, x2 = rng.normal(0, 1.0, n), rng.normal(0, 2.0, n)
+    wtp = np.array([0.0, 0.5, 1.0])
+    # Incremental net benefit λ·(1 + x1 + x2) - 1 for "new" over "old"
+    result = value_of_information(
+        {"x1": x1, "x2": x2}, {"old": np.zeros(n), "new": 1 + x1 + x2}, {"old": 0.0, "new": 1.0}, wtp,
+        parameters={"x1": ["x1"], "x2": ["x2"], "both": ["x1", "x2"]}
+    )
+    for i, lam in enumerate(wtp):
+        a = lam - 1
+        if lam == 0:
+            assert result.evpi[i] == result.evppi["x1"][i] == 0
+            continue
+        assert result.evppi["x1"][i] == pytest.approx(_expected_gain(a, lam * 1.0), rel=0.03)
+        assert result.evppi["x2"][i] == pytest.approx(_expected_gain(a, lam * 2.0), rel=0.03)
+        assert result.evppi["both"][i] == pytest.approx(result.evpi[i], rel=1e-6)
+    assert result.optimal == ["old", "old", "new"]
+    assert result.r_squared["both"] == pytest.approx(1.0)
+
+def test_irrelevant_parameter_has_no_value():
+    rng = np.random.default_rng(1)
+    x, noise = rng.normal(size=50_000), rng.normal(size=50_000)
+    result = value_of_information({"x": x, "noise": noise}, {"a": np.zeros(50_000), "b": x}, {"a": 0, "b": 0}, [1.0])
+    assert result.evppi["noise"][0] < 0.01 * result.evpi[0]
+    assert result.evppi["x"][0] == pytest.approx(result.evpi[0], rel=0.01)
+
+def test_spline_basis_captures_curvature():
+    x = np.random.default_rng(2).uniform(-3, 3, 10_000)
+    design = np.column_stack([np.ones_like(x), spline_basis(x)])
+    fit = design @ np.linalg.lstsq(design, np.abs(x), rcond=None)[0]
+    assert np.sqrt(np.mean((fit - np.abs(x)) ** 2)) < 0.1
+
+@pytest.mark.parametrize("chunk_size", [1_000_000, 1000])
+def test_decision_value_matches_per_wtp_loop(chunk_size):
+    rng = np.random.default_rng(3)
+    effects = rng.normal([[1.0], [1.2], [0.9]], 0.3, (3, 5000))
+    costs = rng.normal([[0.0], [8000.0], [-2000.0]], 3000.0, (3, 5000))
+    wtp = np.linspace(0, 100_000, 41)
+    expected = []
+    for lam in wtp:
+        net_benefit = lam * effects - costs
+        expected.append(net_benefit.max(axis=0).mean() - net_benefit.mean(axis=1).max())
+    np.testing.assert_allclose(_decision_value(effects, costs, wtp, chunk_size), expected, rtol=1e-9, atol=1e-6)
+
+def test_analyzer_value_of_information():
+    model = FollistatinModel()
+    wtp = np.linspace(0.5, 1.5, 11)
+    result = ModelSensitivityAnalyzer().analyze_value_of_information(
+        {"follistatin": model}, {"follistatin": 8.8e8}, wtp=wtp, simulation_runs=20_000, seed=3
+    )
+    frame = result.to_frame()
+    assert list(frame.index) == list(wtp)
+    assert set(frame["optimal"]) == {"status_quo", "follistatin"}
+    assert (frame["evpi"] >= 0).all()
+    # The therapy effect sizes dominate; population context barely matters
+    at = frame["evpi"].idxmax()
+    assert frame.loc[at, "evppi.muscle_gain_lbs"] > 10 * frame.loc[at, "evppi.discount_rate"]
+    assert (frame.filter(like="evppi.") <= frame[["evpi"]].values * 1.01).all().all()
@@ -0,0 +1,124 @@
+"""Tests for the filesystem work queue."""
+
+import os
+
+import numpy as np
+import pytest
+
+from src.analysis.sensitivity.model_sensitivity import ModelSensitivityAnalyzer
+from src.analysis.sensitivity.psa import ProbabilisticSensitivityAnalysis
+from src.analysis.sensitivity import work_queue
+from src.analysis.sensitivity.work_queue import (
+    CohortSimulationJob, PSASummaryJob, WorkQueue, run_queue, tree_merge
+)
+from src.models.gene_therapy.follistatin.fat_reduction_model import MarkovModel, ModelParameters
+from src.models.gene_therapy.lifespan.lifespan_model import LifespanModel
+
+@pytest.fixture
+def psa_job():
+    model = LifespanModel()
+    analysis = ProbabilisticSensitivityAnalysis.for_model(model, n_draws=20_000, seed=5, chunk_size=2000)
+    return PSASummaryJob(analysis, model)
+
+def test_tree_merge_keeps_order():
+    assert tree_merge([[i] for i in range(7)], lambda a, b: a + b) == list(range(7))
+
+def test_claims_are_exclusive(tmp_path, psa_job):
+    queue = WorkQueue.create(tmp_path / "queue", psa_job)
+    claims = [queue.claim(f"w{i}") for i in range(psa_job.shards() + 2)]
+    assert claims[:-2] == list(range(psa_job.shards()))
+    assert claims[-2:] == [None, None]
+
+def test_resume_after_preemption(tmp_path, psa_job):
+    directory = tmp_path / "queue"
+    queue = WorkQueue.create(directory, psa_job)
+    # One shard finished, one claimed by a worker that then died
+    first = queue.claim("lost")
+    queue.complete(first, psa_job.run(first), "lost")
+    checkpoint = directory / "done" / "shard_00000.pkl"
+    written = os.stat(checkpoint).st_mtime_ns
+    assert queue.claim("lost") == 1
+    with pytest.raises(RuntimeError):
+        queue.reduce()
+    
+    result = run_queue(directory, psa_job)
+    assert os.stat(checkpoint).st_mtime_ns == written
+    assert queue.is_complete() and not os.listdir(directory / "claimed")
+    
+    expected = psa_job.analysis.run_summaries(psa_job.model)
+    assert result.n_draws == expected.n_draws
+    for name, mean in expected.means().items():
+        assert result.means()[name] == pytest.approx(mean, rel=1e-12)
+    # Reducing again from the checkpoints is deterministic
+    assert WorkQueue(directory).reduce().summary() == result.summary()
+
+def test_stale_claims_only(tmp_path, psa_job):
+    queue = WorkQueue.create(tmp_path / "queue", psa_job)
+    queue.claim("live")
+    assert queue.recover(older_than=3600) == 0
+    assert queue.recover() == 1
+
+def test_polling_leaves_live_claims_alone(tmp_path, psa_job, monkeypatch):
+    directory = tmp_path / "queue"
+    work = WorkQueue.work
+    claimed = []
+    
+    def work_alongside_other_host(queue, worker=None):
+        # Another host claims a shard once this run has started
+        if not claimed:
+            claimed.append(queue.claim("other"))
+        return work(queue, worker)
+    
+    polls = []
+    def sleep(seconds):
+        polls.append(seconds)
+        if len(polls) == 2:
+            assert (directory / "claimed" / "shard_00000@other").exists()
+            WorkQueue(directory).complete(0, psa_job.run(0), "other")
+    
+    monkeypatch.setattr(WorkQueue, "work", work_alongside_other_host)
+    monkeypatch.setattr(work_queue.time, "sleep", sleep)
+    result = run_queue(directory, psa_job)
+    assert claimed == [0] and len(polls) == 2
+    assert result.n_draws == psa_job.analysis.n_draws
+
+def test_resume_refuses_a_different_job(tmp_path, psa_job):
+    directory = tmp_path / "queue"
+    WorkQueue.create(directory, psa_job)
+    model = LifespanModel()
+    same = PSASummaryJob(ProbabilisticSensitivityAnalysis.for_model(model, n_draws=20_000, seed=5, chunk_size=2000), model)
+    assert WorkQueue.create(directory, same).n_shards == psa_job.shards()
+    
+    other_seed = PSASummaryJob(ProbabilisticSensitivityAnalysis.for_model(model, n_draws=20_000, seed=6, chunk_size=2000), model)
+    changed = model.with_parameters(qaly_value=120000.0)
+    other_model = PSASummaryJob(ProbabilisticSensitivityAnalysis.for_model(changed, n_draws=20_000, seed=5, chunk_size=2000), changed)
+    for job in (other_seed, other_model):
+        with pytest.raises(ValueError, match="different job"):
+            WorkQueue.create(directory, job)
+
+def test_multiprocess_cohort_job(tmp_path):
+    scenarios = []
+    for size in np.linspace(1e5, 1e6, 9):
+        params = ModelParameters()
+        params.population_size = int(size)
+        scenarios.append(params)
+    frame = run_queue(tmp_path / "cohort", CohortSimulationJob(scenarios, shard_size=2), workers=2)
+    
+    assert list(frame["scenario"]) == list(range(9))
+    model = MarkovModel(scenarios[4])
+    model.build_transition_matrix()
+    assert frame["costs"][4] == pytest.approx(model.run_cohort_simulation()["costs"].sum())
+
+def test_analyze_model_with_queue(tmp_path):
+    results = ModelSensitivityAnalyzer().analyze_model(
+        LifespanModel(), simulation_runs=3000, seed=2, queue_path=str(tmp_path / "queue")
+    )
+    assert results["parameters"]["simulation_runs"] == 3000
+
+def test_unseeded_queue_run_resumes(tmp_path):
+    directory = str(tmp_path / "queue")
+    first = ModelSensitivityAnalyzer().analyze_model(LifespanModel(), simulation_runs=3000, queue_path=directory)
+    seed = WorkQueue(directory).job.analysis.seed
+    assert work_queue.queue_seed(directory) == seed
+    second = ModelSensitivityAnalyzer().analyze_model(LifespanModel(), simulation_runs=3000, queue_path=directory)
+    assert second["uncertainty"] == first["uncertainty"]
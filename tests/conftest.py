@@ -4,6 +4,44 @@ import os
 import sys
 from pathlib import Path
 
+import pytest
+
 # Add src directory to Python path
 src_dir = Path(__file__).parent.parent / "src"
-sys.path.append(str(src_dir)) 
\ No newline at end of file
+sys.path.append(str(src_dir))
+
+@pytest.fixture
+def calculator_context():
+    """Calculator parameters matching config/global_parameters.py."""
+    from src.models.parameters import (
+        BaseEconomicParams,
+        BasePopulationParams,
+        HealthcareParams,
+        ImpactModifiers,
+    )
+    
+    return dict(
+        pop=BasePopulationParams(
+            total_population=331900000,
+            target_population=165950000,
+            medicare_beneficiaries=61733400,
+            workforce_fraction=0.63,
+        ),
+        econ=BaseEconomicParams(annual_healthcare_cost=12500.0, annual_productivity=68000.0, discount_rate=0.03),
+        healthcare=HealthcareParams(
+            hospital_visit_reduction_percent=10.0,
+            annual_hospital_visits=36500000,
+            annual_alzheimers_cost=305e9,
+            annual_ckd_cost=87e9,
+            cost_per_hospital_visit=12500.0 * 331900000 / 36500000,
+            savings_per_lb_muscle=12.0,
+            savings_per_lb_fat=8.0,
+        ),
+        modifiers=ImpactModifiers(
+            iq_to_gdp=0.02,
+            kidney_to_medicare=0.4,
+            alzheimers_to_medicare=0.5,
+            health_quality=0.8,
+            lifespan_to_gdp=0.6,
+        ),
+    )
@@ -0,0 +1,43 @@
+"""Tests for the columnar calculator batch API."""
+
+import numpy as np
+import pytest
+
+from src.models.calculators import (
+    CognitiveCalculator,
+    HealthcareCalculator,
+    KidneyCalculator,
+    LongevityCalculator,
+    PhysicalCalculator,
+)
+SWEEPS = {
+    CognitiveCalculator: {'iq_increase': (0, 10), 'alzheimers_reduction': (0, 50)},
+    KidneyCalculator: {'egfr_improvement': (-5, 30), 'ckd_progression_reduction': (0, 50)},
+    PhysicalCalculator: {'muscle_mass_change_lb': (-10, 10), 'fat_mass_change_lb': (-30, 10)},
+    LongevityCalculator: {'lifespan_increase_years': (0, 10), 'healthspan_improvement_percent': (0, 100)},
+    HealthcareCalculator: {'hospital_visit_reduction_percent': (0, 50)},
+}
+
+@pytest.mark.parametrize("calculator_class", list(SWEEPS))
+def test_batch_matches_scalar_path_exactly(calculator_context, calculator_class):
+    calculator = calculator_class(**calculator_context)
+    rng = np.random.default_rng(42)
+    columns = {name: rng.uniform(low, high, size=200) for name, (low, high) in SWEEPS[calculator_class].items()}
+    
+    batch = calculator.calculate_batch(columns)
+    for i in range(200):
+        scalar = calculator.calculate({name: float(values[i]) for name, values in columns.items()})
+        for key, value in scalar.items():
+            assert batch[key].shape == (200,)
+            assert batch[key][i] == value
+
+def test_batch_overrides_context_columns(calculator_context):
+    calculator = LongevityCalculator(**calculator_context)
+    health_quality = np.array([0.5, 0.8])
+    batch = calculator.calculate_batch({'lifespan_increase_years': 2.0, 'health_quality': health_quality})
+    
+    assert calculator.modifiers.health_quality == 0.8
+    calculator_context['modifiers'] = calculator_context['modifiers'].model_copy(update={'health_quality': 0.5})
+    expected = LongevityCalculator(**calculator_context).calculate({'lifespan_increase_years': 2.0})
+    assert batch['qalys_gained'][0] == expected['qalys_gained']
+    assert batch['working_years'].shape == (2,)
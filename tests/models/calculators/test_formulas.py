@@ -0,0 +1,65 @@
+"""Tests for the declarative calculator formula graph."""
+
+import io
+
+import numpy as np
+
+from src.models.calculators import (
+    CognitiveCalculator,
+    HealthcareCalculator,
+    KidneyCalculator,
+    LongevityCalculator,
+    PhysicalCalculator,
+    evaluate_pathways,
+)
+from src.models.calculators.formulas import Formula, FormulaProgram, Symbol
+
+def test_shared_subexpressions_compiled_once():
+    a, b = Symbol('a'), Symbol('b')
+    program = FormulaProgram({
+        'x': Formula('x', "X", a * b + 1),
+        'y': Formula('y', "Y", Symbol('a') * Symbol('b') * 2),
+    })
+    # a, b, a*b, 1, a*b+1, 2, a*b*2
+    assert program.size == 7
+    assert program({'a': 2.0, 'b': 3.0}) == {'x': 7.0, 'y': 12.0}
+
+def test_equation_rendering():
+    a, b, c = Symbol('a', 'A'), Symbol('b', 'B'), Symbol('c', 'C')
+    assert Formula('x', "X", a * (b + c)).equation() == "X = A × (B + C)"
+    assert Formula('x', "X", a / (b * c)).equation() == "X = A / (B × C)"
+    assert Formula('x', "X", a - b - c).equation() == "X = A - B - C"
+
+def test_report_uses_configured_values(calculator_context):
+    calculator_context['healthcare'] = calculator_context['healthcare'].model_copy(update={'savings_per_lb_muscle': 15.0})
+    calculator = PhysicalCalculator(**calculator_context)
+    params = {'muscle_mass_change_lb': 2.0, 'fat_mass_change_lb': -2.0}
+    report = io.StringIO()
+    calculator.write_calculations(report, params, calculator.calculate(params))
+    
+    text = report.getvalue()
+    assert "Muscle Savings = Target_Population × Muscle_Change × Savings_per_lb_Muscle" in text
+    assert "165,950,000 × 2 × 15" in text
+    assert "$12/lb" not in text
+
+def test_fused_pathways_match_individual_batches(calculator_context):
+    calculators = {
+        calculator_class.__name__: calculator_class(**calculator_context)
+        for calculator_class in (CognitiveCalculator, KidneyCalculator, PhysicalCalculator,
+                                 LongevityCalculator, HealthcareCalculator)
+    }
+    rng = np.random.default_rng(7)
+    columns = {
+        'iq_increase': rng.uniform(0, 5, 50),
+        'ckd_progression_reduction': rng.uniform(0, 50, 50),
+        'muscle_mass_change_lb': rng.uniform(0, 5, 50),
+        'lifespan_increase_years': rng.uniform(0, 3, 50),
+        'hospital_visit_reduction_percent': rng.uniform(0, 30, 50),
+        'health_quality': rng.uniform(0.5, 0.9, 50),
+    }
+    fused = evaluate_pathways(calculators, columns)
+    for name, calculator in calculators.items():
+        separate = calculator.calculate_batch(columns)
+        assert fused[name].keys() == separate.keys()
+        for key in separate:
+            np.testing.assert_array_equal(fused[name][key], separate[key])
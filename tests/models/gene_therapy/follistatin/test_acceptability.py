@@ -0,0 +1,42 @@
+"""Tests for vectorized cost-effectiveness acceptability curves."""
+
+import numpy as np
+import pytest
+
+from src.models.gene_therapy.follistatin.fat_reduction_model import EconomicCalculator
+
+@pytest.fixture
+def draws():
+    rng = np.random.default_rng(0)
+    n = 5000
+    effects = {"usual care": rng.normal(10.0, 0.5, n), "therapy": rng.normal(10.4, 0.6, n)}
+    costs = {"usual care": 20_000.0, "therapy": rng.normal(30_000, 3000, n)}
+    return costs, effects
+
+def test_matches_loop_over_wtp(draws):
+    costs, effects = draws
+    wtp = np.linspace(0, 100_000, 1000)
+    curves = EconomicCalculator.calculate_acceptability(costs, effects, wtp)
+    
+    for i in (0, 250, 999):
+        nmb = np.column_stack([
+            EconomicCalculator.calculate_nmb(costs[s], effects[s], wtp[i]) for s in effects
+        ]) * np.ones((5000, 1))
+        best = nmb.argmax(axis=1)
+        assert curves["ceac"].iloc[i]["therapy"] == pytest.approx(np.mean(best == 1))
+        np.testing.assert_allclose(curves["expected_nmb"].iloc[i].values, nmb.mean(axis=0))
+    np.testing.assert_allclose(curves["ceac"].sum(axis=1), 1.0)
+
+def test_chunking_does_not_change_results(draws):
+    costs, effects = draws
+    wtp = np.linspace(0, 100_000, 1000)
+    whole = EconomicCalculator.calculate_acceptability(costs, effects, wtp)
+    chunked = EconomicCalculator.calculate_acceptability(costs, effects, wtp, chunk_size=20_000)
+    assert whole["ceac"].equals(chunked["ceac"])
+
+def test_frontier_follows_expected_nmb(draws):
+    costs, effects = draws
+    curves = EconomicCalculator.calculate_acceptability(costs, effects, [0.0, 1e5])
+    assert list(curves["ceaf"]["optimal"]) == ["usual care", "therapy"]
+    assert curves["ceaf"]["probability"].iloc[0] == pytest.approx(curves["ceac"]["usual care"].iloc[0])
+    assert curves["ceac"].index.name == "wtp"
@@ -0,0 +1,59 @@
+"""Tests for the vectorized cost-effectiveness frontier."""
+
+import numpy as np
+import pytest
+
+from src.models.gene_therapy.follistatin.fat_reduction_model import EconomicCalculator
+
+def _reference_frontier(costs, effects):
+    """Textbook frontier for one draw: drop dominated options until ICERs increase."""
+    options = sorted(range(len(costs)), key=lambda i: (costs[i], -effects[i]))
+    frontier = []
+    for i in options:
+        if not frontier or effects[i] > effects[frontier[-1]]:
+            frontier.append(i)
+    changed = True
+    while changed:
+        changed = False
+        icers = [
+            (costs[b] - costs[a]) / (effects[b] - effects[a]) for a, b in zip(frontier, frontier[1:])
+        ]
+        for j in range(len(icers) - 1):
+            if icers[j] > icers[j + 1]:
+                del frontier[j + 1]
+                changed = True
+                break
+    return frontier
+
+def test_extended_dominance():
+    # B's ICER over A (20k) exceeds C's ICER over B (~6.7k)
+    result = EconomicCalculator.calculate_frontier([0, 10_000, 20_000, 25_000], [0, 0.5, 2.0, 1.8])
+    assert list(result["efficient"]) == [True, False, True, False]
+    assert list(result["extendedly_dominated"]) == [False, True, False, False]
+    assert list(result["strongly_dominated"]) == [False, False, False, True]
+    assert result["icer"][2] == pytest.approx(10_000)
+    assert np.isnan(result["icer"][[0, 1, 3]]).all()
+
+def test_matches_reference_per_draw():
+    rng = np.random.default_rng(0)
+    costs = rng.normal(50_000, 20_000, (500, 12)).round(-3)
+    effects = rng.normal(10, 1, (500, 12)).round(1)
+    result = EconomicCalculator.calculate_frontier(costs, effects)
+    for d in range(500):
+        expected = _reference_frontier(costs[d], effects[d])
+        assert sorted(np.flatnonzero(result["efficient"][d])) == sorted(expected)
+        for a, b in zip(expected, expected[1:]):
+            icer = (costs[d, b] - costs[d, a]) / (effects[d, b] - effects[d, a])
+            assert result["icer"][d, b] == pytest.approx(icer)
+    assert (result["efficient"] ^ result["strongly_dominated"] ^ result["extendedly_dominated"]).all()
+
+def test_ties():
+    result = EconomicCalculator.calculate_frontier([100, 100, 200, 200], [1.0, 2.0, 2.0, 3.0])
+    assert list(result["efficient"]) == [False, True, False, True]
+    assert list(result["rank"][[1, 0]]) == [0, 1]
+
+def test_icer_with_equal_qalys():
+    assert EconomicCalculator.calculate_icer(1e6, 8e5, 5000, 5000) == np.inf
+    assert EconomicCalculator.calculate_icer(8e5, 1e6, 5000, 5000) == -np.inf
+    assert np.isnan(EconomicCalculator.calculate_icer(1e6, 1e6, 5000, 5000))
+    np.testing.assert_allclose(EconomicCalculator.calculate_icer(np.array([2.0, 3.0]), 1.0, np.array([2.0, 1.5]), 1.0), [1.0, 4.0])
@@ -0,0 +1,63 @@
+"""Tests for array-based Markov traces and outcome accumulation."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.gene_therapy.follistatin.fat_reduction_model import CohortTrace, MarkovModel, ModelParameters
+
+@pytest.fixture
+def model():
+    model = MarkovModel(ModelParameters())
+    model.build_transition_matrix()
+    return model
+
+def _reference(model):
+    """Year-by-year loop with per-state sums over the parameter dicts."""
+    cohort = np.zeros(5)
+    cohort[0] = model.params.population_size
+    qalys, costs = [], []
+    for _ in range(model.params.time_horizon):
+        cohort = cohort @ model.transition_matrix
+        qalys.append(sum(cohort[i] * model.params.qaly_weights[s] for i, s in enumerate(model.states[:-1])))
+        costs.append(sum(cohort[i] * model.params.healthcare_costs.get(s, 0) for i, s in enumerate(model.states[:-1])))
+    return np.array(qalys), np.array(costs)
+
+def test_arrays_without_dataframe(model):
+    result = model.run_cohort_simulation(as_frame=False)
+    assert isinstance(result, CohortTrace)
+    assert result.trace.shape == (model.params.time_horizon, len(model.states))
+    qalys, costs = _reference(model)
+    np.testing.assert_allclose(result.qalys, qalys)
+    np.testing.assert_allclose(result.costs, costs)
+    np.testing.assert_allclose(result.trace.sum(axis=1), model.params.population_size)
+
+def test_dataframe_on_request(model):
+    frame = model.run_cohort_simulation()
+    assert isinstance(frame, pd.DataFrame)
+    assert list(frame.columns) == ["year", "qalys", "costs", "cohort_distribution"]
+    assert list(frame["year"]) == list(range(1, model.params.time_horizon + 1))
+    np.testing.assert_allclose(np.stack(frame["cohort_distribution"]), model.run_cohort_simulation(as_frame=False).trace)
+
+def test_discounting(model):
+    plain = model.run_cohort_simulation(as_frame=False)
+    discounted = model.run_cohort_simulation(as_frame=False, discounted=True)
+    factors = 1.03 ** -np.arange(1, model.params.time_horizon + 1)
+    np.testing.assert_allclose(discounted.qalys, plain.qalys * factors)
+    np.testing.assert_allclose(discounted.costs, plain.costs * factors)
+    batch = model.run_cohort_simulation_batch(model.transition_matrix[None], discounted=True)
+    np.testing.assert_allclose(batch["costs"][0], discounted.costs)
+
+def test_discounting_matches_medicare_analysis(model):
+    # src/analysis/analysis.py discounts each yearly row by (1 + r) ** year
+    frame = model.run_cohort_simulation()
+    rate = model.params.discount_rate
+    discounted = model.run_cohort_simulation(discounted=True)
+    np.testing.assert_allclose(discounted["qalys"], frame["qalys"] / (1 + rate) ** frame["year"])
+    np.testing.assert_allclose(discounted["costs"], frame["costs"] / (1 + rate) ** frame["year"])
+    assert discounted["qalys"][0] == pytest.approx(frame["qalys"][0] / 1.03)
+
+def test_single_cycle_outcomes(model):
+    cohort = np.array([10.0, 20.0, 30.0, 40.0, 50.0])
+    assert model._calculate_qalys(cohort) == pytest.approx(10 * 0.85 + 20 * 0.75 + 30 * 0.6 + 40 * 0.8)
+    assert model._calculate_costs(cohort, 0) == pytest.approx(10 * 5000 + 20 * 8000 + 30 * 15000)
@@ -0,0 +1,99 @@
+"""Tests for the discounting engine."""
+
+import numpy as np
+import pytest
+
+from src.models.base_model import BaseParameters
+from src.models.discounting import (
+    ContinuousDiscountCurve,
+    DiscountCurve,
+    DiscountRegime,
+    PiecewiseDiscountCurve,
+    annuity_factor,
+    discount_factors,
+    npv,
+)
+from src.models.gene_therapy.klotho.klotho_model import KlothoModel
+from src.models.gene_therapy.lifespan.lifespan_model import LifespanModel
+
+def loop_npv(annual_value: float, rate: float, years: int) -> float:
+    """Reference implementation: discount each year in a loop."""
+    return sum(annual_value / ((1 + rate) ** year) for year in range(years))
+
+@pytest.mark.parametrize("rate", [0.0, 0.015, 0.03, 0.07])
+def test_annuity_factor_matches_loop(rate):
+    assert annuity_factor(rate, 10) == pytest.approx(loop_npv(1.0, rate, 10))
+
+def test_annuity_factor_vectorized():
+    rates = np.array([0.0, 0.03, 0.05])
+    expected = [loop_npv(1.0, r, 20) for r in rates]
+    np.testing.assert_allclose(annuity_factor(rates, 20), expected)
+
+def test_discount_factors_cached_and_read_only():
+    factors = discount_factors(0.03, 10)
+    assert factors is discount_factors(0.03, 10)
+    assert not factors.flags.writeable
+
+def test_npv_many_streams():
+    flows = np.random.default_rng(0).uniform(0, 100, size=(1000, 15))
+    expected = [sum(f / (1.03 ** t) for t, f in enumerate(row)) for row in flows[:5]]
+    result = npv(flows, 0.03)
+    assert result.shape == (1000,)
+    np.testing.assert_allclose(result[:5], expected)
+
+def test_npv_per_stream_rates():
+    flows = np.ones((3, 10))
+    rates = np.array([0.0, 0.03, 0.05])
+    np.testing.assert_allclose(npv(flows, rates), annuity_factor(rates, 10))
+
+def test_model_npv_matches_loop():
+    model = KlothoModel(base_params=BaseParameters(discount_rate=0.035, time_horizon_years=12))
+    assert model.calculate_npv(1e9, 12) == pytest.approx(loop_npv(1e9, 0.035, 12))
+    assert model.calculate_medicare_savings(0.01) == pytest.approx(
+        loop_npv(73000000 * 12500 * 0.01, 0.035, 12)
+    )
+
+def test_flat_curve_matches_annuity_factor():
+    curve = DiscountCurve(0.03)
+    assert curve.annuity(10) == pytest.approx(annuity_factor(0.03, 10))
+    assert curve.annuity(250) == pytest.approx(annuity_factor(0.03, 250))
+
+def test_piecewise_curve_steps_rate():
+    curve = PiecewiseDiscountCurve([(0, 0.035), (30, 0.015)])
+    factors = curve.factors(40)
+    assert factors[30] == pytest.approx(1.035 ** -30)
+    assert factors[35] == pytest.approx(1.035 ** -30 * 1.015 ** -5)
+    with pytest.raises(ValueError):
+        PiecewiseDiscountCurve([(5, 0.03)])
+
+def test_continuous_and_half_cycle_curves():
+    continuous = ContinuousDiscountCurve(0.03)
+    np.testing.assert_allclose(continuous.factors(5), np.exp(-0.03 * np.arange(5)))
+    half_cycle = DiscountCurve(0.03, half_cycle_correction=True)
+    assert half_cycle.factors(2)[1] == pytest.approx(1.03 ** -1.5)
+
+def test_curve_npv_is_dot_product():
+    curve = PiecewiseDiscountCurve([(0, 0.035), (3, 0.015)])
+    flows = np.arange(12.0).reshape(2, 6)
+    np.testing.assert_allclose(curve.npv(flows), flows @ curve.factors(6))
+
+def test_separate_cost_and_effect_curves():
+    regime = DiscountRegime(costs=DiscountCurve(0.035), effects=DiscountCurve(0.015))
+    model = LifespanModel(base_params=BaseParameters(discounting=regime))
+    flat_cost = LifespanModel(base_params=BaseParameters(discount_rate=0.035)).calculate_impacts()
+    flat_effect = LifespanModel(base_params=BaseParameters(discount_rate=0.015)).calculate_impacts()
+    impacts = model.calculate_impacts()
+    assert impacts["medicare_savings"] == pytest.approx(flat_cost["medicare_savings"])
+    assert impacts["qaly_value"] == pytest.approx(flat_effect["qaly_value"])
+
+def test_impacts_by_regime_single_pass():
+    model = KlothoModel()
+    regimes = {
+        "flat": DiscountRegime.flat(0.03),
+        "nice": DiscountRegime(PiecewiseDiscountCurve([(0, 0.035), (30, 0.015)])),
+    }
+    results = model.calculate_impacts_by_regime(regimes)
+    assert model.params.discounting is None
+    assert results["flat"]["cognitive_value"] == pytest.approx(model.calculate_impacts()["cognitive_value"])
+    nice = KlothoModel(base_params=BaseParameters(discounting=regimes["nice"])).calculate_impacts()
+    assert results["nice"]["kidney_savings"] == pytest.approx(nice["kidney_savings"])
@@ -0,0 +1,43 @@
+"""Tests for parameter distributions."""
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from src.models.distributions import Beta, Gamma, LogNormal, Normal, Triangular
+from src.models.gene_therapy.klotho.klotho_model import KlothoParameters
+from src.models.parameters import ImpactModifiers
+
+@pytest.mark.parametrize("distribution, sd", [
+    (Normal(mu=10.0, sigma=2.0), 2.0),
+    (LogNormal.from_moments(mean=10.0, sd=2.0), 2.0),
+    (Beta.from_moments(mean=0.3, sd=0.05), 0.05),
+    (Gamma.from_moments(mean=10.0, sd=2.0), 2.0),
+    (Triangular(low=0.0, mode=1.0, high=5.0), None),
+])
+def test_sample_moments(distribution, sd):
+    draws = distribution.sample(np.random.default_rng(0), 200_000)
+    assert draws.shape == (200_000,)
+    assert draws.mean() == pytest.approx(distribution.mean, rel=0.01)
+    if sd is not None:
+        assert draws.std() == pytest.approx(sd, rel=0.02)
+
+def test_beta_rejects_impossible_moments():
+    with pytest.raises(ValueError):
+        Beta.from_moments(mean=0.5, sd=0.6)
+
+def test_parameter_classes_declare_distributions():
+    assert set(KlothoParameters.distributions) <= set(KlothoParameters.model_fields)
+    assert set(ImpactModifiers.distributions) <= set(ImpactModifiers.model_fields)
+    assert "distributions" not in KlothoParameters.model_fields
+
+@pytest.mark.parametrize("distribution, reference", [
+    (Normal(mu=10.0, sigma=2.0), stats.norm(10.0, 2.0)),
+    (LogNormal(mu=1.0, sigma=0.3), stats.lognorm(0.3, scale=np.exp(1.0))),
+    (Beta(alpha=2.0, beta=5.0, low=1.0, high=3.0), stats.beta(2.0, 5.0, loc=1.0, scale=2.0)),
+    (Gamma(shape=3.0, scale=2.0), stats.gamma(3.0, scale=2.0)),
+    (Triangular(low=0.0, mode=1.0, high=5.0), stats.triang(0.2, loc=0.0, scale=5.0)),
+])
+def test_ppf_matches_scipy(distribution, reference):
+    q = np.linspace(0.001, 0.999, 101)
+    np.testing.assert_allclose(distribution.ppf(q), reference.ppf(q), rtol=1e-9)